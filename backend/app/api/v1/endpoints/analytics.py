@@ -0,0 +1,42 @@
+from fastapi import APIRouter, Body, Depends, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Dict, List
+import asyncio
+import structlog
+
+from app.core.database import get_db
+from app.ml.price_analysis import get_analyzer, load_procedure_frame
+from app.schemas.analytics import ProcedurePriceQuery
+
+router = APIRouter()
+logger = structlog.get_logger()
+
+# Upper bound on procedures per price prediction request
+MAX_PREDICTION_BATCH = 500
+
+# Model calls (and the first model load) are CPU-bound, so they run in a worker
+# thread on the shared analyzer instead of blocking the event loop
+
+@router.post("/price-predictions")
+async def predict_procedure_prices(
+    procedures: List[ProcedurePriceQuery] = Body(..., max_length=MAX_PREDICTION_BATCH)
+) -> List[Dict]:
+    """Predict cash prices for a batch of procedures with the trained price model"""
+    try:
+        queries = [procedure.model_dump() for procedure in procedures]
+        return await asyncio.to_thread(lambda: get_analyzer().predict_procedure_prices(queries))
+        
+    except Exception as e:
+        logger.error(f"Error predicting procedure prices: {e}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+@router.get("/price-anomalies")
+async def get_price_anomalies(db: AsyncSession = Depends(get_db)) -> List[Dict]:
+    """Detect procedures priced far outside the norm with the trained anomaly model"""
+    try:
+        procedures = await db.run_sync(load_procedure_frame)
+        return await asyncio.to_thread(lambda: get_analyzer().detect_price_anomalies(procedures))
+        
+    except Exception as e:
+        logger.error(f"Error detecting price anomalies: {e}")
+        raise HTTPException(status_code=500, detail="Internal server error")
@@ -1,87 +1,153 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
-from typing import List, Optional
+from sqlalchemy import func, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import contains_eager, load_only
+from itertools import groupby
+from typing import Dict, Final, List, Optional
 import structlog
 
 from app.core.database import get_db
+from app.core.cache import cached
 from app.models.hospital import Hospital
 from app.models.hospital_scoring import (
     HospitalTransparencyScore, HospitalExcellenceRecognition, 
     HospitalPeerGroup, HospitalAccountabilityTier,
     TransparencyCategory, HospitalSize
 )
-from app.services.hospital_scoring import HospitalScoringService
+from app.tasks import get_job_status, run_scoring_analysis_task
 from app.schemas.hospital_excellence import (
-    HospitalExcellenceResponse, PeerGroupComparison, 
-    AccountabilityTierResponse, TransparencyScoreResponse
+    HospitalExcellenceResponse, PeerGroupComparison, PeerGroupHospital, ExcellenceCategoryInfo,
+    AccountabilityTierResponse, AccountabilityTierName, TransparencyScoreResponse,
+    SmallHospitalExcellence, SmallHospitalExcellenceList,
+    RuralHospitalHero, RuralHospitalHeroList
 )
 
 router = APIRouter()
 logger = structlog.get_logger()
 
+# Only the score and hospital columns the small/rural excellence listings return
+_EXCELLENCE_LISTING_LOAD = (
+    load_only(
+        HospitalTransparencyScore.hospital_id,
+        HospitalTransparencyScore.overall_transparency_score,
+        HospitalTransparencyScore.community_impact_score,
+        HospitalTransparencyScore.cost_per_bed_transparency
+    ),
+    contains_eager(HospitalTransparencyScore.hospital).load_only(
+        Hospital.id, Hospital.name, Hospital.city, Hospital.county,
+        Hospital.bed_count, Hospital.hospital_type
+    ),
+)
+
+# Core column projections for the read-only listings, returned as Row tuples instead
+# of ORM instances so no identity map or attribute instrumentation is involved
+_EXCELLENCE_RESPONSE_COLUMNS = tuple(
+    getattr(HospitalExcellenceRecognition, name) for name in HospitalExcellenceResponse.model_fields
+)
+_ACCOUNTABILITY_TIER_COLUMNS = tuple(
+    getattr(HospitalAccountabilityTier, name) for name in AccountabilityTierResponse.response_fields
+)
+_TRANSPARENCY_SCORE_COLUMNS = tuple(
+    getattr(HospitalTransparencyScore, name) for name in TransparencyScoreResponse.response_fields
+)
+
+# Peer group listing columns: the group stats _peer_group_comparison reads, then
+# the member columns PeerGroupHospital reads
+_PEER_GROUP_STAT_COLUMNS = (
+    HospitalPeerGroup.peer_group_name,
+    HospitalPeerGroup.peer_group_size,
+    HospitalPeerGroup.group_avg_transparency_score,
+    HospitalPeerGroup.group_median_transparency_score,
+    HospitalPeerGroup.group_std_transparency_score,
+    HospitalPeerGroup.group_avg_bed_count,
+    HospitalPeerGroup.group_avg_community_impact,
+    HospitalPeerGroup.group_avg_cost_effectiveness,
+)
+_PEER_GROUP_MEMBER_COLUMNS = (
+    HospitalPeerGroup.hospital_id,
+    Hospital.name.label('hospital_name'),
+    HospitalPeerGroup.rank_in_group,
+    HospitalPeerGroup.percentile_in_group,
+    HospitalPeerGroup.transparency_vs_peers,
+    HospitalPeerGroup.cost_effectiveness_vs_peers,
+    HospitalPeerGroup.community_impact_vs_peers,
+)
+
+RURAL_HERO_QUALITIES = (
+    'Essential community healthcare provider',
+    'High community impact score',
+    'Cost-effective transparency practices',
+    'Rural healthcare access champion'
+)
+
 @router.get("/excellence/featured", response_model=List[HospitalExcellenceResponse])
+@cached("excellence-featured")
 async def get_featured_hospitals(
     category: Optional[TransparencyCategory] = Query(None, description="Filter by excellence category"),
     limit: int = Query(10, description="Number of hospitals to return"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Get featured hospitals for excellence recognition"""
     try:
-        query = db.query(HospitalExcellenceRecognition).filter(
+        query = select(*_EXCELLENCE_RESPONSE_COLUMNS).where(
             HospitalExcellenceRecognition.is_featured == True,
             HospitalExcellenceRecognition.is_active == True
         )
         
         if category:
-            query = query.filter(HospitalExcellenceRecognition.category == category)
+            query = query.where(HospitalExcellenceRecognition.category == category)
         
-        recognitions = query.limit(limit).all()
+        recognitions = (await db.execute(query.limit(limit))).all()
         
         logger.info(f"Retrieved {len(recognitions)} featured hospitals")
-        return recognitions
+        return [HospitalExcellenceResponse.from_orm_trusted(recognition) for recognition in recognitions]
         
     except Exception as e:
         logger.error(f"Error retrieving featured hospitals: {e}")
         raise HTTPException(status_code=500, detail="Internal server error")
 
 @router.get("/excellence/spotlight", response_model=List[HospitalExcellenceResponse])
+@cached("excellence-spotlight")
 async def get_spotlight_hospitals(
     limit: int = Query(5, description="Number of spotlight hospitals to return"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Get hospitals in the spotlight section"""
     try:
-        recognitions = db.query(HospitalExcellenceRecognition).filter(
-            HospitalExcellenceRecognition.is_spotlight == True,
-            HospitalExcellenceRecognition.is_active == True
-        ).limit(limit).all()
+        recognitions = (await db.execute(
+            select(*_EXCELLENCE_RESPONSE_COLUMNS).where(
+                HospitalExcellenceRecognition.is_spotlight == True,
+                HospitalExcellenceRecognition.is_active == True
+            ).limit(limit)
+        )).all()
         
         logger.info(f"Retrieved {len(recognitions)} spotlight hospitals")
-        return recognitions
+        return [HospitalExcellenceResponse.from_orm_trusted(recognition) for recognition in recognitions]
         
     except Exception as e:
         logger.error(f"Error retrieving spotlight hospitals: {e}")
         raise HTTPException(status_code=500, detail="Internal server error")
 
-@router.get("/excellence/categories")
-async def get_excellence_categories(db: Session = Depends(get_db)):
+@router.get("/excellence/categories", response_model=Dict[str, ExcellenceCategoryInfo])
+@cached("excellence-categories")
+async def get_excellence_categories(db: AsyncSession = Depends(get_db)):
     """Get all excellence categories with counts"""
     try:
-        categories = {}
-        
-        for category in TransparencyCategory:
-            count = db.query(HospitalExcellenceRecognition).filter(
-                HospitalExcellenceRecognition.category == category,
+        # One grouped COUNT instead of a query per category
+        rows = (await db.execute(
+            select(
+                HospitalExcellenceRecognition.category,
+                func.count().label('count')
+            ).where(
                 HospitalExcellenceRecognition.is_active == True
-            ).count()
-            
-            categories[category.value] = {
-                'name': category.value.replace('_', ' ').title(),
-                'count': count,
-                'description': _get_category_description(category)
-            }
+            ).group_by(HospitalExcellenceRecognition.category)
+        )).all()
+        counts = dict(rows)
         
-        return categories
+        return {
+            category.value: {**meta, 'count': counts.get(category, 0)}
+            for category, meta in _CATEGORY_META.items()
+        }
         
     except Exception as e:
         logger.error(f"Error retrieving excellence categories: {e}")
@@ -90,19 +156,21 @@ async def get_excellence_categories(db: Session = Depends(get_db)):
 @router.get("/excellence/{hospital_id}", response_model=HospitalExcellenceResponse)
 async def get_hospital_excellence(
     hospital_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Get excellence recognition for a specific hospital"""
     try:
-        recognition = db.query(HospitalExcellenceRecognition).filter(
-            HospitalExcellenceRecognition.hospital_id == hospital_id,
-            HospitalExcellenceRecognition.is_active == True
-        ).first()
+        recognition = (await db.execute(
+            select(*_EXCELLENCE_RESPONSE_COLUMNS).where(
+                HospitalExcellenceRecognition.hospital_id == hospital_id,
+                HospitalExcellenceRecognition.is_active == True
+            )
+        )).first()
         
         if not recognition:
             raise HTTPException(status_code=404, detail="No excellence recognition found for this hospital")
         
-        return recognition
+        return HospitalExcellenceResponse.from_orm_trusted(recognition)
         
     except HTTPException:
         raise
@@ -111,50 +179,29 @@ async def get_hospital_excellence(
         raise HTTPException(status_code=500, detail="Internal server error")
 
 @router.get("/peer-groups", response_model=List[PeerGroupComparison])
+@cached("peer-groups")
 async def get_peer_groups(
     group_name: Optional[str] = Query(None, description="Filter by peer group name"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Get hospital peer groups for fair comparisons"""
     try:
-        query = db.query(HospitalPeerGroup)
+        query = select(*_PEER_GROUP_STAT_COLUMNS, *_PEER_GROUP_MEMBER_COLUMNS).join(
+            Hospital, HospitalPeerGroup.hospital_id == Hospital.id
+        )
         
         if group_name:
-            query = query.filter(HospitalPeerGroup.peer_group_name == group_name)
-        
-        peer_groups = query.all()
-        
-        # Group by peer group name
-        grouped_results = {}
-        for pg in peer_groups:
-            if pg.peer_group_name not in grouped_results:
-                grouped_results[pg.peer_group_name] = {
-                    'group_name': pg.peer_group_name,
-                    'group_size': pg.peer_group_size,
-                    'group_avg_transparency_score': pg.group_avg_transparency_score,
-                    'group_median_transparency_score': pg.group_median_transparency_score,
-                    'group_std_transparency_score': pg.group_std_transparency_score,
-                    'group_avg_bed_count': pg.group_avg_bed_count,
-                    'group_avg_community_impact': pg.group_avg_community_impact,
-                    'group_avg_cost_effectiveness': pg.group_avg_cost_effectiveness,
-                    'hospitals': []
-                }
-            
-            grouped_results[pg.peer_group_name]['hospitals'].append({
-                'hospital_id': pg.hospital_id,
-                'hospital_name': pg.hospital.name,
-                'rank_in_group': pg.rank_in_group,
-                'percentile_in_group': pg.percentile_in_group,
-                'transparency_vs_peers': pg.transparency_vs_peers,
-                'cost_effectiveness_vs_peers': pg.cost_effectiveness_vs_peers,
-                'community_impact_vs_peers': pg.community_impact_vs_peers
-            })
-        
-        # Convert to list and sort hospitals within each group
+            query = query.where(HospitalPeerGroup.peer_group_name == group_name)
+        
+        # Rows come back grouped and ranked, so a single linear pass builds the result
+        query = query.order_by(HospitalPeerGroup.peer_group_name, HospitalPeerGroup.rank_in_group)
+        rows = (await db.execute(query)).all()
+        
+        # Every row carries its group's stats, so the first member's row stands in for the group
         result = []
-        for group_data in grouped_results.values():
-            group_data['hospitals'].sort(key=lambda x: x['rank_in_group'])
-            result.append(group_data)
+        for _, group in groupby(rows, key=lambda row: row.peer_group_name):
+            members = list(group)
+            result.append(_peer_group_comparison(members[0], members))
         
         logger.info(f"Retrieved {len(result)} peer groups")
         return result
@@ -164,51 +211,36 @@ async def get_peer_groups(
         raise HTTPException(status_code=500, detail="Internal server error")
 
 @router.get("/peer-groups/{hospital_id}", response_model=PeerGroupComparison)
+@cached("peer-group-hospital")
 async def get_hospital_peer_group(
     hospital_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Get peer group information for a specific hospital"""
     try:
-        peer_group = db.query(HospitalPeerGroup).filter(
-            HospitalPeerGroup.hospital_id == hospital_id
-        ).first()
+        peer_group = (await db.execute(
+            select(HospitalPeerGroup).where(HospitalPeerGroup.hospital_id == hospital_id)
+        )).scalars().first()
         
         if not peer_group:
             raise HTTPException(status_code=404, detail="No peer group found for this hospital")
         
         # Get all hospitals in the same peer group
-        group_hospitals = db.query(HospitalPeerGroup).filter(
-            HospitalPeerGroup.peer_group_name == peer_group.peer_group_name
-        ).all()
-        
-        result = {
-            'group_name': peer_group.peer_group_name,
-            'group_size': peer_group.peer_group_size,
-            'group_avg_transparency_score': peer_group.group_avg_transparency_score,
-            'group_median_transparency_score': peer_group.group_median_transparency_score,
-            'group_std_transparency_score': peer_group.group_std_transparency_score,
-            'group_avg_bed_count': peer_group.group_avg_bed_count,
-            'group_avg_community_impact': peer_group.group_avg_community_impact,
-            'group_avg_cost_effectiveness': peer_group.group_avg_cost_effectiveness,
-            'hospitals': []
-        }
-        
-        for pg in group_hospitals:
-            result['hospitals'].append({
-                'hospital_id': pg.hospital_id,
-                'hospital_name': pg.hospital.name,
-                'rank_in_group': pg.rank_in_group,
-                'percentile_in_group': pg.percentile_in_group,
-                'transparency_vs_peers': pg.transparency_vs_peers,
-                'cost_effectiveness_vs_peers': pg.cost_effectiveness_vs_peers,
-                'community_impact_vs_peers': pg.community_impact_vs_peers
-            })
-        
-        # Sort hospitals by rank
-        result['hospitals'].sort(key=lambda x: x['rank_in_group'])
-        
-        return result
+        group_hospitals = (await db.execute(
+            select(
+                HospitalPeerGroup.hospital_id,
+                Hospital.name.label('hospital_name'),
+                HospitalPeerGroup.rank_in_group,
+                HospitalPeerGroup.percentile_in_group,
+                HospitalPeerGroup.transparency_vs_peers,
+                HospitalPeerGroup.cost_effectiveness_vs_peers,
+                HospitalPeerGroup.community_impact_vs_peers
+            ).join(Hospital, HospitalPeerGroup.hospital_id == Hospital.id).where(
+                HospitalPeerGroup.peer_group_name == peer_group.peer_group_name
+            ).order_by(HospitalPeerGroup.rank_in_group)
+        )).all()
+        
+        return _peer_group_comparison(peer_group, group_hospitals)
         
     except HTTPException:
         raise
@@ -218,17 +250,17 @@ async def get_hospital_peer_group(
 
 @router.get("/accountability-tiers", response_model=List[AccountabilityTierResponse])
 async def get_accountability_tiers(
-    tier: Optional[str] = Query(None, description="Filter by accountability tier"),
-    db: Session = Depends(get_db)
+    tier: Optional[AccountabilityTierName] = Query(None, description="Filter by accountability tier"),
+    db: AsyncSession = Depends(get_db)
 ):
     """Get hospital accountability tiers"""
     try:
-        query = db.query(HospitalAccountabilityTier)
+        query = select(*_ACCOUNTABILITY_TIER_COLUMNS)
         
         if tier:
-            query = query.filter(HospitalAccountabilityTier.tier == tier)
+            query = query.where(HospitalAccountabilityTier.tier == tier)
         
-        tiers = query.all()
+        tiers = [AccountabilityTierResponse.from_orm_trusted(row) for row in (await db.execute(query)).all()]
         
         logger.info(f"Retrieved {len(tiers)} accountability tiers")
         return tiers
@@ -243,22 +275,25 @@ async def get_transparency_scores(
     min_score: Optional[float] = Query(None, description="Minimum transparency score"),
     max_score: Optional[float] = Query(None, description="Maximum transparency score"),
     limit: int = Query(50, description="Number of results to return"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Get hospital transparency scores with filtering"""
     try:
-        query = db.query(HospitalTransparencyScore)
+        query = select(*_TRANSPARENCY_SCORE_COLUMNS)
         
         if hospital_size:
-            query = query.filter(HospitalTransparencyScore.hospital_size == hospital_size)
+            query = query.where(HospitalTransparencyScore.hospital_size == hospital_size)
         
         if min_score is not None:
-            query = query.filter(HospitalTransparencyScore.overall_transparency_score >= min_score)
+            query = query.where(HospitalTransparencyScore.overall_transparency_score >= min_score)
         
         if max_score is not None:
-            query = query.filter(HospitalTransparencyScore.overall_transparency_score <= max_score)
+            query = query.where(HospitalTransparencyScore.overall_transparency_score <= max_score)
         
-        scores = query.limit(limit).all()
+        scores = [
+            TransparencyScoreResponse.from_orm_trusted(row)
+            for row in (await db.execute(query.limit(limit))).all()
+        ]
         
         logger.info(f"Retrieved {len(scores)} transparency scores")
         return scores
@@ -267,137 +302,168 @@ async def get_transparency_scores(
         logger.error(f"Error retrieving transparency scores: {e}")
         raise HTTPException(status_code=500, detail="Internal server error")
 
-@router.post("/scoring/run-analysis")
-async def run_scoring_analysis(db: Session = Depends(get_db)):
-    """Run complete hospital scoring analysis"""
+@router.post("/scoring/run-analysis", status_code=202)
+async def run_scoring_analysis():
+    """Queue the complete hospital scoring analysis on the background worker"""
     try:
-        logger.info("Starting hospital scoring analysis...")
-        
-        scoring_service = HospitalScoringService()
-        results = scoring_service.run_complete_scoring_analysis(db)
+        task = run_scoring_analysis_task.delay()
+        logger.info(f"Queued hospital scoring analysis as job {task.id}")
         
         return {
-            'status': 'success',
-            'message': 'Hospital scoring analysis completed successfully',
-            'results': results
+            'job_id': task.id,
+            'status': 'queued',
+            'message': 'Hospital scoring analysis queued'
         }
         
     except Exception as e:
-        logger.error(f"Error running scoring analysis: {e}")
+        logger.error(f"Error queuing scoring analysis: {e}")
         raise HTTPException(status_code=500, detail=f"Scoring analysis failed: {str(e)}")
 
-@router.get("/small-hospitals/excellence")
+@router.get("/scoring/status/{job_id}")
+def get_scoring_status(job_id: str):
+    """Get the status of a queued scoring analysis"""
+    try:
+        return get_job_status(job_id)
+        
+    except Exception as e:
+        logger.error(f"Error retrieving scoring job {job_id}: {e}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+@router.get("/small-hospitals/excellence", response_model=SmallHospitalExcellenceList)
 async def get_small_hospital_excellence(
     limit: int = Query(10, description="Number of small hospitals to return"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Get small hospitals demonstrating excellence"""
     try:
         # Get small hospitals with high transparency scores
-        small_hospitals = db.query(HospitalTransparencyScore).join(Hospital).filter(
-            HospitalTransparencyScore.hospital_size == HospitalSize.SMALL,
-            HospitalTransparencyScore.overall_transparency_score >= 70
-        ).limit(limit).all()
+        small_hospitals = (await db.execute(
+            select(HospitalTransparencyScore).join(Hospital).options(
+                *_EXCELLENCE_LISTING_LOAD
+            ).where(
+                HospitalTransparencyScore.hospital_size == HospitalSize.SMALL,
+                HospitalTransparencyScore.overall_transparency_score >= 70
+            ).limit(limit)
+        )).scalars().all()
+        
+        # Fetch active recognitions for all returned hospitals in one query
+        hospital_ids = [score.hospital_id for score in small_hospitals]
+        recognitions = {}
+        if hospital_ids:
+            for recognition in (await db.execute(
+                select(
+                    HospitalExcellenceRecognition.hospital_id,
+                    HospitalExcellenceRecognition.title,
+                    HospitalExcellenceRecognition.is_featured,
+                    HospitalExcellenceRecognition.is_spotlight
+                ).where(
+                    HospitalExcellenceRecognition.hospital_id.in_(hospital_ids),
+                    HospitalExcellenceRecognition.is_active == True
+                )
+            )):
+                recognitions.setdefault(recognition.hospital_id, recognition)
         
         results = []
         for score in small_hospitals:
-            hospital = score.hospital
-            
-            # Check if hospital has excellence recognition
-            recognition = db.query(HospitalExcellenceRecognition).filter(
-                HospitalExcellenceRecognition.hospital_id == hospital.id,
-                HospitalExcellenceRecognition.is_active == True
-            ).first()
+            recognition = recognitions.get(score.hospital_id)
             
-            results.append({
-                'hospital': {
-                    'id': hospital.id,
-                    'name': hospital.name,
-                    'city': hospital.city,
-                    'bed_count': hospital.bed_count,
-                    'hospital_type': hospital.hospital_type
-                },
-                'transparency_score': score.overall_transparency_score,
-                'community_impact_score': score.community_impact_score,
-                'cost_effectiveness': score.cost_per_bed_transparency,
-                'excellence_recognition': recognition.title if recognition else None,
-                'is_featured': recognition.is_featured if recognition else False,
-                'is_spotlight': recognition.is_spotlight if recognition else False
-            })
+            results.append(SmallHospitalExcellence(
+                hospital=score.hospital,
+                transparency_score=score.overall_transparency_score,
+                community_impact_score=score.community_impact_score,
+                cost_effectiveness=score.cost_per_bed_transparency,
+                excellence_recognition=recognition.title if recognition else None,
+                is_featured=recognition.is_featured if recognition else False,
+                is_spotlight=recognition.is_spotlight if recognition else False
+            ))
         
         # Sort by transparency score
-        results.sort(key=lambda x: x['transparency_score'], reverse=True)
+        results.sort(key=lambda x: x.transparency_score, reverse=True)
         
         logger.info(f"Retrieved {len(results)} small hospital excellence examples")
-        return {
-            'small_hospitals': results,
-            'total_count': len(results),
-            'description': 'Small hospitals demonstrating excellence in transparency and community impact'
-        }
+        return SmallHospitalExcellenceList(
+            small_hospitals=results,
+            total_count=len(results),
+            description='Small hospitals demonstrating excellence in transparency and community impact'
+        )
         
     except Exception as e:
         logger.error(f"Error retrieving small hospital excellence: {e}")
         raise HTTPException(status_code=500, detail="Internal server error")
 
-@router.get("/rural-hospitals/heroes")
+@router.get("/rural-hospitals/heroes", response_model=RuralHospitalHeroList)
 async def get_rural_hospital_heroes(
     limit: int = Query(10, description="Number of rural hospitals to return"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Get rural hospitals demonstrating heroism in healthcare"""
     try:
         # Get rural hospitals with high community impact
-        rural_hospitals = db.query(HospitalTransparencyScore).join(Hospital).filter(
-            HospitalTransparencyScore.hospital_size == HospitalSize.SMALL,
-            HospitalTransparencyScore.community_impact_score >= 60,
-            Hospital.city.ilike('%rural%') | Hospital.illinois_region.ilike('%rural%')
-        ).limit(limit).all()
-        
-        results = []
-        for score in rural_hospitals:
-            hospital = score.hospital
-            
-            results.append({
-                'hospital': {
-                    'id': hospital.id,
-                    'name': hospital.name,
-                    'city': hospital.city,
-                    'county': hospital.county,
-                    'bed_count': hospital.bed_count,
-                    'hospital_type': hospital.hospital_type
-                },
-                'transparency_score': score.overall_transparency_score,
-                'community_impact_score': score.community_impact_score,
-                'cost_effectiveness': score.cost_per_bed_transparency,
-                'rural_hero_qualities': [
-                    'Essential community healthcare provider',
-                    'High community impact score',
-                    'Cost-effective transparency practices',
-                    'Rural healthcare access champion'
-                ]
-            })
-        
-        # Sort by community impact score
-        results.sort(key=lambda x: x['community_impact_score'], reverse=True)
+        rural_hospitals = (await db.execute(
+            select(HospitalTransparencyScore).join(Hospital).options(
+                *_EXCELLENCE_LISTING_LOAD
+            ).where(
+                HospitalTransparencyScore.hospital_size == HospitalSize.SMALL,
+                HospitalTransparencyScore.community_impact_score >= 60,
+                or_(Hospital.city.ilike('%rural%'), Hospital.illinois_region.ilike('%rural%'))
+            ).order_by(
+                HospitalTransparencyScore.community_impact_score.desc()
+            ).limit(limit)
+        )).scalars().all()
+        
+        results = [
+            RuralHospitalHero(
+                hospital=score.hospital,
+                transparency_score=score.overall_transparency_score,
+                community_impact_score=score.community_impact_score,
+                cost_effectiveness=score.cost_per_bed_transparency,
+                rural_hero_qualities=RURAL_HERO_QUALITIES
+            )
+            for score in rural_hospitals
+        ]
         
         logger.info(f"Retrieved {len(results)} rural hospital heroes")
-        return {
-            'rural_heroes': results,
-            'total_count': len(results),
-            'description': 'Rural hospitals demonstrating heroism in community healthcare'
-        }
+        return RuralHospitalHeroList(
+            rural_heroes=results,
+            total_count=len(results),
+            description='Rural hospitals demonstrating heroism in community healthcare'
+        )
         
     except Exception as e:
         logger.error(f"Error retrieving rural hospital heroes: {e}")
         raise HTTPException(status_code=500, detail="Internal server error")
 
+_CATEGORY_DESCRIPTIONS: Final[Dict[TransparencyCategory, str]] = {
+    TransparencyCategory.SMALL_HOSPITAL_EXCELLENCE: "Small hospitals demonstrating outstanding transparency practices",
+    TransparencyCategory.RURAL_INNOVATION: "Rural hospitals showing innovation in healthcare delivery",
+    TransparencyCategory.COMMUNITY_FOCUS: "Hospitals with exceptional community focus and impact",
+    TransparencyCategory.CRITICAL_ACCESS_EXCELLENCE: "Critical access hospitals providing essential community services",
+    TransparencyCategory.COMMUNITY_PARTNERSHIP: "Hospitals with outstanding community partnerships"
+}
+
 def _get_category_description(category: TransparencyCategory) -> str:
     """Get description for excellence category"""
-    descriptions = {
-        TransparencyCategory.SMALL_HOSPITAL_EXCELLENCE: "Small hospitals demonstrating outstanding transparency practices",
-        TransparencyCategory.RURAL_INNOVATION: "Rural hospitals showing innovation in healthcare delivery",
-        TransparencyCategory.COMMUNITY_FOCUS: "Hospitals with exceptional community focus and impact",
-        TransparencyCategory.CRITICAL_ACCESS_EXCELLENCE: "Critical access hospitals providing essential community services",
-        TransparencyCategory.COMMUNITY_PARTNERSHIP: "Hospitals with outstanding community partnerships"
+    return _CATEGORY_DESCRIPTIONS.get(category, "Excellence in healthcare transparency and community impact")
+
+# Static display metadata for every category, built once at import
+_CATEGORY_META: Final[Dict[TransparencyCategory, Dict[str, str]]] = {
+    category: {
+        'name': category.value.replace('_', ' ').title(),
+        'description': _get_category_description(category)
     }
-    return descriptions.get(category, "Excellence in healthcare transparency and community impact")
+    for category in TransparencyCategory
+}
+
+def _peer_group_comparison(group: HospitalPeerGroup, members) -> PeerGroupComparison:
+    """Build a peer group comparison from the group's stats and its ranked members"""
+    return PeerGroupComparison(
+        group_name=group.peer_group_name,
+        group_size=group.peer_group_size,
+        group_avg_transparency_score=group.group_avg_transparency_score,
+        group_median_transparency_score=group.group_median_transparency_score,
+        group_std_transparency_score=group.group_std_transparency_score,
+        group_avg_bed_count=group.group_avg_bed_count,
+        group_avg_community_impact=group.group_avg_community_impact,
+        group_avg_cost_effectiveness=group.group_avg_cost_effectiveness,
+        hospitals=[PeerGroupHospital.model_validate(member) for member in members]
+    )
@@ -1,35 +1,74 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.exceptions import RequestValidationError
+from pydantic import ValidationError
+from sqlalchemy import and_, func, insert, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from itertools import groupby
 from typing import List, Optional
 import structlog
 
 from app.core.database import get_db
+from app.core.cache import cached, invalidate
 from app.models.hospital import Hospital, HospitalProcedure
-from app.schemas.hospital import HospitalCreate, HospitalResponse, HospitalProcedureResponse
-from app.services.data_collection.illinois_hospital_scraper import IllinoisHospitalScraper
+from app.schemas.hospital import (
+    HospitalCreate, HospitalResponse, HospitalProcedureResponse,
+    HospitalPriceInfo, ProcedureComparison, ProcedureSearchResponse,
+    IllinoisOverview, RegionCounts, PROCEDURE_CREATE_LIST
+)
+from app.services.procedure_prices import price_range, price_records
+from app.tasks import get_job_status, scrape_hospital_data_task
 
 router = APIRouter()
 logger = structlog.get_logger()
 
+# Cities used to bucket Illinois hospitals into regions
+CENTRAL_ILLINOIS_CITIES = ('peoria', 'springfield', 'bloomington')
+SOUTHERN_ILLINOIS_CITIES = ('carbondale', 'edwardsville', 'belleville')
+
+# Upper bound on page size for list endpoints
+MAX_PAGE_SIZE = 200
+
+# Price comparisons change only when transparency files are re-ingested
+PROCEDURE_SEARCH_CACHE_TTL = 3600
+
+# Price columns returned per hospital in a procedure comparison
+_COMPARISON_PRICE_FIELDS = (
+    'cash_price', 'negotiated_rate_min', 'negotiated_rate_max', 'medicare_rate', 'medicaid_rate'
+)
+
+# Only the columns the hospital and procedure response schemas return
+_HOSPITAL_COLUMNS = tuple(getattr(Hospital, name) for name in HospitalResponse.response_fields)
+_PROCEDURE_COLUMNS = tuple(getattr(HospitalProcedure, name) for name in HospitalProcedureResponse.response_fields)
+
+def _city_matches(cities):
+    """Case-insensitive substring match of Hospital.city against any of the cities"""
+    return or_(*(Hospital.city.ilike(f"%{city}%") for city in cities))
+
 @router.get("/", response_model=List[HospitalResponse])
 async def get_hospitals(
     city: Optional[str] = Query(None, description="Filter by city"),
     state: Optional[str] = Query("IL", description="Filter by state"),
     hospital_type: Optional[str] = Query(None, description="Filter by hospital type"),
-    db: Session = Depends(get_db)
+    limit: int = Query(50, ge=1, le=MAX_PAGE_SIZE, description="Number of hospitals to return"),
+    offset: int = Query(0, ge=0, description="Number of hospitals to skip"),
+    after_id: Optional[int] = Query(None, description="Return hospitals after this ID (keyset pagination)"),
+    db: AsyncSession = Depends(get_db)
 ):
     """Get all hospitals with optional filtering"""
     try:
-        query = db.query(Hospital)
+        query = select(*_HOSPITAL_COLUMNS)
         
         if city:
-            query = query.filter(Hospital.city.ilike(f"%{city}%"))
+            query = query.where(Hospital.city.ilike(f"%{city}%"))
         if state:
-            query = query.filter(Hospital.state == state)
+            query = query.where(Hospital.state == state)
         if hospital_type:
-            query = query.filter(Hospital.hospital_type == hospital_type)
+            query = query.where(Hospital.hospital_type == hospital_type)
+        if after_id is not None:
+            query = query.where(Hospital.id > after_id)
         
-        hospitals = query.all()
+        query = query.order_by(Hospital.id).offset(offset).limit(limit)
+        hospitals = [HospitalResponse.from_orm_trusted(row) for row in (await db.execute(query)).all()]
         logger.info(f"Retrieved {len(hospitals)} hospitals")
         return hospitals
         
@@ -38,14 +77,14 @@ async def get_hospitals(
         raise HTTPException(status_code=500, detail="Internal server error")
 
 @router.get("/{hospital_id}", response_model=HospitalResponse)
-async def get_hospital(hospital_id: int, db: Session = Depends(get_db)):
+async def get_hospital(hospital_id: int, db: AsyncSession = Depends(get_db)):
     """Get a specific hospital by ID"""
     try:
-        hospital = db.query(Hospital).filter(Hospital.id == hospital_id).first()
-        if not hospital:
+        row = (await db.execute(select(*_HOSPITAL_COLUMNS).where(Hospital.id == hospital_id))).first()
+        if not row:
             raise HTTPException(status_code=404, detail="Hospital not found")
         
-        return hospital
+        return HospitalResponse.from_orm_trusted(row)
         
     except HTTPException:
         raise
@@ -58,23 +97,32 @@ async def get_hospital_procedures(
     hospital_id: int,
     cpt_code: Optional[str] = Query(None, description="Filter by CPT code"),
     procedure_name: Optional[str] = Query(None, description="Filter by procedure name"),
-    db: Session = Depends(get_db)
+    limit: int = Query(100, ge=1, le=MAX_PAGE_SIZE, description="Number of procedures to return"),
+    after_id: Optional[int] = Query(None, description="Return procedures after this ID (keyset pagination)"),
+    db: AsyncSession = Depends(get_db)
 ):
     """Get all procedures for a specific hospital"""
     try:
-        # Verify hospital exists
-        hospital = db.query(Hospital).filter(Hospital.id == hospital_id).first()
-        if not hospital:
-            raise HTTPException(status_code=404, detail="Hospital not found")
-        
-        query = db.query(HospitalProcedure).filter(HospitalProcedure.hospital_id == hospital_id)
+        # Outer join from the hospital so existence and procedures come back in one query
+        join_conditions = [HospitalProcedure.hospital_id == Hospital.id]
         
         if cpt_code:
-            query = query.filter(HospitalProcedure.cpt_code == cpt_code)
+            join_conditions.append(HospitalProcedure.cpt_code == cpt_code)
         if procedure_name:
-            query = query.filter(HospitalProcedure.procedure_name.ilike(f"%{procedure_name}%"))
+            join_conditions.append(HospitalProcedure.procedure_name.ilike(f"%{procedure_name}%"))
+        if after_id is not None:
+            join_conditions.append(HospitalProcedure.id > after_id)
+        
+        query = select(Hospital.id.label('found_hospital_id'), *_PROCEDURE_COLUMNS).outerjoin(
+            HospitalProcedure, and_(*join_conditions)
+        ).where(Hospital.id == hospital_id).order_by(HospitalProcedure.id).limit(limit)
         
-        procedures = query.all()
+        rows = (await db.execute(query)).all()
+        if not rows:
+            raise HTTPException(status_code=404, detail="Hospital not found")
+        
+        # A hospital without matching procedures comes back as one row of NULL procedure columns
+        procedures = [HospitalProcedureResponse.from_orm_trusted(row) for row in rows if row.id is not None]
         logger.info(f"Retrieved {len(procedures)} procedures for hospital {hospital_id}")
         return procedures
         
@@ -85,149 +133,205 @@ async def get_hospital_procedures(
         raise HTTPException(status_code=500, detail="Internal server error")
 
 @router.post("/", response_model=HospitalResponse)
-async def create_hospital(hospital: HospitalCreate, db: Session = Depends(get_db)):
+async def create_hospital(hospital: HospitalCreate, db: AsyncSession = Depends(get_db)):
     """Create a new hospital"""
     try:
         db_hospital = Hospital(**hospital.dict())
         db.add(db_hospital)
-        db.commit()
-        db.refresh(db_hospital)
+        await db.commit()
+        await db.refresh(db_hospital)
+        await invalidate("illinois-overview")
         
         logger.info(f"Created hospital: {db_hospital.name}")
-        return db_hospital
+        return HospitalResponse.from_orm_trusted(db_hospital)
         
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         logger.error(f"Error creating hospital: {e}")
         raise HTTPException(status_code=500, detail="Internal server error")
 
-@router.get("/search/procedures")
+@router.post("/procedures/bulk", status_code=201)
+async def bulk_create_procedures(request: Request, db: AsyncSession = Depends(get_db)):
+    """Create hospital procedures in bulk from a JSON array of HospitalProcedureCreate"""
+    try:
+        # Parse and validate the raw body in a single pydantic-core pass
+        try:
+            procedures = PROCEDURE_CREATE_LIST.validate_json(await request.body())
+        except ValidationError as e:
+            raise RequestValidationError(e.errors())
+        
+        if not procedures:
+            return {'created': 0}
+        
+        hospital_ids = {procedure.hospital_id for procedure in procedures}
+        found_ids = set((await db.execute(
+            select(Hospital.id).where(Hospital.id.in_(hospital_ids))
+        )).scalars())
+        missing_ids = hospital_ids - found_ids
+        if missing_ids:
+            raise HTTPException(status_code=404, detail=f"Hospitals not found: {sorted(missing_ids)}")
+        
+        await db.execute(insert(HospitalProcedure), [procedure.model_dump() for procedure in procedures])
+        await db.commit()
+        await invalidate("illinois-overview", "procedure-search")
+        
+        logger.info(f"Created {len(procedures)} procedures for {len(hospital_ids)} hospitals")
+        return {'created': len(procedures)}
+        
+    except (HTTPException, RequestValidationError):
+        raise
+    except Exception as e:
+        await db.rollback()
+        logger.error(f"Error creating procedures in bulk: {e}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+@router.get("/search/procedures", response_model=ProcedureSearchResponse)
+@cached("procedure-search", ttl=PROCEDURE_SEARCH_CACHE_TTL)
 async def search_procedures(
     procedure_name: str = Query(..., description="Procedure name to search for"),
     city: Optional[str] = Query(None, description="Filter by city"),
     max_price: Optional[float] = Query(None, description="Maximum price filter"),
-    db: Session = Depends(get_db)
+    limit: int = Query(50, ge=1, le=MAX_PAGE_SIZE, description="Number of procedures to return"),
+    offset: int = Query(0, ge=0, description="Number of procedures to skip"),
+    db: AsyncSession = Depends(get_db)
 ):
     """Search for procedures across hospitals with pricing comparison"""
     try:
-        query = db.query(HospitalProcedure).join(Hospital)
-        
+        filters = []
         if procedure_name:
-            query = query.filter(HospitalProcedure.procedure_name.ilike(f"%{procedure_name}%"))
+            filters.append(HospitalProcedure.procedure_name.ilike(f"%{procedure_name}%"))
         if city:
-            query = query.filter(Hospital.city.ilike(f"%{city}%"))
+            filters.append(Hospital.city.ilike(f"%{city}%"))
         if max_price:
-            query = query.filter(HospitalProcedure.cash_price <= max_price)
+            filters.append(HospitalProcedure.cash_price <= max_price)
         
-        procedures = query.all()
+        # Page over distinct procedures so a comparison is never split across pages
+        page = select(
+            HospitalProcedure.cpt_code,
+            HospitalProcedure.procedure_name
+        ).join(Hospital, HospitalProcedure.hospital_id == Hospital.id).where(*filters).distinct().order_by(
+            HospitalProcedure.cpt_code,
+            HospitalProcedure.procedure_name
+        ).offset(offset).limit(limit).subquery()
         
-        # Group by procedure for comparison
-        procedure_groups = {}
-        for proc in procedures:
-            key = (proc.cpt_code, proc.procedure_name)
-            if key not in procedure_groups:
-                procedure_groups[key] = []
-            procedure_groups[key].append(proc)
+        # Only the columns returned are selected; rows come back grouped by
+        # procedure and ordered by cash price so one pass builds the comparison
+        query = select(
+            HospitalProcedure.cpt_code,
+            HospitalProcedure.procedure_name,
+            Hospital.name.label('hospital_name'),
+            Hospital.city,
+            *(getattr(HospitalProcedure, name) for name in _COMPARISON_PRICE_FIELDS)
+        ).join(Hospital, HospitalProcedure.hospital_id == Hospital.id).join(
+            page,
+            and_(
+                HospitalProcedure.cpt_code == page.c.cpt_code,
+                HospitalProcedure.procedure_name == page.c.procedure_name
+            )
+        ).where(*filters).order_by(
+            HospitalProcedure.cpt_code,
+            HospitalProcedure.procedure_name,
+            HospitalProcedure.cash_price.asc().nullslast()
+        )
+        rows = (await db.execute(query)).all()
         
-        # Format results for comparison
+        # Format results for comparison; prices are aggregated on a packed
+        # NumPy record array and only the response is built from Python objects
         comparison_results = []
-        for (cpt_code, proc_name), hospital_procs in procedure_groups.items():
-            comparison = {
-                'cpt_code': cpt_code,
-                'procedure_name': proc_name,
-                'hospitals': []
-            }
-            
-            for proc in hospital_procs:
-                hospital_info = {
-                    'hospital_name': proc.hospital.name,
-                    'city': proc.hospital.city,
-                    'cash_price': proc.cash_price,
-                    'negotiated_rate_min': proc.negotiated_rate_min,
-                    'negotiated_rate_max': proc.negotiated_rate_max,
-                    'medicare_rate': proc.medicare_rate,
-                    'medicaid_rate': proc.medicaid_rate
-                }
-                comparison['hospitals'].append(hospital_info)
-            
-            # Sort by cash price
-            comparison['hospitals'].sort(key=lambda x: x['cash_price'] or float('inf'))
-            comparison_results.append(comparison)
+        for (cpt_code, proc_name), group in groupby(rows, key=lambda r: (r.cpt_code, r.procedure_name)):
+            hospital_rows = list(group)
+            cash_min, cash_median, cash_max = price_range(price_records(hospital_rows, _COMPARISON_PRICE_FIELDS))
+            comparison_results.append(ProcedureComparison(
+                cpt_code=cpt_code,
+                procedure_name=proc_name,
+                cash_price_min=cash_min,
+                cash_price_median=cash_median,
+                cash_price_max=cash_max,
+                hospitals=[HospitalPriceInfo.model_validate(row) for row in hospital_rows]
+            ))
         
         logger.info(f"Found {len(comparison_results)} procedures matching search criteria")
-        return {
-            'search_term': procedure_name,
-            'total_procedures': len(comparison_results),
-            'results': comparison_results
-        }
+        return ProcedureSearchResponse(
+            search_term=procedure_name,
+            total_procedures=len(comparison_results),
+            results=comparison_results
+        )
         
     except Exception as e:
         logger.error(f"Error searching procedures: {e}")
         raise HTTPException(status_code=500, detail="Internal server error")
 
-@router.post("/scrape-data")
-async def scrape_hospital_data(db: Session = Depends(get_db)):
-    """Trigger data scraping for Illinois hospitals"""
+@router.post("/scrape-data", status_code=202)
+async def scrape_hospital_data():
+    """Queue data scraping for Illinois hospitals on the background worker"""
     try:
-        logger.info("Starting hospital data scraping...")
-        
-        # Run scraper
-        async with IllinoisHospitalScraper() as scraper:
-            results = await scraper.scrape_all_hospitals()
-        
-        # Process results and save to database
-        total_procedures = 0
-        for hospital_name, procedures in results.items():
-            logger.info(f"Processing {len(procedures)} procedures for {hospital_name}")
-            total_procedures += len(procedures)
-            
-            # Here you would save the scraped data to the database
-            # For now, just log the results
-        
-        logger.info(f"Data scraping completed. Total procedures found: {total_procedures}")
+        task = scrape_hospital_data_task.delay()
+        logger.info(f"Queued hospital data scraping as job {task.id}")
         
         return {
-            'status': 'success',
-            'message': f'Data scraping completed. Found {total_procedures} procedures.',
-            'hospitals_processed': len(results),
-            'total_procedures': total_procedures
+            'job_id': task.id,
+            'status': 'queued',
+            'message': 'Hospital data scraping queued'
         }
         
     except Exception as e:
-        logger.error(f"Error during data scraping: {e}")
+        logger.error(f"Error queuing data scraping: {e}")
         raise HTTPException(status_code=500, detail=f"Data scraping failed: {str(e)}")
 
-@router.get("/illinois/overview")
-async def get_illinois_overview(db: Session = Depends(get_db)):
+@router.get("/scrape-data/status/{job_id}")
+def get_scrape_status(job_id: str):
+    """Get the status of a queued data scraping job"""
+    try:
+        return get_job_status(job_id)
+        
+    except Exception as e:
+        logger.error(f"Error retrieving scraping job {job_id}: {e}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+@router.get("/illinois/overview", response_model=IllinoisOverview)
+@cached("illinois-overview")
+async def get_illinois_overview(db: AsyncSession = Depends(get_db)):
     """Get overview of Illinois healthcare data"""
     try:
-        # Get Illinois hospitals
-        illinois_hospitals = db.query(Hospital).filter(Hospital.state == "IL").all()
+        # Count Illinois hospitals per region in the database instead of loading every row
+        hospital_counts = (await db.execute(
+            select(
+                func.count(Hospital.id).label('total'),
+                func.count(Hospital.id).filter(_city_matches(('chicago',))).label('chicago_metro'),
+                func.count(Hospital.id).filter(_city_matches(CENTRAL_ILLINOIS_CITIES)).label('central_illinois'),
+                func.count(Hospital.id).filter(_city_matches(SOUTHERN_ILLINOIS_CITIES)).label('southern_illinois')
+            ).where(Hospital.state == "IL")
+        )).one()
         
         # Get procedure counts
-        total_procedures = db.query(HospitalProcedure).join(Hospital).filter(Hospital.state == "IL").count()
+        total_procedures = (await db.execute(
+            select(func.count()).select_from(HospitalProcedure).join(Hospital).where(Hospital.state == "IL")
+        )).scalar()
         
         # Get cities with hospitals
-        cities = db.query(Hospital.city).filter(Hospital.state == "IL").distinct().all()
-        cities = [city[0] for city in cities]
+        cities = (await db.execute(
+            select(Hospital.city).where(Hospital.state == "IL").distinct()
+        )).scalars().all()
         
         # Get hospital types
-        hospital_types = db.query(Hospital.hospital_type).filter(Hospital.state == "IL").distinct().all()
-        hospital_types = [ht[0] for ht in hospital_types if ht[0]]
-        
-        overview = {
-            'total_hospitals': len(illinois_hospitals),
-            'total_procedures': total_procedures,
-            'cities': cities,
-            'hospital_types': hospital_types,
-            'regions': {
-                'chicago_metro': len([h for h in illinois_hospitals if 'chicago' in h.city.lower()]),
-                'central_illinois': len([h for h in illinois_hospitals if any(city in h.city.lower() for city in ['peoria', 'springfield', 'bloomington'])]),
-                'southern_illinois': len([h for h in illinois_hospitals if any(city in h.city.lower() for city in ['carbondale', 'edwardsville', 'belleville'])])
-            }
-        }
+        hospital_types = (await db.execute(
+            select(Hospital.hospital_type).where(
+                Hospital.state == "IL",
+                Hospital.hospital_type.is_not(None)
+            ).distinct()
+        )).scalars().all()
         
-        return overview
+        return IllinoisOverview(
+            total_hospitals=hospital_counts.total,
+            total_procedures=total_procedures,
+            cities=list(cities),
+            hospital_types=list(hospital_types),
+            regions=RegionCounts(
+                chicago_metro=hospital_counts.chicago_metro,
+                central_illinois=hospital_counts.central_illinois,
+                southern_illinois=hospital_counts.southern_illinois
+            )
+        )
         
     except Exception as e:
         logger.error(f"Error getting Illinois overview: {e}")
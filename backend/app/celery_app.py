@@ -0,0 +1,20 @@
+from celery import Celery
+
+from app.core.config import settings
+
+# Redis is both the broker and the result backend; job status is read back by the API
+celery_app = Celery(
+    "melena",
+    broker=settings.REDIS_URL,
+    backend=settings.REDIS_URL,
+    include=["app.tasks"]
+)
+
+celery_app.conf.update(
+    task_serializer="json",
+    result_serializer="json",
+    accept_content=["json"],
+    task_track_started=True,
+    result_expires=24 * 60 * 60,
+    worker_prefetch_multiplier=1
+)
@@ -0,0 +1,97 @@
+import enum
+import functools
+import hashlib
+import json
+from typing import Any, Callable, Optional
+
+import redis.asyncio as redis
+from redis.exceptions import RedisError
+from fastapi import Response
+from fastapi.encoders import jsonable_encoder
+import structlog
+
+from app.core.config import settings
+
+logger = structlog.get_logger()
+
+CACHE_NAMESPACE = "melena:cache"
+
+_client: Optional[redis.Redis] = None
+
+def get_redis() -> redis.Redis:
+    """Get the shared Redis client (created lazily)"""
+    global _client
+    if _client is None:
+        _client = redis.from_url(settings.REDIS_URL)
+    return _client
+
+async def close_redis():
+    """Close the shared Redis client"""
+    global _client
+    if _client is not None:
+        await _client.close()
+        _client = None
+
+def _key_value(value: Any) -> Any:
+    """Normalize a parameter value for use in a cache key"""
+    if isinstance(value, enum.Enum):
+        return value.value
+    return value
+
+def _build_key(prefix: str, params: dict) -> str:
+    """Build a cache key from a prefix and the endpoint's query parameters"""
+    payload = json.dumps(
+        {name: _key_value(value) for name, value in sorted(params.items())},
+        default=str
+    )
+    digest = hashlib.sha1(payload.encode()).hexdigest()
+    return f"{CACHE_NAMESPACE}:{prefix}:{digest}"
+
+def cached(prefix: str, ttl: int = 300) -> Callable:
+    """Cache-aside decorator for read-only endpoints.
+
+    The key is built from the prefix and the endpoint's keyword arguments
+    (the ``db`` session is ignored). Hits are served as the stored JSON bytes
+    without decoding; endpoints that already return an encoded ``Response``
+    are cached by body. Redis failures fall through to the wrapped endpoint
+    so the cache is never a hard dependency.
+    """
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            params = {name: value for name, value in kwargs.items() if name != "db"}
+            key = _build_key(prefix, params)
+
+            try:
+                hit = await get_redis().get(key)
+                if hit is not None:
+                    return Response(content=hit, media_type="application/json")
+            except RedisError as e:
+                logger.warning(f"Cache read failed for {key}: {e}")
+
+            result = await func(*args, **kwargs)
+
+            if isinstance(result, Response):
+                body = result.body
+            else:
+                body = json.dumps(jsonable_encoder(result))
+
+            try:
+                await get_redis().setex(key, ttl, body)
+            except RedisError as e:
+                logger.warning(f"Cache write failed for {key}: {e}")
+
+            return result
+        return wrapper
+    return decorator
+
+async def invalidate(*prefixes: str):
+    """Delete all cached entries under the given prefixes"""
+    try:
+        client = get_redis()
+        for prefix in prefixes:
+            keys = [key async for key in client.scan_iter(match=f"{CACHE_NAMESPACE}:{prefix}:*")]
+            if keys:
+                await client.delete(*keys)
+    except RedisError as e:
+        logger.warning(f"Cache invalidation failed for {prefixes}: {e}")
@@ -1,42 +1,96 @@
-from sqlalchemy import create_engine
+from sqlalchemy import DDL, create_engine, event
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, Session
-from sqlalchemy.pool import StaticPool
+from typing import Any, AsyncGenerator
+import orjson
 import structlog
 
 from app.core.config import settings
 
 logger = structlog.get_logger()
 
-# Create database engine
+def _json_serializer(value: Any) -> str:
+    """Encode JSON/JSONB column values with orjson"""
+    return orjson.dumps(value).decode()
+
+# Create database engine (used by background services and scripts)
 engine = create_engine(
     settings.DATABASE_URL,
     pool_pre_ping=True,
-    pool_recycle=300,
-    pool_size=10,
-    max_overflow=20,
+    pool_recycle=settings.DB_POOL_RECYCLE,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_use_lifo=True,
+    json_serializer=_json_serializer,
+    json_deserializer=orjson.loads,
+    echo=settings.DEBUG
+)
+
+# Create async database engine (used by API request handlers)
+async_engine = create_async_engine(
+    settings.DATABASE_URL.replace("postgresql://", "postgresql+asyncpg://", 1),
+    pool_pre_ping=True,
+    pool_recycle=settings.DB_POOL_RECYCLE,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_use_lifo=True,
+    json_serializer=_json_serializer,
+    json_deserializer=orjson.loads,
     echo=settings.DEBUG
 )
 
-# Create session factory
+# Create session factories
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+AsyncSessionLocal = async_sessionmaker(async_engine, class_=AsyncSession, expire_on_commit=False)
 
 # Create base class for models
 Base = declarative_base()
 
-def get_db() -> Session:
+# Trigram indexes (gin_trgm_ops) need pg_trgm before any table is created
+event.listen(Base.metadata, "before_create", DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+
+# updated_at is maintained by the database on every UPDATE, so the ORM never sends it
+event.listen(Base.metadata, "before_create", DDL("""
+    CREATE OR REPLACE FUNCTION set_updated_at() RETURNS trigger AS $$
+    BEGIN
+        NEW.updated_at = now();
+        RETURN NEW;
+    END;
+    $$ LANGUAGE plpgsql
+"""))
+
+@event.listens_for(Base.metadata, "after_create")
+def create_updated_at_triggers(target, connection, **kw):
+    """Attach the set_updated_at trigger to every table with an updated_at column"""
+    for table in target.sorted_tables:
+        if "updated_at" in table.c:
+            connection.execute(DDL(f"DROP TRIGGER IF EXISTS set_updated_at ON {table.name}"))
+            connection.execute(DDL(
+                f"CREATE TRIGGER set_updated_at BEFORE UPDATE ON {table.name} "
+                f"FOR EACH ROW EXECUTE FUNCTION set_updated_at()"
+            ))
+
+# Loader strategy for relationships read off single rows (hospital, medication
+# and pharmacy parents, medication alternatives); "raise_on_sql"
+# makes any accidental lazy load fail loudly instead of issuing an N+1 query
+RELATIONSHIP_LAZY = "raise_on_sql" if settings.STRICT_RELATIONSHIP_LOADING else "select"
+
+async def get_db() -> AsyncGenerator[AsyncSession, None]:
     """Dependency to get database session"""
-    db = SessionLocal()
-    try:
+    async with AsyncSessionLocal() as db:
         yield db
-    finally:
-        db.close()
+
+async def dispose_engines():
+    """Close all pooled connections held by the engines"""
+    await async_engine.dispose()
+    engine.dispose()
 
 def init_db():
     """Initialize database with tables"""
     try:
         # Import all models here to ensure they are registered
-        from app.models import hospital, procedure, insurance, medication
+        from app.models import hospital, hospital_scoring, insurance, medication
         
         # Create all tables
         Base.metadata.create_all(bind=engine)
@@ -0,0 +1,30 @@
+from decimal import Decimal
+from typing import Any
+import orjson
+from fastapi.responses import JSONResponse
+
+def _default(value: Any) -> Any:
+    """Serialize values orjson has no native encoding for"""
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+class ORJSONResponse(JSONResponse):
+    """JSON response rendered with orjson
+
+    Used as the app's default response class; datetimes, enums, dataclasses
+    and numpy values are encoded natively. Naive datetimes are treated as UTC
+    and UTC offsets are written as ``Z``.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(
+            content,
+            default=_default,
+            option=(
+                orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+                | orjson.OPT_NAIVE_UTC | orjson.OPT_UTC_Z
+            )
+        )
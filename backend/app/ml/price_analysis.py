@@ -1,22 +1,78 @@
 import pandas as pd
 import numpy as np
 from sklearn.ensemble import IsolationForest, RandomForestRegressor
-from sklearn.preprocessing import StandardScaler, LabelEncoder
+from sklearn.preprocessing import StandardScaler
 from sklearn.model_selection import train_test_split
-from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
+from sklearn.metrics import r2_score
 from sklearn.cluster import KMeans
 import joblib
 import structlog
-from typing import Dict, List, Tuple, Optional
+from typing import Dict, List, Optional, Tuple, Union
 from datetime import datetime
+from functools import lru_cache
 import os
+from sqlalchemy import select
+from sqlalchemy.orm import Session
 
 from app.core.config import settings
-from app.models.hospital import HospitalProcedure
+from app.models.hospital import Hospital, HospitalProcedure
 from app.core.database import SessionLocal
 
 logger = structlog.get_logger()
 
+# Price columns read for every procedure; missing prices are treated as 0
+PRICE_COLUMNS = [
+    'cash_price', 'negotiated_rate_min', 'negotiated_rate_max',
+    'medicare_rate', 'medicaid_rate', 'facility_fee',
+    'professional_fee', 'anesthesia_fee'
+]
+
+# Price inputs to the price predictor, after the two encoded categorical features
+PREDICTOR_PRICE_FEATURES = [
+    'negotiated_rate_min', 'medicare_rate', 'medicaid_rate',
+    'facility_fee', 'professional_fee'
+]
+
+# Price inputs to the anomaly detector, followed by price_range and insurance_discount
+ANOMALY_PRICE_COLUMNS = [
+    'cash_price', 'negotiated_rate_min', 'negotiated_rate_max',
+    'medicare_rate', 'medicaid_rate'
+]
+ANOMALY_FEATURES = ANOMALY_PRICE_COLUMNS + ['price_range', 'insurance_discount']
+
+# Cash price markup thresholds (multiples of the reference rate) used to classify anomalies
+MEDICARE_EXCESSIVE = 5.0
+MEDICARE_HIGH = 3.0
+MEDICAID_EXCESSIVE = 8.0
+NEG_RATE_HIGH = 2.0
+
+# Anomaly type labels indexed by the class codes from _classify_anomalies
+ANOMALY_TYPES = np.array([
+    "Price Outlier", "Excessive Cash Markup", "High Cash Markup", "Excessive Medicaid Markup"
+])
+
+# Directory of the trained models, and the files train_models writes there
+MODELS_DIR = "app/ml/models"
+MODEL_FILES = ('anomaly_detector.pkl', 'scaler.pkl', 'price_predictor.pkl', 'categories.pkl')
+
+# Feature columns added by HealthcarePriceAnalyzer.prepare_data
+DERIVED_COLUMNS = [
+    'cpt_code_encoded', 'hospital_encoded',
+    'total_price', 'price_range', 'insurance_discount'
+]
+
+def load_procedure_frame(db: Session) -> pd.DataFrame:
+    """Load procedure pricing joined to hospital names in a single query"""
+    stmt = select(
+        HospitalProcedure.id.label('procedure_id'),
+        HospitalProcedure.cpt_code,
+        HospitalProcedure.procedure_name,
+        Hospital.name.label('hospital_name'),
+        *(getattr(HospitalProcedure, column) for column in PRICE_COLUMNS)
+    ).join(Hospital, HospitalProcedure.hospital_id == Hospital.id)
+    
+    return pd.read_sql(stmt, db.connection())
+
 class HealthcarePriceAnalyzer:
     """AI-powered healthcare price analysis and optimization"""
     
@@ -25,78 +81,90 @@ class HealthcarePriceAnalyzer:
         self.anomaly_detector = IsolationForest(
             contamination=0.1,
             random_state=42,
-            n_estimators=100
+            n_estimators=100,
+            n_jobs=settings.ML_N_JOBS
         )
         self.price_predictor = RandomForestRegressor(
             n_estimators=100,
             random_state=42,
-            max_depth=10
+            max_depth=10,
+            n_jobs=settings.ML_N_JOBS
         )
-        self.procedure_encoder = LabelEncoder()
-        self.hospital_encoder = LabelEncoder()
+        # Category vocabularies learned in prepare_data; codes are positions in these indexes
+        self.procedure_categories = pd.Index([])
+        self.hospital_categories = pd.Index([])
+        self._models_loaded = False
+        # Model file modification times when the models were loaded (see reload_analyzer)
+        self.models_version: Optional[Tuple] = None
         
         # Model paths
-        self.models_dir = "app/ml/models"
+        self.models_dir = MODELS_DIR
         self._ensure_models_directory()
         
     def _ensure_models_directory(self):
         """Ensure models directory exists"""
         os.makedirs(self.models_dir, exist_ok=True)
     
-    def prepare_data(self, procedures: List[HospitalProcedure]) -> pd.DataFrame:
-        """Prepare data for ML models"""
-        data = []
-        
-        for procedure in procedures:
-            data.append({
-                'cpt_code': procedure.cpt_code,
-                'procedure_name': procedure.procedure_name,
-                'hospital_name': procedure.hospital.name,
-                'cash_price': procedure.cash_price or 0,
-                'negotiated_rate_min': procedure.negotiated_rate_min or 0,
-                'negotiated_rate_max': procedure.negotiated_rate_max or 0,
-                'medicare_rate': procedure.medicare_rate or 0,
-                'medicaid_rate': procedure.medicaid_rate or 0,
-                'facility_fee': procedure.facility_fee or 0,
-                'professional_fee': procedure.professional_fee or 0,
-                'anesthesia_fee': procedure.anesthesia_fee or 0
+    def prepare_data(self, procedures: Union[pd.DataFrame, List[HospitalProcedure]], fit: bool = True) -> pd.DataFrame:
+        """Prepare data for ML models from a procedure frame (or a list of procedures)
+
+        With fit=False the stored category vocabularies are reused instead of
+        relearned, so codes match training; unseen values are encoded as -1.
+        A frame this analyzer already prepared is then returned as is.
+        """
+        if isinstance(procedures, pd.DataFrame):
+            # Only reuse the frame's codes when no vocabulary has to be learned from it
+            if not fit and set(DERIVED_COLUMNS).issubset(procedures.columns):
+                return procedures
+            df = procedures.copy()
+        else:
+            # Build column-wise so pandas does not have to transpose a list of row dicts
+            df = pd.DataFrame({
+                'procedure_id': np.fromiter((procedure.id for procedure in procedures), dtype=np.int64, count=len(procedures)),
+                'cpt_code': [procedure.cpt_code for procedure in procedures],
+                'procedure_name': [procedure.procedure_name for procedure in procedures],
+                'hospital_name': [procedure.hospital.name for procedure in procedures],
+                **{
+                    column: np.array([getattr(procedure, column) for procedure in procedures], dtype=float)
+                    for column in PRICE_COLUMNS
+                }
             })
         
-        df = pd.DataFrame(data)
+        # Handle missing values: a missing price counts as 0, filled for all columns at once
+        df[PRICE_COLUMNS] = df[PRICE_COLUMNS].fillna(0)
         
         # Clean and encode categorical variables
-        df['cpt_code_encoded'] = self.procedure_encoder.fit_transform(df['cpt_code'].fillna('UNKNOWN'))
-        df['hospital_encoded'] = self.hospital_encoder.fit_transform(df['hospital_name'].fillna('UNKNOWN'))
+        if fit:
+            cpt_codes = pd.Categorical(df['cpt_code'].fillna('UNKNOWN'))
+            hospital_names = pd.Categorical(df['hospital_name'].fillna('UNKNOWN'))
+            self.procedure_categories = cpt_codes.categories
+            self.hospital_categories = hospital_names.categories
+        else:
+            cpt_codes = pd.Categorical(df['cpt_code'].fillna('UNKNOWN'), categories=self.procedure_categories)
+            hospital_names = pd.Categorical(df['hospital_name'].fillna('UNKNOWN'), categories=self.hospital_categories)
+        df['cpt_code_encoded'] = cpt_codes.codes
+        df['hospital_encoded'] = hospital_names.codes
         
         # Calculate derived features
-        df['total_price'] = df['cash_price']
-        df['price_range'] = df['negotiated_rate_max'] - df['negotiated_rate_min']
-        df['insurance_discount'] = df['cash_price'] - df['negotiated_rate_min']
-        
-        # Handle missing values
-        numeric_columns = ['cash_price', 'negotiated_rate_min', 'negotiated_rate_max', 
-                          'medicare_rate', 'medicaid_rate', 'facility_fee', 
-                          'professional_fee', 'anesthesia_fee']
-        
-        for col in numeric_columns:
-            df[col] = df[col].fillna(df[col].median())
+        cash_price = df['cash_price'].to_numpy()
+        rate_min = df['negotiated_rate_min'].to_numpy()
+        df['total_price'] = cash_price
+        df['price_range'] = df['negotiated_rate_max'].to_numpy() - rate_min
+        df['insurance_discount'] = cash_price - rate_min
         
         return df
     
-    def train_anomaly_detector(self, procedures: List[HospitalProcedure]) -> Dict:
-        """Train anomaly detection model for price outliers"""
+    def train_anomaly_detector(self, procedures: Union[pd.DataFrame, List[HospitalProcedure]], fit: bool = True) -> Dict:
+        """Train anomaly detection model for price outliers
+
+        Pass fit=False with a frame this analyzer already prepared (see prepare_data).
+        """
         try:
             logger.info("Training anomaly detection model...")
             
-            df = self.prepare_data(procedures)
+            df = self.prepare_data(procedures, fit=fit)
             
-            # Features for anomaly detection
-            anomaly_features = [
-                'cash_price', 'negotiated_rate_min', 'negotiated_rate_max',
-                'medicare_rate', 'medicaid_rate', 'price_range', 'insurance_discount'
-            ]
-            
-            X_anomaly = df[anomaly_features].values
+            X_anomaly = df[ANOMALY_FEATURES].to_numpy(dtype=np.float32)
             
             # Scale features
             X_scaled = self.scaler.fit_transform(X_anomaly)
@@ -104,12 +172,9 @@ class HealthcarePriceAnalyzer:
             # Train anomaly detector
             self.anomaly_detector.fit(X_scaled)
             
-            # Detect anomalies
+            # Detect anomalies; predict() is just decision_function() < 0, so walk the trees once
             anomaly_scores = self.anomaly_detector.decision_function(X_scaled)
-            anomaly_predictions = self.anomaly_detector.predict(X_scaled)
-            
-            # Convert predictions to boolean (1 = normal, -1 = anomaly)
-            anomalies = anomaly_predictions == -1
+            anomalies = anomaly_scores < 0
             
             # Calculate anomaly statistics
             anomaly_stats = {
@@ -125,6 +190,7 @@ class HealthcarePriceAnalyzer:
             # Save model
             self._save_model('anomaly_detector.pkl', self.anomaly_detector)
             self._save_model('scaler.pkl', self.scaler)
+            self._save_categories()
             
             return {
                 'model_trained': True,
@@ -136,20 +202,20 @@ class HealthcarePriceAnalyzer:
             logger.error(f"Error training anomaly detection model: {e}")
             return {'model_trained': False, 'error': str(e)}
     
-    def train_price_predictor(self, procedures: List[HospitalProcedure]) -> Dict:
-        """Train price prediction model"""
+    def train_price_predictor(self, procedures: Union[pd.DataFrame, List[HospitalProcedure]], fit: bool = True) -> Dict:
+        """Train price prediction model
+
+        Pass fit=False with a frame this analyzer already prepared (see prepare_data).
+        """
         try:
             logger.info("Training price prediction model...")
             
-            df = self.prepare_data(procedures)
+            df = self.prepare_data(procedures, fit=fit)
             
             # Features for price prediction
-            feature_columns = [
-                'cpt_code_encoded', 'hospital_encoded', 'negotiated_rate_min',
-                'medicare_rate', 'medicaid_rate', 'facility_fee', 'professional_fee'
-            ]
+            feature_columns = ['cpt_code_encoded', 'hospital_encoded', *PREDICTOR_PRICE_FEATURES]
             
-            X = df[feature_columns].values
+            X = df[feature_columns].to_numpy(dtype=np.float32)
             y = df['cash_price'].values
             
             # Split data
@@ -163,18 +229,25 @@ class HealthcarePriceAnalyzer:
             # Evaluate model
             y_pred = self.price_predictor.predict(X_test)
             
+            # Error terms are computed once and shared by the metrics; accuracy
+            # only counts procedures with a cash price, since 0 targets divide by zero
+            abs_errors = np.abs(y_test - y_pred)
+            priced = y_test > 0
+            mape = np.mean(abs_errors[priced] / y_test[priced]) if priced.any() else np.nan
+            
             metrics = {
-                'mae': mean_absolute_error(y_test, y_pred),
-                'rmse': np.sqrt(mean_squared_error(y_test, y_pred)),
+                'mae': float(np.mean(abs_errors)),
+                'rmse': float(np.sqrt(np.mean(abs_errors ** 2))),
                 'r2': r2_score(y_test, y_pred),
                 'mean_price': np.mean(y_test),
-                'prediction_accuracy': (1 - np.mean(np.abs(y_test - y_pred) / y_test)) * 100
+                'prediction_accuracy': float((1 - mape) * 100)
             }
             
             logger.info(f"Price prediction model trained. R²: {metrics['r2']:.3f}, Accuracy: {metrics['prediction_accuracy']:.1f}%")
             
             # Save model
             self._save_model('price_predictor.pkl', self.price_predictor)
+            self._save_categories()
             
             return {
                 'model_trained': True,
@@ -186,47 +259,43 @@ class HealthcarePriceAnalyzer:
             logger.error(f"Error training price prediction model: {e}")
             return {'model_trained': False, 'error': str(e)}
     
-    def detect_price_anomalies(self, procedures: List[HospitalProcedure]) -> List[Dict]:
+    def detect_price_anomalies(self, procedures: Union[pd.DataFrame, List[HospitalProcedure]]) -> List[Dict]:
         """Detect price anomalies in procedures"""
         try:
-            # Load models if not already trained
-            if not hasattr(self, 'anomaly_detector') or not hasattr(self, 'scaler'):
+            # Load models if not already loaded
+            if not self._models_loaded:
                 self._load_models()
             
-            df = self.prepare_data(procedures)
-            
-            # Features for anomaly detection
-            anomaly_features = [
-                'cash_price', 'negotiated_rate_min', 'negotiated_rate_max',
-                'medicare_rate', 'medicaid_rate', 'price_range', 'insurance_discount'
-            ]
-            
-            X_anomaly = df[anomaly_features].values
+            # Detection only needs the scaled price features, not the full prepared frame
+            X_anomaly = self._anomaly_features(procedures)
             X_scaled = self.scaler.transform(X_anomaly)
             
-            # Detect anomalies
+            # Detect anomalies; predict() is just decision_function() < 0, so walk the trees once
             anomaly_scores = self.anomaly_detector.decision_function(X_scaled)
-            anomaly_predictions = self.anomaly_detector.predict(X_scaled)
+            
+            anomaly_indices = np.flatnonzero(anomaly_scores < 0)
+            flagged_features = X_anomaly[anomaly_indices]
+            anomaly_types = self._classify_anomalies(flagged_features)
             
             anomalies = []
             
-            for i, (score, prediction) in enumerate(zip(anomaly_scores, anomaly_predictions)):
-                if prediction == -1:  # Anomaly detected
-                    procedure = procedures[i]
-                    
-                    anomaly_info = {
-                        'procedure_id': procedure.id,
-                        'hospital_name': procedure.hospital.name,
-                        'procedure_name': procedure.procedure_name,
-                        'cpt_code': procedure.cpt_code,
-                        'cash_price': procedure.cash_price,
-                        'anomaly_score': float(score),
-                        'anomaly_type': self._classify_anomaly(procedure, df.iloc[i]),
-                        'recommendations': self._generate_anomaly_recommendations(procedure, df.iloc[i]),
-                        'detected_at': datetime.now()
-                    }
-                    
-                    anomalies.append(anomaly_info)
+            for (procedure_id, hospital_name, procedure_name, cpt_code, cash_price), features, score, anomaly_type in zip(
+                self._anomaly_details(procedures, anomaly_indices),
+                flagged_features, anomaly_scores[anomaly_indices], anomaly_types
+            ):
+                anomaly_info = {
+                    'procedure_id': int(procedure_id),
+                    'hospital_name': hospital_name,
+                    'procedure_name': procedure_name,
+                    'cpt_code': cpt_code,
+                    'cash_price': float(cash_price),
+                    'anomaly_score': float(score),
+                    'anomaly_type': str(anomaly_type),
+                    'recommendations': self._generate_anomaly_recommendations(features),
+                    'detected_at': datetime.now()
+                }
+                
+                anomalies.append(anomaly_info)
             
             logger.info(f"Detected {len(anomalies)} price anomalies")
             return anomalies
@@ -237,31 +306,39 @@ class HealthcarePriceAnalyzer:
     
     def predict_procedure_price(self, procedure_data: Dict) -> Dict:
         """Predict price for a procedure"""
+        return self.predict_procedure_prices([procedure_data])[0]
+    
+    def predict_procedure_prices(self, procedures: List[Dict]) -> List[Dict]:
+        """Predict prices for a batch of procedures with a single model call"""
         try:
-            # Load model if not already trained
-            if not hasattr(self, 'price_predictor'):
+            # Load model if not already loaded
+            if not self._models_loaded:
                 self._load_models()
             
             # Prepare input data
-            input_features = self._prepare_prediction_input(procedure_data)
+            X = self._prepare_prediction_inputs(procedures)
             
-            # Make prediction
-            predicted_price = self.price_predictor.predict([input_features])[0]
+            # Make predictions
+            predicted_prices = self.price_predictor.predict(X)
             
-            # Calculate confidence interval (simplified)
-            confidence_interval = predicted_price * 0.15  # ±15% confidence
+            # Calculate confidence intervals (simplified)
+            confidence_intervals = predicted_prices * 0.15  # ±15% confidence
+            prediction_timestamp = datetime.now()
             
-            return {
-                'predicted_price': float(predicted_price),
-                'confidence_lower': float(predicted_price - confidence_interval),
-                'confidence_upper': float(predicted_price + confidence_interval),
-                'confidence_level': 0.85,
-                'prediction_timestamp': datetime.now()
-            }
+            return [
+                {
+                    'predicted_price': float(predicted_price),
+                    'confidence_lower': float(predicted_price - confidence_interval),
+                    'confidence_upper': float(predicted_price + confidence_interval),
+                    'confidence_level': 0.85,
+                    'prediction_timestamp': prediction_timestamp
+                }
+                for predicted_price, confidence_interval in zip(predicted_prices, confidence_intervals)
+            ]
             
         except Exception as e:
-            logger.error(f"Error predicting procedure price: {e}")
-            return {'error': str(e)}
+            logger.error(f"Error predicting procedure prices: {e}")
+            return [{'error': str(e)} for _ in procedures]
     
     def optimize_medication_costs(self, medication_name: str, location: str) -> List[Dict]:
         """Find cost-optimized medication alternatives"""
@@ -312,38 +389,66 @@ class HealthcarePriceAnalyzer:
             logger.error(f"Error optimizing medication costs: {e}")
             return []
     
-    def _classify_anomaly(self, procedure: HospitalProcedure, row: pd.Series) -> str:
-        """Classify the type of price anomaly"""
-        cash_price = procedure.cash_price or 0
-        medicare_rate = procedure.medicare_rate or 0
-        medicaid_rate = procedure.medicaid_rate or 0
+    def _anomaly_features(self, procedures: Union[pd.DataFrame, List[HospitalProcedure]]) -> np.ndarray:
+        """Assemble the (n, 7) anomaly feature matrix directly, without a prepared frame"""
+        if isinstance(procedures, pd.DataFrame):
+            prices = procedures[ANOMALY_PRICE_COLUMNS].fillna(0).to_numpy(dtype=np.float32)
+        else:
+            prices = np.column_stack([
+                np.fromiter(
+                    (getattr(procedure, column) or 0.0 for procedure in procedures),
+                    dtype=np.float32, count=len(procedures)
+                )
+                for column in ANOMALY_PRICE_COLUMNS
+            ])
+        
+        price_range = prices[:, 2] - prices[:, 1]
+        insurance_discount = prices[:, 0] - prices[:, 1]
+        return np.column_stack([prices, price_range, insurance_discount])
+    
+    def _anomaly_details(self, procedures: Union[pd.DataFrame, List[HospitalProcedure]], indices: np.ndarray):
+        """Yield (id, hospital, procedure, cpt code, cash price) for the flagged procedures only"""
+        if isinstance(procedures, pd.DataFrame):
+            flagged = procedures.iloc[indices]
+            return zip(
+                flagged['procedure_id'], flagged['hospital_name'], flagged['procedure_name'],
+                flagged['cpt_code'], flagged['cash_price'].fillna(0)
+            )
+        return (
+            (procedure.id, procedure.hospital.name, procedure.procedure_name, procedure.cpt_code, procedure.cash_price or 0.0)
+            for procedure in (procedures[index] for index in indices)
+        )
+    
+    def _classify_anomalies(self, features: np.ndarray) -> np.ndarray:
+        """Classify the type of price anomaly for every row of an anomaly feature matrix at once"""
+        cash_price = features[:, 0].astype(float)
+        medicare_rate = features[:, 3].astype(float)
+        medicaid_rate = features[:, 4].astype(float)
         
-        if cash_price > 0 and medicare_rate > 0:
-            markup_ratio = cash_price / medicare_rate
-            if markup_ratio > 5:
-                return "Excessive Cash Markup"
-            elif markup_ratio > 3:
-                return "High Cash Markup"
+        # Markup ratios are 0 where either price is missing, so they never match a threshold
+        with np.errstate(divide='ignore', invalid='ignore'):
+            medicare_markup = np.where((cash_price > 0) & (medicare_rate > 0), cash_price / medicare_rate, 0)
+            medicaid_markup = np.where((cash_price > 0) & (medicaid_rate > 0), cash_price / medicaid_rate, 0)
         
-        if cash_price > 0 and medicaid_rate > 0:
-            markup_ratio = cash_price / medicaid_rate
-            if markup_ratio > 8:
-                return "Excessive Medicaid Markup"
+        # Integer class codes, assigned lowest priority first so stronger matches overwrite
+        codes = np.zeros(len(cash_price), dtype=np.int8)
+        codes[medicaid_markup > MEDICAID_EXCESSIVE] = 3
+        codes[medicare_markup > MEDICARE_HIGH] = 2
+        codes[medicare_markup > MEDICARE_EXCESSIVE] = 1
         
-        return "Price Outlier"
+        return ANOMALY_TYPES[codes]
     
-    def _generate_anomaly_recommendations(self, procedure: HospitalProcedure, row: pd.Series) -> List[str]:
-        """Generate recommendations for price anomalies"""
+    def _generate_anomaly_recommendations(self, features: np.ndarray) -> List[str]:
+        """Generate recommendations for a price anomaly from its anomaly feature row"""
         recommendations = []
         
-        cash_price = procedure.cash_price or 0
-        medicare_rate = procedure.medicare_rate or 0
+        cash_price, negotiated_rate_min, _, medicare_rate = features[:4]
         
-        if medicare_rate > 0 and cash_price > medicare_rate * 3:
+        if medicare_rate > 0 and cash_price > medicare_rate * MEDICARE_HIGH:
             recommendations.append("Consider negotiating cash price closer to Medicare rates")
             recommendations.append("Check if patient qualifies for financial assistance programs")
         
-        if procedure.negotiated_rate_min and cash_price > procedure.negotiated_rate_min * 2:
+        if negotiated_rate_min and cash_price > negotiated_rate_min * NEG_RATE_HIGH:
             recommendations.append("Cash price significantly higher than negotiated rates")
             recommendations.append("Recommend patient contact hospital billing for discounts")
         
@@ -353,21 +458,21 @@ class HealthcarePriceAnalyzer:
         
         return recommendations
     
-    def _prepare_prediction_input(self, procedure_data: Dict) -> List:
-        """Prepare input features for price prediction"""
-        # Encode categorical variables
-        cpt_encoded = self.procedure_encoder.transform([procedure_data.get('cpt_code', 'UNKNOWN')])[0]
-        hospital_encoded = self.hospital_encoder.transform([procedure_data.get('hospital_name', 'UNKNOWN')])[0]
+    def _prepare_prediction_inputs(self, procedures: List[Dict]) -> np.ndarray:
+        """Prepare a (batch, features) input matrix for price prediction"""
+        # Encode categorical variables; values unseen in training encode as -1
+        cpt_encoded = self.procedure_categories.get_indexer(
+            [procedure.get('cpt_code', 'UNKNOWN') for procedure in procedures]
+        )
+        hospital_encoded = self.hospital_categories.get_indexer(
+            [procedure.get('hospital_name', 'UNKNOWN') for procedure in procedures]
+        )
+        prices = np.array(
+            [[procedure.get(column, 0) for column in PREDICTOR_PRICE_FEATURES] for procedure in procedures],
+            dtype=np.float32
+        ).reshape(len(procedures), len(PREDICTOR_PRICE_FEATURES))
         
-        return [
-            cpt_encoded,
-            hospital_encoded,
-            procedure_data.get('negotiated_rate_min', 0),
-            procedure_data.get('medicare_rate', 0),
-            procedure_data.get('medicaid_rate', 0),
-            procedure_data.get('facility_fee', 0),
-            procedure_data.get('professional_fee', 0)
-        ]
+        return np.column_stack([cpt_encoded, hospital_encoded, prices]).astype(np.float32, copy=False)
     
     def _get_feature_importance(self, feature_names: List[str]) -> Dict[str, float]:
         """Get feature importance from the price predictor model"""
@@ -384,12 +489,20 @@ class HealthcarePriceAnalyzer:
         joblib.dump(model, filepath)
         logger.info(f"Model saved to {filepath}")
     
+    def _save_categories(self):
+        """Save the fitted category vocabularies used to encode features"""
+        self._save_model('categories.pkl', {
+            'procedure': self.procedure_categories,
+            'hospital': self.hospital_categories
+        })
+    
     def _load_models(self):
         """Load trained models"""
         try:
             anomaly_path = os.path.join(self.models_dir, 'anomaly_detector.pkl')
             scaler_path = os.path.join(self.models_dir, 'scaler.pkl')
             predictor_path = os.path.join(self.models_dir, 'price_predictor.pkl')
+            categories_path = os.path.join(self.models_dir, 'categories.pkl')
             
             if os.path.exists(anomaly_path):
                 self.anomaly_detector = joblib.load(anomaly_path)
@@ -397,31 +510,69 @@ class HealthcarePriceAnalyzer:
                 self.scaler = joblib.load(scaler_path)
             if os.path.exists(predictor_path):
                 self.price_predictor = joblib.load(predictor_path)
-                
+            if os.path.exists(categories_path):
+                categories = joblib.load(categories_path)
+                self.procedure_categories = categories['procedure']
+                self.hospital_categories = categories['hospital']
+            
+            self._models_loaded = True
             logger.info("Models loaded successfully")
             
         except Exception as e:
             logger.error(f"Error loading models: {e}")
             raise
 
+def _model_files_version() -> Tuple:
+    """Modification times of the saved model files (None for missing ones)"""
+    versions = []
+    for filename in MODEL_FILES:
+        try:
+            versions.append(os.stat(os.path.join(MODELS_DIR, filename)).st_mtime_ns)
+        except OSError:
+            versions.append(None)
+    return tuple(versions)
+
+@lru_cache(maxsize=1)
+def get_analyzer() -> HealthcarePriceAnalyzer:
+    """Get the process-wide analyzer with its trained models loaded once (see reload_analyzer)"""
+    analyzer = HealthcarePriceAnalyzer()
+    analyzer._load_models()
+    analyzer.models_version = _model_files_version()
+    return analyzer
+
+def reload_analyzer() -> HealthcarePriceAnalyzer:
+    """Reload the process-wide analyzer if its model files changed since it was loaded
+
+    The reload hook for retraining: get_analyzer itself never checks the files.
+    """
+    if get_analyzer().models_version != _model_files_version():
+        get_analyzer.cache_clear()
+    return get_analyzer()
+
 def train_models():
     """Train all ML models with current data"""
     try:
         # Get data from database
         db = SessionLocal()
-        procedures = db.query(HospitalProcedure).all()
-        db.close()
+        try:
+            procedures = load_procedure_frame(db)
+        finally:
+            db.close()
         
-        if not procedures:
+        if procedures.empty:
             logger.warning("No procedures found in database")
             return
         
-        # Initialize analyzer
+        # Initialize analyzer and prepare the shared feature frame once for both models
         analyzer = HealthcarePriceAnalyzer()
+        procedures = analyzer.prepare_data(procedures)
+        
+        # Train models on the frame prepared above, reusing its vocabularies
+        anomaly_results = analyzer.train_anomaly_detector(procedures, fit=False)
+        prediction_results = analyzer.train_price_predictor(procedures, fit=False)
         
-        # Train models
-        anomaly_results = analyzer.train_anomaly_detector(procedures)
-        prediction_results = analyzer.train_price_predictor(procedures)
+        # Serve the new models from this process's shared analyzer
+        reload_analyzer()
         
         logger.info("Model training completed")
         logger.info(f"Anomaly detection: {anomaly_results}")
@@ -1,11 +1,17 @@
-from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, Float, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, Float, ForeignKey, Index, text, FetchedValue
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
-from app.core.database import Base
+from app.core.database import Base, RELATIONSHIP_LAZY
 
 class Hospital(Base):
     """Hospital information model"""
     __tablename__ = "hospitals"
+    __table_args__ = (
+        Index("ix_hospital_state_city", "state", text("lower(city)")),
+        # Trigram indexes so substring ILIKE filters can use an index scan
+        Index("ix_hospital_city_trgm", "city", postgresql_using="gin", postgresql_ops={"city": "gin_trgm_ops"}),
+        Index("ix_hospital_region_trgm", "illinois_region", postgresql_using="gin", postgresql_ops={"illinois_region": "gin_trgm_ops"}),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(255), nullable=False, index=True)
@@ -47,7 +53,7 @@ class Hospital(Base):
     
     # Metadata
     created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    updated_at = Column(DateTime(timezone=True), server_onupdate=FetchedValue())  # Set by the set_updated_at trigger
     
     def __repr__(self):
         return f"<Hospital(name='{self.name}', city='{self.city}')>"
@@ -55,6 +61,10 @@ class Hospital(Base):
 class HospitalProcedure(Base):
     """Hospital procedure pricing model"""
     __tablename__ = "hospital_procedures"
+    __table_args__ = (
+        Index("ix_procedure_name_trgm", "procedure_name", postgresql_using="gin", postgresql_ops={"procedure_name": "gin_trgm_ops"}),
+        Index("ix_hp_hospital_cpt", "hospital_id", "cpt_code"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     hospital_id = Column(Integer, ForeignKey("hospitals.id"), nullable=False)
@@ -85,11 +95,11 @@ class HospitalProcedure(Base):
     last_updated = Column(DateTime(timezone=True), server_default=func.now())
     
     # Relationships
-    hospital = relationship("Hospital", back_populates="procedures")
+    hospital = relationship("Hospital", back_populates="procedures", lazy=RELATIONSHIP_LAZY)
     
     # Metadata
     created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    updated_at = Column(DateTime(timezone=True), server_onupdate=FetchedValue())  # Set by the set_updated_at trigger
     
     def __repr__(self):
         return f"<HospitalProcedure(hospital='{self.hospital.name}', procedure='{self.procedure_name}')>"
@@ -116,11 +126,11 @@ class HospitalInsuranceContract(Base):
     tier_level = Column(String(50))  # Tier 1, Tier 2, etc.
     
     # Relationships
-    hospital = relationship("Hospital", back_populates="insurance_contracts")
+    hospital = relationship("Hospital", back_populates="insurance_contracts", lazy=RELATIONSHIP_LAZY)
     
     # Metadata
     created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    updated_at = Column(DateTime(timezone=True), server_onupdate=FetchedValue())  # Set by the set_updated_at trigger
     
     def __repr__(self):
         return f"<HospitalInsuranceContract(hospital='{self.hospital.name}', insurance='{self.insurance_company}')>"
@@ -1,16 +1,18 @@
-from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, Float, ForeignKey, Enum
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, Float, REAL, ForeignKey, Index, Computed, text, FetchedValue
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import deferred, relationship
 from sqlalchemy.sql import func
 import enum
-from app.core.database import Base
+from app.core.database import Base, RELATIONSHIP_LAZY
+from app.models.types import SmallIntCode, code_check, enum_check
 
-class HospitalSize(enum.Enum):
+class HospitalSize(str, enum.Enum):
     """Hospital size categories"""
     SMALL = "small"  # <50 beds
     MEDIUM = "medium"  # 50-200 beds
     LARGE = "large"  # 200+ beds
 
-class TransparencyCategory(enum.Enum):
+class TransparencyCategory(str, enum.Enum):
     """Transparency excellence categories"""
     SMALL_HOSPITAL_EXCELLENCE = "small_hospital_excellence"
     RURAL_INNOVATION = "rural_innovation"
@@ -18,48 +20,90 @@ class TransparencyCategory(enum.Enum):
     CRITICAL_ACCESS_EXCELLENCE = "critical_access_excellence"
     COMMUNITY_PARTNERSHIP = "community_partnership"
 
+# Size-adjusted weights for each transparency score component
+SCORING_WEIGHTS = {
+    HospitalSize.SMALL: {
+        'data_accessibility': 0.4,  # Higher weight - easier to achieve
+        'data_completeness': 0.3,   # Lower weight - harder for small hospitals
+        'data_accuracy': 0.2,
+        'update_frequency': 0.1
+    },
+    HospitalSize.MEDIUM: {
+        'data_accessibility': 0.3,
+        'data_completeness': 0.3,
+        'data_accuracy': 0.25,
+        'update_frequency': 0.15
+    },
+    HospitalSize.LARGE: {
+        'data_accessibility': 0.2,
+        'data_completeness': 0.3,
+        'data_accuracy': 0.3,
+        'update_frequency': 0.2
+    }
+}
+
+def _weighted_score_sql(component: str) -> str:
+    """SQL for a raw component score times its size-adjusted weight"""
+    cases = " ".join(
+        f"WHEN '{size.value}' THEN {weights[component]}" for size, weights in SCORING_WEIGHTS.items()
+    )
+    # The raw score is REAL; weighting and summing run in double precision
+    return f"CAST({component}_score AS DOUBLE PRECISION) * CASE hospital_size {cases} END"
+
+# Accountability tier vocabularies, stored as SMALLINT codes (append only)
+ACCOUNTABILITY_TIERS = ("strict", "supportive", "educational")
+ENFORCEMENT_LEVELS = ("high", "medium", "low")
+SUPPORT_LEVELS = ("full", "partial", "minimal")
+
 class HospitalTransparencyScore(Base):
     """Hospital transparency scoring model"""
     __tablename__ = "hospital_transparency_scores"
+    __table_args__ = (
+        Index("ix_hts_size_score", "hospital_size", text("overall_transparency_score DESC")),
+        enum_check("hospital_size", HospitalSize, name="ck_hts_hospital_size"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     hospital_id = Column(Integer, ForeignKey("hospitals.id"), nullable=False)
     
     # Size-adjusted scoring weights
-    hospital_size = Column(Enum(HospitalSize), nullable=False)
+    hospital_size = Column(String(32), nullable=False)  # HospitalSize value
     
-    # Transparency metrics (0-100 scale)
-    data_accessibility_score = Column(Float, nullable=False)  # How easy to find data
-    data_completeness_score = Column(Float, nullable=False)   # How complete the data is
-    data_accuracy_score = Column(Float, nullable=False)       # How accurate the data is
-    update_frequency_score = Column(Float, nullable=False)    # How often data is updated
+    # Transparency metrics (0-100 scale); bounded scores are stored as 4-byte REAL
+    data_accessibility_score = Column(REAL, nullable=False)  # How easy to find data
+    data_completeness_score = Column(REAL, nullable=False)   # How complete the data is
+    data_accuracy_score = Column(REAL, nullable=False)       # How accurate the data is
+    update_frequency_score = Column(REAL, nullable=False)    # How often data is updated
     
-    # Size-adjusted weighted scores
-    weighted_accessibility = Column(Float, nullable=False)
-    weighted_completeness = Column(Float, nullable=False)
-    weighted_accuracy = Column(Float, nullable=False)
-    weighted_frequency = Column(Float, nullable=False)
+    # Size-adjusted weighted scores (generated by the database from the raw scores)
+    weighted_accessibility = Column(Float, Computed(_weighted_score_sql('data_accessibility'), persisted=True))
+    weighted_completeness = Column(Float, Computed(_weighted_score_sql('data_completeness'), persisted=True))
+    weighted_accuracy = Column(Float, Computed(_weighted_score_sql('data_accuracy'), persisted=True))
+    weighted_frequency = Column(Float, Computed(_weighted_score_sql('update_frequency'), persisted=True))
     
     # Overall scores
-    overall_transparency_score = Column(Float, nullable=False)  # 0-100
+    overall_transparency_score = Column(Float, Computed(
+        " + ".join(f"({_weighted_score_sql(component)})" for component in SCORING_WEIGHTS[HospitalSize.SMALL]),
+        persisted=True
+    ))  # 0-100
     peer_group_rank = Column(Integer)  # Rank within peer group
-    peer_group_percentile = Column(Float)  # Percentile within peer group
+    peer_group_percentile = Column(REAL)  # Percentile within peer group
     
     # Contextual metrics
     cost_per_bed_transparency = Column(Float)  # Cost efficiency of transparency
-    community_impact_score = Column(Float)     # Community service impact
-    patient_satisfaction_score = Column(Float) # Patient satisfaction relative to size
+    community_impact_score = Column(REAL)      # Community service impact
+    patient_satisfaction_score = Column(REAL)  # Patient satisfaction relative to size
     
     # Scoring metadata
     scoring_methodology = Column(String(100))  # Version of scoring algorithm
     last_calculated = Column(DateTime(timezone=True), server_default=func.now())
     
     # Relationships
-    hospital = relationship("Hospital", back_populates="transparency_scores")
+    hospital = relationship("Hospital", back_populates="transparency_scores", lazy=RELATIONSHIP_LAZY)
     
     # Metadata
     created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    updated_at = Column(DateTime(timezone=True), server_onupdate=FetchedValue())  # Set by the set_updated_at trigger
     
     def __repr__(self):
         return f"<HospitalTransparencyScore(hospital='{self.hospital.name}', score='{self.overall_transparency_score}')>"
@@ -67,12 +111,20 @@ class HospitalTransparencyScore(Base):
 class HospitalExcellenceRecognition(Base):
     """Hospital excellence recognition model"""
     __tablename__ = "hospital_excellence_recognition"
+    __table_args__ = (
+        # Partial indexes matching the featured/spotlight/category/hospital lookups
+        Index("ix_her_featured_active", "category", postgresql_where=text("is_active AND is_featured")),
+        Index("ix_her_spotlight_active", "id", postgresql_where=text("is_active AND is_spotlight")),
+        Index("ix_her_category_active", "category", postgresql_where=text("is_active")),
+        Index("ix_her_hospital_active", "hospital_id", postgresql_where=text("is_active")),
+        enum_check("category", TransparencyCategory, name="ck_her_category"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     hospital_id = Column(Integer, ForeignKey("hospitals.id"), nullable=False)
     
     # Recognition details
-    category = Column(Enum(TransparencyCategory), nullable=False)
+    category = Column(String(32), nullable=False)  # TransparencyCategory value
     title = Column(String(255), nullable=False)  # e.g., "Small Hospital Transparency Leader"
     description = Column(Text)
     
@@ -92,23 +144,26 @@ class HospitalExcellenceRecognition(Base):
     recognition_end_date = Column(DateTime(timezone=True))
     
     # Recognition details
-    achievements = Column(Text)  # JSON string of achievements
-    community_impact_details = Column(Text)  # Details of community impact
-    cost_optimization_details = Column(Text)  # Cost optimization achievements
+    achievements = deferred(Column(JSONB), group="details")  # List of achievement strings
+    community_impact_details = deferred(Column(Text), group="details")  # Details of community impact
+    cost_optimization_details = deferred(Column(Text), group="details")  # Cost optimization achievements
     
     # Relationships
-    hospital = relationship("Hospital", back_populates="excellence_recognition")
+    hospital = relationship("Hospital", back_populates="excellence_recognition", lazy=RELATIONSHIP_LAZY)
     
     # Metadata
     created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    updated_at = Column(DateTime(timezone=True), server_onupdate=FetchedValue())  # Set by the set_updated_at trigger
     
     def __repr__(self):
-        return f"<HospitalExcellenceRecognition(hospital='{self.hospital.name}', category='{self.category.value}')>"
+        return f"<HospitalExcellenceRecognition(hospital='{self.hospital.name}', category='{self.category}')>"
 
 class HospitalPeerGroup(Base):
     """Hospital peer group model for fair comparisons"""
     __tablename__ = "hospital_peer_groups"
+    __table_args__ = (
+        Index("ix_hpg_group_rank", "peer_group_name", "rank_in_group"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     hospital_id = Column(Integer, ForeignKey("hospitals.id"), nullable=False)
@@ -140,11 +195,11 @@ class HospitalPeerGroup(Base):
     group_calculation_date = Column(DateTime(timezone=True), server_default=func.now())
     
     # Relationships
-    hospital = relationship("Hospital", back_populates="peer_groups")
+    hospital = relationship("Hospital", back_populates="peer_groups", lazy=RELATIONSHIP_LAZY)
     
     # Metadata
     created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    updated_at = Column(DateTime(timezone=True), server_onupdate=FetchedValue())  # Set by the set_updated_at trigger
     
     def __repr__(self):
         return f"<HospitalPeerGroup(hospital='{self.hospital.name}', group='{self.peer_group_name}')>"
@@ -152,18 +207,23 @@ class HospitalPeerGroup(Base):
 class HospitalAccountabilityTier(Base):
     """Hospital accountability tier model for tiered enforcement"""
     __tablename__ = "hospital_accountability_tiers"
+    __table_args__ = (
+        code_check("tier", ACCOUNTABILITY_TIERS, name="ck_hat_tier"),
+        code_check("enforcement_level", ENFORCEMENT_LEVELS, name="ck_hat_enforcement_level"),
+        code_check("support_level", SUPPORT_LEVELS, name="ck_hat_support_level"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     hospital_id = Column(Integer, ForeignKey("hospitals.id"), nullable=False)
     
     # Accountability tier
-    tier = Column(String(50), nullable=False)  # "strict", "supportive", "educational"
-    enforcement_level = Column(String(50), nullable=False)  # "high", "medium", "low"
+    tier = Column(SmallIntCode(ACCOUNTABILITY_TIERS), nullable=False)  # "strict", "supportive", "educational"
+    enforcement_level = Column(SmallIntCode(ENFORCEMENT_LEVELS), nullable=False)  # "high", "medium", "low"
     
     # Tier-specific metrics
     compliance_timeline_days = Column(Integer, nullable=False)  # Days to achieve compliance
-    support_level = Column(String(50), nullable=False)  # "full", "partial", "minimal"
-    enforcement_actions = Column(Text)  # JSON string of available actions
+    support_level = Column(SmallIntCode(SUPPORT_LEVELS), nullable=False)  # "full", "partial", "minimal"
+    enforcement_actions = Column(JSONB)  # List of available actions
     
     # Tier justification
     tier_reason = Column(Text)  # Why this hospital is in this tier
@@ -185,7 +245,7 @@ class HospitalAccountabilityTier(Base):
     
     # Metadata
     created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    updated_at = Column(DateTime(timezone=True), server_onupdate=FetchedValue())  # Set by the set_updated_at trigger
     
     def __repr__(self):
         return f"<HospitalAccountabilityTier(hospital='{self.hospital.name}', tier='{self.tier}')>"
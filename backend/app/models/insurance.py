@@ -1,10 +1,11 @@
-from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, Float, ForeignKey, Enum
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, BigInteger, String, Text, Boolean, DateTime, Float, ForeignKey, Index, Computed, FetchedValue
+from sqlalchemy.orm import deferred, relationship
 from sqlalchemy.sql import func
 import enum
 from app.core.database import Base
+from app.models.types import Money, enum_check
 
-class ClaimStatus(enum.Enum):
+class ClaimStatus(str, enum.Enum):
     """Claim status enumeration"""
     SUBMITTED = "submitted"
     PROCESSING = "processing"
@@ -15,7 +16,7 @@ class ClaimStatus(enum.Enum):
     APPEAL_APPROVED = "appeal_approved"
     APPEAL_DENIED = "appeal_denied"
 
-class AppealStatus(enum.Enum):
+class AppealStatus(str, enum.Enum):
     """Appeal status enumeration"""
     NOT_STARTED = "not_started"
     IN_PROGRESS = "in_progress"
@@ -25,9 +26,28 @@ class AppealStatus(enum.Enum):
     DENIED = "denied"
     EXPIRED = "expired"
 
+def patient_hash_prefix(patient_hash: str) -> int:
+    """Signed 64-bit value of the first 16 hex digits of a patient hash
+
+    Mirrors the generated patient_hash_prefix column, so lookups can filter
+    on the small BIGINT index before comparing the full hash:
+    ``Patient.patient_hash_prefix == patient_hash_prefix(h), Patient.patient_hash == h``
+    """
+    prefix = int(patient_hash[:16], 16)
+    return prefix - 2**64 if prefix >= 2**63 else prefix
+
 class InsuranceClaim(Base):
     """Insurance claim model"""
     __tablename__ = "insurance_claims"
+    __table_args__ = (
+        Index("ix_claims_patient_service", "patient_id", "service_date"),
+        Index("ix_claims_insco_status", "insurance_company_id", "status"),
+        Index("ix_claims_provider_service", "provider_id", "service_date"),
+        # Claims arrive roughly in service date order, so a BRIN index lets date-range
+        # scans skip whole block ranges at a fraction of a btree's size
+        Index("ix_claims_service_date_brin", "service_date", postgresql_using="brin"),
+        enum_check("status", ClaimStatus, name="ck_claim_status"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     
@@ -44,16 +64,16 @@ class InsuranceClaim(Base):
     diagnosis_codes = Column(Text)  # ICD-10 codes
     
     # Financial Information
-    billed_amount = Column(Float, nullable=False)
-    allowed_amount = Column(Float)
-    paid_amount = Column(Float)
-    patient_responsibility = Column(Float)
-    deductible_applied = Column(Float)
-    coinsurance_applied = Column(Float)
-    copay_applied = Column(Float)
+    billed_amount = Column(Money, nullable=False)
+    allowed_amount = Column(Money)
+    paid_amount = Column(Money)
+    patient_responsibility = Column(Money)
+    deductible_applied = Column(Money)
+    coinsurance_applied = Column(Money)
+    copay_applied = Column(Money)
     
     # Claim Status
-    status = Column(Enum(ClaimStatus), default=ClaimStatus.SUBMITTED)
+    status = Column(String(32), default=ClaimStatus.SUBMITTED.value)  # ClaimStatus value
     denial_reason = Column(Text)
     denial_code = Column(String(50))
     
@@ -69,14 +89,17 @@ class InsuranceClaim(Base):
     
     # Metadata
     created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    updated_at = Column(DateTime(timezone=True), server_onupdate=FetchedValue())  # Set by the set_updated_at trigger
     
     def __repr__(self):
-        return f"<InsuranceClaim(claim_number='{self.claim_number}', status='{self.status.value}')>"
+        return f"<InsuranceClaim(claim_number='{self.claim_number}', status='{self.status}')>"
 
 class ClaimAppeal(Base):
     """Claim appeal model"""
     __tablename__ = "insurance_claim_appeals"
+    __table_args__ = (
+        enum_check("status", AppealStatus, name="ck_appeal_status"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     claim_id = Column(Integer, ForeignKey("insurance_claims.id"), nullable=False)
@@ -88,11 +111,11 @@ class ClaimAppeal(Base):
     
     # Appeal Details
     reason_for_appeal = Column(Text, nullable=False)
-    supporting_documentation = Column(Text)
-    appeal_letter_content = Column(Text)
+    supporting_documentation = deferred(Column(Text), group="narrative")
+    appeal_letter_content = deferred(Column(Text), group="narrative")
     
     # Status and Timeline
-    status = Column(Enum(AppealStatus), default=AppealStatus.NOT_STARTED)
+    status = Column(String(32), default=AppealStatus.NOT_STARTED.value)  # AppealStatus value
     submitted_date = Column(DateTime(timezone=True))
     deadline_date = Column(DateTime(timezone=True))
     decision_date = Column(DateTime(timezone=True))
@@ -100,21 +123,21 @@ class ClaimAppeal(Base):
     # Decision
     decision = Column(String(100))  # Approved, Denied, Partially Approved
     decision_reason = Column(Text)
-    decision_amount = Column(Float)
+    decision_amount = Column(Money)
     
     # AI Analysis
     ai_confidence_score = Column(Float)  # 0-100 confidence in appeal success
-    ai_recommendations = Column(Text)
+    ai_recommendations = deferred(Column(Text), group="narrative")
     
     # Relationships
     claim = relationship("InsuranceClaim", back_populates="appeals")
     
     # Metadata
     created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    updated_at = Column(DateTime(timezone=True), server_onupdate=FetchedValue())  # Set by the set_updated_at trigger
     
     def __repr__(self):
-        return f"<ClaimAppeal(appeal_number='{self.appeal_number}', status='{self.status.value}')>"
+        return f"<ClaimAppeal(appeal_number='{self.appeal_number}', status='{self.status}')>"
 
 class InsuranceCompany(Base):
     """Insurance company model"""
@@ -146,7 +169,7 @@ class InsuranceCompany(Base):
     
     # Metadata
     created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    updated_at = Column(DateTime(timezone=True), server_onupdate=FetchedValue())  # Set by the set_updated_at trigger
     
     def __repr__(self):
         return f"<InsuranceCompany(name='{self.name}', naic_code='{self.naic_code}')>"
@@ -180,7 +203,7 @@ class Provider(Base):
     
     # Metadata
     created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    updated_at = Column(DateTime(timezone=True), server_onupdate=FetchedValue())  # Set by the set_updated_at trigger
     
     def __repr__(self):
         return f"<Provider(name='{self.name}', npi='{self.npi_number}')>"
@@ -193,6 +216,11 @@ class Patient(Base):
     
     # Anonymized Information
     patient_hash = Column(String(64), unique=True, nullable=False, index=True)
+    patient_hash_prefix = Column(
+        BigInteger,
+        Computed("('x' || substr(patient_hash, 1, 16))::bit(64)::bigint", persisted=True),
+        index=True
+    )  # First 8 bytes of the hash, for compact index lookups
     age_group = Column(String(20))  # 18-25, 26-35, etc.
     gender = Column(String(10))
     zip_code = Column(String(10))
@@ -206,7 +234,7 @@ class Patient(Base):
     
     # Metadata
     created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    updated_at = Column(DateTime(timezone=True), server_onupdate=FetchedValue())  # Set by the set_updated_at trigger
     
     def __repr__(self):
         return f"<Patient(hash='{self.patient_hash[:8]}...', age_group='{self.age_group}')>"
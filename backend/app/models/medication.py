@@ -1,17 +1,18 @@
-from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, Float, ForeignKey, Enum
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, Float, ForeignKey, Index, text, FetchedValue
+from sqlalchemy.orm import deferred, relationship
 from sqlalchemy.sql import func
 import enum
-from app.core.database import Base
+from app.core.database import Base, RELATIONSHIP_LAZY
+from app.models.types import Money, SmallIntCode, code_check, enum_check
 
-class MedicationType(enum.Enum):
+class MedicationType(str, enum.Enum):
     """Medication type enumeration"""
     GENERIC = "generic"
     BRAND_NAME = "brand_name"
     OVER_THE_COUNTER = "otc"
     PRESCRIPTION_ONLY = "prescription"
 
-class PharmacyType(enum.Enum):
+class PharmacyType(str, enum.Enum):
     """Pharmacy type enumeration"""
     CHAIN = "chain"
     INDEPENDENT = "independent"
@@ -19,16 +20,22 @@ class PharmacyType(enum.Enum):
     HOSPITAL = "hospital"
     GROCERY_STORE = "grocery_store"
 
+# Pharmacy type values in SMALLINT code order (append only)
+PHARMACY_TYPE_CODES = tuple(member.value for member in PharmacyType)
+
 class Medication(Base):
     """Medication information model"""
     __tablename__ = "medications"
+    __table_args__ = (
+        enum_check("medication_type", MedicationType, name="ck_medication_type"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     
     # Medication Information
     generic_name = Column(String(255), nullable=False, index=True)
     brand_name = Column(String(255), index=True)
-    medication_type = Column(Enum(MedicationType), default=MedicationType.PRESCRIPTION_ONLY)
+    medication_type = Column(String(32), default=MedicationType.PRESCRIPTION_ONLY.value)  # MedicationType value
     
     # Drug Classification
     ndc_code = Column(String(20), unique=True, index=True)  # National Drug Code
@@ -51,11 +58,14 @@ class Medication(Base):
     
     # Relationships
     prices = relationship("MedicationPrice", back_populates="medication")
-    alternatives = relationship("MedicationAlternative", back_populates="medication")
+    alternatives = relationship(
+        "MedicationAlternative", back_populates="medication",
+        foreign_keys="MedicationAlternative.medication_id", lazy=RELATIONSHIP_LAZY
+    )
     
     # Metadata
     created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    updated_at = Column(DateTime(timezone=True), server_onupdate=FetchedValue())  # Set by the set_updated_at trigger
     
     def __repr__(self):
         return f"<Medication(generic='{self.generic_name}', brand='{self.brand_name}')>"
@@ -63,12 +73,15 @@ class Medication(Base):
 class Pharmacy(Base):
     """Pharmacy information model"""
     __tablename__ = "pharmacies"
+    __table_args__ = (
+        code_check("pharmacy_type", PHARMACY_TYPE_CODES, name="ck_pharmacy_type"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     
     # Pharmacy Information
     name = Column(String(255), nullable=False, index=True)
-    pharmacy_type = Column(Enum(PharmacyType), default=PharmacyType.CHAIN)
+    pharmacy_type = Column(SmallIntCode(PHARMACY_TYPE_CODES), default=PharmacyType.CHAIN.value)  # PharmacyType value
     chain_name = Column(String(255))  # CVS, Walgreens, etc.
     
     # Location Information
@@ -98,7 +111,7 @@ class Pharmacy(Base):
     
     # Metadata
     created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    updated_at = Column(DateTime(timezone=True), server_onupdate=FetchedValue())  # Set by the set_updated_at trigger
     
     def __repr__(self):
         return f"<Pharmacy(name='{self.name}', city='{self.city}')>"
@@ -106,6 +119,11 @@ class Pharmacy(Base):
 class MedicationPrice(Base):
     """Medication pricing model"""
     __tablename__ = "medication_prices"
+    __table_args__ = (
+        # Not unique: a pharmacy can list several prices per medication (one per insurance plan)
+        Index("ix_medprice_med_pharm", "medication_id", "pharmacy_id"),
+        Index("ix_medprice_instock", "medication_id", postgresql_where=text("in_stock")),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     
@@ -114,20 +132,20 @@ class MedicationPrice(Base):
     pharmacy_id = Column(Integer, ForeignKey("pharmacies.id"), nullable=False)
     
     # Pricing Information
-    cash_price = Column(Float, nullable=False)
-    insurance_price = Column(Float)
-    discount_program_price = Column(Float)
+    cash_price = Column(Money, nullable=False)
+    insurance_price = Column(Money)
+    discount_program_price = Column(Money)
     
     # Insurance Details
     insurance_company = Column(String(255))
     plan_name = Column(String(255))
-    copay = Column(Float)
-    deductible_applied = Column(Float)
+    copay = Column(Money)
+    deductible_applied = Column(Money)
     
     # Discount Programs
-    goodrx_price = Column(Float)
-    singlecare_price = Column(Float)
-    rxsaver_price = Column(Float)
+    goodrx_price = Column(Money)
+    singlecare_price = Column(Money)
+    rxsaver_price = Column(Money)
     
     # Availability
     in_stock = Column(Boolean, default=True)
@@ -138,12 +156,12 @@ class MedicationPrice(Base):
     last_updated = Column(DateTime(timezone=True), server_default=func.now())
     
     # Relationships
-    medication = relationship("Medication", back_populates="prices")
-    pharmacy = relationship("Pharmacy", back_populates="prices")
+    medication = relationship("Medication", back_populates="prices", lazy=RELATIONSHIP_LAZY)
+    pharmacy = relationship("Pharmacy", back_populates="prices", lazy=RELATIONSHIP_LAZY)
     
     # Metadata
     created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    updated_at = Column(DateTime(timezone=True), server_onupdate=FetchedValue())  # Set by the set_updated_at trigger
     
     def __repr__(self):
         return f"<MedicationPrice(medication='{self.medication.generic_name}', pharmacy='{self.pharmacy.name}', price='${self.cash_price}')>"
@@ -166,18 +184,24 @@ class MedicationAlternative(Base):
     # Clinical Information
     clinical_equivalence = Column(Boolean)
     requires_prescriber_approval = Column(Boolean)
-    notes = Column(Text)
+    notes = deferred(Column(Text), group="details")
     
     # AI Analysis
     ai_recommendation_score = Column(Float)  # 0-100 recommendation score
-    ai_reasoning = Column(Text)
+    ai_reasoning = deferred(Column(Text), group="details")
     
     # Relationships
-    medication = relationship("Medication", back_populates="alternatives")
+    medication = relationship(
+        "Medication", back_populates="alternatives",
+        foreign_keys=[medication_id], lazy=RELATIONSHIP_LAZY
+    )
+    alternative_medication = relationship(
+        "Medication", foreign_keys=[alternative_medication_id], lazy=RELATIONSHIP_LAZY
+    )
     
     # Metadata
     created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    updated_at = Column(DateTime(timezone=True), server_onupdate=FetchedValue())  # Set by the set_updated_at trigger
     
     def __repr__(self):
         return f"<MedicationAlternative(medication='{self.medication.generic_name}', alternative='{self.alternative_medication.generic_name}')>"
@@ -194,25 +218,25 @@ class PrescriptionDiscountProgram(Base):
     website = Column(String(255))
     
     # Program Details
-    annual_fee = Column(Float, default=0.0)
+    annual_fee = Column(Money, default=0.0)
     discount_percentage = Column(Float)
-    max_discount_amount = Column(Float)
-    eligibility_requirements = Column(Text)
+    max_discount_amount = Column(Money)
+    eligibility_requirements = deferred(Column(Text), group="details")
     
     # Illinois Specific
     available_in_illinois = Column(Boolean, default=True)
-    illinois_restrictions = Column(Text)
+    illinois_restrictions = deferred(Column(Text), group="details")
     
     # Coverage
-    covered_medications = Column(Text)
-    excluded_medications = Column(Text)
+    covered_medications = deferred(Column(Text), group="details")
+    excluded_medications = deferred(Column(Text), group="details")
     
     # Relationships
     prices = relationship("MedicationPrice", back_populates="discount_program")
     
     # Metadata
     created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    updated_at = Column(DateTime(timezone=True), server_onupdate=FetchedValue())  # Set by the set_updated_at trigger
     
     def __repr__(self):
         return f"<PrescriptionDiscountProgram(name='{self.program_name}', discount='{self.discount_percentage}%')>"
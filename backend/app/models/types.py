@@ -0,0 +1,65 @@
+import enum
+from decimal import Decimal, ROUND_HALF_UP
+from typing import Optional, Tuple, Type, Union
+from sqlalchemy import BigInteger, CheckConstraint, SmallInteger
+from sqlalchemy.types import TypeDecorator
+
+def enum_check(column: str, enum_cls: Type[enum.Enum], name: str) -> CheckConstraint:
+    """CHECK constraint limiting a string column to the values of an enum"""
+    values = ", ".join(f"'{member.value}'" for member in enum_cls)
+    return CheckConstraint(f"{column} IN ({values})", name=name)
+
+class SmallIntCode(TypeDecorator):
+    """A short low-cardinality string stored as its SMALLINT position in a fixed tuple
+
+    Codes are positions, so new values must only ever be appended.
+    Binding a value outside the tuple raises ValueError.
+    """
+    impl = SmallInteger
+    cache_ok = True
+
+    def __init__(self, values: Tuple[str, ...]):
+        super().__init__()
+        self.values = tuple(values)
+        self._codes = {value: code for code, value in enumerate(self.values)}
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        try:
+            return self._codes[value]
+        except KeyError:
+            raise ValueError(f"{value!r} is not one of {self.values}") from None
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        return self.values[value]
+
+def code_check(column: str, values: Tuple[str, ...], name: str) -> CheckConstraint:
+    """CHECK constraint limiting a SmallIntCode column to valid codes"""
+    return CheckConstraint(f"{column} BETWEEN 0 AND {len(values) - 1}", name=name)
+
+def to_cents(amount: Union[Decimal, float, int, str, None]) -> Optional[int]:
+    """Convert a dollar amount to whole cents, rounding half up"""
+    if amount is None:
+        return None
+    # str() first so floats convert by their shortest repr, not their binary value
+    return int((Decimal(str(amount)) * 100).quantize(Decimal("1"), rounding=ROUND_HALF_UP))
+
+class Money(TypeDecorator):
+    """A dollar amount stored as BIGINT cents and exposed as a Decimal
+
+    Sums and comparisons run exactly on integers in the database. A 32-bit
+    INTEGER would cap amounts near $21.4M, which hospital bills can exceed.
+    """
+    impl = BigInteger
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        return to_cents(value)
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        return Decimal(value).scaleb(-2)
@@ -0,0 +1,11 @@
+from pydantic import BaseModel, Field
+
+class ProcedurePriceQuery(BaseModel):
+    """Procedure to predict a cash price for"""
+    cpt_code: str = Field(..., description="CPT code")
+    hospital_name: str = Field(..., description="Hospital name")
+    negotiated_rate_min: float = Field(0, description="Minimum negotiated rate")
+    medicare_rate: float = Field(0, description="Medicare rate")
+    medicaid_rate: float = Field(0, description="Medicaid rate")
+    facility_fee: float = Field(0, description="Facility fee")
+    professional_fee: float = Field(0, description="Professional fee")
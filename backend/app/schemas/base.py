@@ -0,0 +1,71 @@
+from enum import Enum
+from typing import Any, ClassVar, Optional, Tuple, Type, get_args
+from pydantic import BaseModel, ConfigDict, Field, create_model
+
+def _annotation_types(annotation: Any) -> Tuple[Any, ...]:
+    """The annotation itself plus its arguments, so Optional[X] yields X"""
+    return (annotation, *get_args(annotation))
+
+def _is_enum_field(annotation: Any) -> bool:
+    """Whether a field holds an enum (possibly optional)"""
+    return any(isinstance(arg, type) and issubclass(arg, Enum) for arg in _annotation_types(annotation))
+
+def _is_float_field(annotation: Any) -> bool:
+    """Whether a field holds a float (possibly optional)"""
+    return float in _annotation_types(annotation)
+
+class TrustedResponse(BaseModel):
+    """Response schema that can be built from trusted database rows without validation
+
+    Use ``from_orm_trusted`` for data read back from our own tables; request
+    bodies (``*Create`` / ``*Update``) still go through ``model_validate``.
+    Schemas with field validators or enum fields are still validated, since
+    those conversions only run during validation.
+    Instances are frozen read-only DTOs and are never revalidated.
+    """
+
+    model_config = ConfigDict(
+        from_attributes=True, frozen=True, extra="forbid", revalidate_instances="never"
+    )
+
+    # Field names, resolved once per class instead of once per row
+    response_fields: ClassVar[Tuple[str, ...]] = ()
+    # Float fields, whose Decimal values (Money columns) are converted before construction
+    float_fields: ClassVar[Tuple[str, ...]] = ()
+    # Whether rows need validation to convert their values (see the class docstring)
+    validate_rows: ClassVar[bool] = False
+
+    @classmethod
+    def __pydantic_init_subclass__(cls, **kwargs: Any):
+        super().__pydantic_init_subclass__(**kwargs)
+        cls.response_fields = tuple(cls.model_fields)
+        cls.float_fields = tuple(
+            name for name, field in cls.model_fields.items() if _is_float_field(field.annotation)
+        )
+        cls.validate_rows = bool(cls.__pydantic_decorators__.field_validators) or any(
+            _is_enum_field(field.annotation) for field in cls.model_fields.values()
+        )
+
+    @classmethod
+    def from_orm_trusted(cls, row):
+        """Build from an ORM instance or Row, skipping validation where no conversion is needed"""
+        if cls.validate_rows:
+            return cls.model_validate(row, from_attributes=True)
+
+        values = {name: getattr(row, name) for name in cls.response_fields}
+        for name in cls.float_fields:
+            if values[name] is not None:
+                values[name] = float(values[name])
+        return cls.model_construct(**values)
+
+def make_partial(model: Type[BaseModel], name: str, exclude: Tuple[str, ...] = ()) -> Type[BaseModel]:
+    """Build an update schema with every field of ``model`` optional and defaulting to None
+
+    ``name`` must be the module-level name the result is bound to so it pickles.
+    """
+    fields = {
+        field_name: (Optional[field.annotation], Field(None, description=field.description))
+        for field_name, field in model.model_fields.items()
+        if field_name not in exclude
+    }
+    return create_model(name, __module__=model.__module__, **fields)
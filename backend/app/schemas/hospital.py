@@ -1,7 +1,9 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, TypeAdapter
 from typing import Optional, List
 from datetime import datetime
 
+from app.schemas.base import TrustedResponse, make_partial
+
 class HospitalBase(BaseModel):
     """Base hospital schema"""
     name: str = Field(..., description="Hospital name")
@@ -26,26 +28,10 @@ class HospitalCreate(HospitalBase):
     """Schema for creating a hospital"""
     pass
 
-class HospitalUpdate(BaseModel):
-    """Schema for updating a hospital"""
-    name: Optional[str] = None
-    address: Optional[str] = None
-    city: Optional[str] = None
-    state: Optional[str] = None
-    zip_code: Optional[str] = None
-    county: Optional[str] = None
-    phone: Optional[str] = None
-    website: Optional[str] = None
-    email: Optional[str] = None
-    hospital_type: Optional[str] = None
-    ownership_type: Optional[str] = None
-    bed_count: Optional[int] = None
-    trauma_level: Optional[str] = None
-    illinois_region: Optional[str] = None
-    medicaid_participant: Optional[bool] = None
-    medicare_participant: Optional[bool] = None
-
-class HospitalResponse(HospitalBase):
+# Schema for updating a hospital (the NPI is not updatable)
+HospitalUpdate = make_partial(HospitalBase, "HospitalUpdate", exclude=("npi_number",))
+
+class HospitalResponse(HospitalBase, TrustedResponse):
     """Schema for hospital response"""
     id: int
     transparency_file_url: Optional[str] = None
@@ -53,9 +39,6 @@ class HospitalResponse(HospitalBase):
     data_quality_score: float = 0.0
     created_at: datetime
     updated_at: Optional[datetime] = None
-    
-    class Config:
-        from_attributes = True
 
 class HospitalProcedureBase(BaseModel):
     """Base hospital procedure schema"""
@@ -77,23 +60,13 @@ class HospitalProcedureCreate(HospitalProcedureBase):
     """Schema for creating a hospital procedure"""
     hospital_id: int = Field(..., description="Hospital ID")
 
-class HospitalProcedureUpdate(BaseModel):
-    """Schema for updating a hospital procedure"""
-    cpt_code: Optional[str] = None
-    hcpcs_code: Optional[str] = None
-    procedure_name: Optional[str] = None
-    procedure_description: Optional[str] = None
-    cash_price: Optional[float] = None
-    negotiated_rate_min: Optional[float] = None
-    negotiated_rate_max: Optional[float] = None
-    negotiated_rate_median: Optional[float] = None
-    medicare_rate: Optional[float] = None
-    medicaid_rate: Optional[float] = None
-    facility_fee: Optional[float] = None
-    professional_fee: Optional[float] = None
-    anesthesia_fee: Optional[float] = None
+# Validates a whole bulk upload in one pydantic-core call
+PROCEDURE_CREATE_LIST = TypeAdapter(List[HospitalProcedureCreate])
+
+# Schema for updating a hospital procedure
+HospitalProcedureUpdate = make_partial(HospitalProcedureBase, "HospitalProcedureUpdate")
 
-class HospitalProcedureResponse(HospitalProcedureBase):
+class HospitalProcedureResponse(HospitalProcedureBase, TrustedResponse):
     """Schema for hospital procedure response"""
     id: int
     hospital_id: int
@@ -101,9 +74,6 @@ class HospitalProcedureResponse(HospitalProcedureBase):
     last_updated: Optional[datetime] = None
     created_at: datetime
     updated_at: Optional[datetime] = None
-    
-    class Config:
-        from_attributes = True
 
 class HospitalInsuranceContractBase(BaseModel):
     """Base hospital insurance contract schema"""
@@ -120,12 +90,22 @@ class HospitalInsuranceContractCreate(HospitalInsuranceContractBase):
     """Schema for creating a hospital insurance contract"""
     hospital_id: int = Field(..., description="Hospital ID")
 
-class HospitalInsuranceContractResponse(HospitalInsuranceContractBase):
+class HospitalInsuranceContractResponse(HospitalInsuranceContractBase, TrustedResponse):
     """Schema for hospital insurance contract response"""
     id: int
     hospital_id: int
     created_at: datetime
     updated_at: Optional[datetime] = None
+
+class HospitalPriceInfo(BaseModel):
+    """Schema for one hospital's pricing in a procedure comparison"""
+    hospital_name: str
+    city: str
+    cash_price: Optional[float] = None
+    negotiated_rate_min: Optional[float] = None
+    negotiated_rate_max: Optional[float] = None
+    medicare_rate: Optional[float] = None
+    medicaid_rate: Optional[float] = None
     
     class Config:
         from_attributes = True
@@ -134,7 +114,10 @@ class ProcedureComparison(BaseModel):
     """Schema for procedure comparison across hospitals"""
     cpt_code: str
     procedure_name: str
-    hospitals: List[dict]  # List of hospital pricing info
+    cash_price_min: Optional[float] = None
+    cash_price_median: Optional[float] = None
+    cash_price_max: Optional[float] = None
+    hospitals: List[HospitalPriceInfo]
 
 class ProcedureSearchResponse(BaseModel):
     """Schema for procedure search response"""
@@ -142,13 +125,19 @@ class ProcedureSearchResponse(BaseModel):
     total_procedures: int
     results: List[ProcedureComparison]
 
+class RegionCounts(BaseModel):
+    """Schema for hospital counts per Illinois region"""
+    chicago_metro: int
+    central_illinois: int
+    southern_illinois: int
+
 class IllinoisOverview(BaseModel):
-    """Schema for Illinois healthcare overview"""
+    """Schema for the Illinois healthcare overview"""
     total_hospitals: int
     total_procedures: int
     cities: List[str]
     hospital_types: List[str]
-    regions: dict
+    regions: RegionCounts
 
 class DataScrapingResponse(BaseModel):
     """Schema for data scraping response"""
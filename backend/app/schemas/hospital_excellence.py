@@ -1,8 +1,11 @@
-from pydantic import BaseModel, Field
-from typing import Optional, List, Dict
+from pydantic import AliasChoices, AliasPath, BaseModel, ConfigDict, Field, field_validator
+from typing import Literal, Optional, List, Dict
 from datetime import datetime
+from typing_extensions import TypedDict
 from enum import Enum
 
+from app.schemas.base import TrustedResponse
+
 class TransparencyCategory(str, Enum):
     """Transparency excellence categories"""
     SMALL_HOSPITAL_EXCELLENCE = "small_hospital_excellence"
@@ -17,6 +20,15 @@ class HospitalSize(str, Enum):
     MEDIUM = "medium"
     LARGE = "large"
 
+# Accountability tier vocabularies (models.hospital_scoring stores them as codes)
+AccountabilityTierName = Literal["strict", "supportive", "educational"]
+EnforcementLevel = Literal["high", "medium", "low"]
+SupportLevel = Literal["full", "partial", "minimal"]
+
+# Value -> member maps so bulk-loaded rows resolve enums with a single dict lookup
+_CATEGORY_LOOKUP = {category.value: category for category in TransparencyCategory}
+_SIZE_LOOKUP = {size.value: size for size in HospitalSize}
+
 class HospitalExcellenceBase(BaseModel):
     """Base hospital excellence schema"""
     category: TransparencyCategory
@@ -29,11 +41,16 @@ class HospitalExcellenceBase(BaseModel):
     is_featured: bool = Field(False, description="Is featured on homepage")
     is_spotlight: bool = Field(False, description="Is in spotlight section")
     is_active: bool = Field(True, description="Is currently active recognition")
-    achievements: Optional[str] = Field(None, description="JSON string of achievements")
+    achievements: Optional[List[str]] = Field(None, description="Achievements")
     community_impact_details: Optional[str] = Field(None, description="Community impact details")
     cost_optimization_details: Optional[str] = Field(None, description="Cost optimization details")
+    
+    @field_validator('category', mode='before')
+    @classmethod
+    def lookup_category(cls, value):
+        return _CATEGORY_LOOKUP.get(value, value)
 
-class HospitalExcellenceResponse(HospitalExcellenceBase):
+class HospitalExcellenceResponse(HospitalExcellenceBase, TrustedResponse):
     """Hospital excellence response schema"""
     id: int
     hospital_id: int
@@ -41,9 +58,6 @@ class HospitalExcellenceResponse(HospitalExcellenceBase):
     recognition_end_date: Optional[datetime] = None
     created_at: datetime
     updated_at: Optional[datetime] = None
-    
-    class Config:
-        from_attributes = True
 
 class TransparencyScoreBase(BaseModel):
     """Base transparency score schema"""
@@ -62,8 +76,13 @@ class TransparencyScoreBase(BaseModel):
     cost_per_bed_transparency: Optional[float] = None
     community_impact_score: Optional[float] = None
     patient_satisfaction_score: Optional[float] = None
+    
+    @field_validator('hospital_size', mode='before')
+    @classmethod
+    def lookup_hospital_size(cls, value):
+        return _SIZE_LOOKUP.get(value, value)
 
-class TransparencyScoreResponse(TransparencyScoreBase):
+class TransparencyScoreResponse(TransparencyScoreBase, TrustedResponse):
     """Transparency score response schema"""
     id: int
     hospital_id: int
@@ -71,19 +90,18 @@ class TransparencyScoreResponse(TransparencyScoreBase):
     last_calculated: datetime
     created_at: datetime
     updated_at: Optional[datetime] = None
-    
-    class Config:
-        from_attributes = True
 
 class PeerGroupHospital(BaseModel):
     """Peer group hospital schema"""
     hospital_id: int
-    hospital_name: str
+    hospital_name: str = Field(..., validation_alias=AliasChoices('hospital_name', AliasPath('hospital', 'name')))
     rank_in_group: int
     percentile_in_group: float
     transparency_vs_peers: Optional[float] = None
     cost_effectiveness_vs_peers: Optional[float] = None
     community_impact_vs_peers: Optional[float] = None
+    
+    model_config = ConfigDict(from_attributes=True, frozen=True)
 
 class PeerGroupComparison(BaseModel):
     """Peer group comparison schema"""
@@ -99,11 +117,11 @@ class PeerGroupComparison(BaseModel):
 
 class AccountabilityTierBase(BaseModel):
     """Base accountability tier schema"""
-    tier: str = Field(..., description="Accountability tier (strict, supportive, educational)")
-    enforcement_level: str = Field(..., description="Enforcement level (high, medium, low)")
+    tier: AccountabilityTierName = Field(..., description="Accountability tier")
+    enforcement_level: EnforcementLevel = Field(..., description="Enforcement level")
     compliance_timeline_days: int = Field(..., description="Days to achieve compliance")
-    support_level: str = Field(..., description="Support level (full, partial, minimal)")
-    enforcement_actions: Optional[str] = Field(None, description="JSON string of enforcement actions")
+    support_level: SupportLevel = Field(..., description="Support level")
+    enforcement_actions: Optional[List[str]] = Field(None, description="Available enforcement actions")
     tier_reason: Optional[str] = Field(None, description="Reason for tier assignment")
     size_factor: bool = Field(False, description="Size was a factor in tier assignment")
     resource_factor: bool = Field(False, description="Resources were a factor")
@@ -112,7 +130,7 @@ class AccountabilityTierBase(BaseModel):
     improvement_rate: Optional[float] = None
     support_utilization: Optional[float] = None
 
-class AccountabilityTierResponse(AccountabilityTierBase):
+class AccountabilityTierResponse(AccountabilityTierBase, TrustedResponse):
     """Accountability tier response schema"""
     id: int
     hospital_id: int
@@ -120,39 +138,73 @@ class AccountabilityTierResponse(AccountabilityTierBase):
     tier_review_date: Optional[datetime] = None
     created_at: datetime
     updated_at: Optional[datetime] = None
+
+class ExcellenceHospitalSummary(BaseModel):
+    """Hospital summary embedded in excellence listings"""
+    id: int
+    name: str
+    city: str
+    county: Optional[str] = None
+    bed_count: Optional[int] = None
+    hospital_type: Optional[str] = None
     
     class Config:
         from_attributes = True
 
 class SmallHospitalExcellence(BaseModel):
     """Small hospital excellence schema"""
-    hospital: Dict[str, any]
+    hospital: ExcellenceHospitalSummary
     transparency_score: float
-    community_impact_score: float
-    cost_effectiveness: float
+    community_impact_score: Optional[float] = None
+    cost_effectiveness: Optional[float] = None
     excellence_recognition: Optional[str] = None
     is_featured: bool = False
     is_spotlight: bool = False
+    
+    model_config = ConfigDict(frozen=True)
+
+class SmallHospitalExcellenceList(BaseModel):
+    """Small hospital excellence listing schema"""
+    small_hospitals: List[SmallHospitalExcellence]
+    total_count: int
+    description: str
 
 class RuralHospitalHero(BaseModel):
     """Rural hospital hero schema"""
-    hospital: Dict[str, any]
+    hospital: ExcellenceHospitalSummary
     transparency_score: float
-    community_impact_score: float
-    cost_effectiveness: float
+    community_impact_score: Optional[float] = None
+    cost_effectiveness: Optional[float] = None
     rural_hero_qualities: List[str]
 
+class RuralHospitalHeroList(BaseModel):
+    """Rural hospital heroes listing schema"""
+    rural_heroes: List[RuralHospitalHero]
+    total_count: int
+    description: str
+
 class ExcellenceCategoryInfo(BaseModel):
     """Excellence category information schema"""
     name: str
     count: int
     description: str
+    
+    model_config = ConfigDict(frozen=True)
+
+class ScoringSummary(TypedDict, total=False):
+    """Summary returned by a complete scoring analysis (empty if the run failed)"""
+    total_hospitals: int
+    scoring_results: int
+    peer_groups: Dict[str, int]
+    accountability_tiers: Dict[str, int]
+    excellence_candidates: int
+    analysis_date: datetime
 
 class ScoringAnalysisResult(BaseModel):
     """Scoring analysis result schema"""
     status: str
     message: str
-    results: Dict[str, any]
+    results: ScoringSummary
 
 class HospitalExcellenceCreate(BaseModel):
     """Schema for creating hospital excellence recognition"""
@@ -0,0 +1,43 @@
+from typing import Dict
+import structlog
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.models.insurance import ClaimStatus, InsuranceClaim
+from app.models.types import Money
+
+logger = structlog.get_logger()
+
+DENIED_STATUSES = (ClaimStatus.DENIED.value, ClaimStatus.APPEAL_DENIED.value)
+
+def calculate_claim_statistics(db: Session) -> Dict:
+    """Calculate denial rate and payment totals over all claims in one aggregate query
+
+    Amounts are summed as integer cents by the database and returned as Decimal dollars.
+    """
+    try:
+        totals = db.execute(
+            select(
+                func.count().label('total_claims'),
+                func.count().filter(InsuranceClaim.status.in_(DENIED_STATUSES)).label('denied_claims'),
+                func.sum(InsuranceClaim.billed_amount).label('total_billed'),
+                func.sum(InsuranceClaim.paid_amount).label('total_paid'),
+                func.avg(InsuranceClaim.allowed_amount, type_=Money).label('avg_allowed_amount')
+            )
+        ).one()
+
+        statistics = {
+            'total_claims': totals.total_claims,
+            'denied_claims': totals.denied_claims,
+            'denial_rate': (totals.denied_claims / totals.total_claims) * 100 if totals.total_claims else 0.0,
+            'total_billed': totals.total_billed or 0,
+            'total_paid': totals.total_paid or 0,
+            'avg_allowed_amount': totals.avg_allowed_amount
+        }
+
+        logger.info(f"Calculated claim statistics over {totals.total_claims} claims")
+        return statistics
+
+    except Exception as e:
+        logger.error(f"Error calculating claim statistics: {e}")
+        return {}
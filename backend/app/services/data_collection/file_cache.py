@@ -0,0 +1,71 @@
+import hashlib
+import json
+import os
+import time
+from typing import Dict, List, Optional
+
+import pandas as pd
+import structlog
+
+logger = structlog.get_logger()
+
+# Without an ETag or Last-Modified to revalidate with, cached records are
+# reused for this long before the file is downloaded again
+FILE_CACHE_TTL = 24 * 60 * 60
+
+class PricingFileCache:
+    """On-disk cache of parsed pricing files keyed by URL
+
+    Each entry is a small JSON metadata file (HTTP validators and fetch time)
+    next to a Parquet file holding the standardized records.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, url: str, suffix: str) -> str:
+        key = hashlib.sha256(url.encode()).hexdigest()
+        return os.path.join(self.directory, f"{key}{suffix}")
+
+    def lookup(self, url: str) -> Optional[Dict]:
+        """Get the cached metadata for a URL, if any"""
+        try:
+            with open(self._path(url, ".json")) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def is_fresh(self, metadata: Dict) -> bool:
+        """Whether an entry without HTTP validators is still within its TTL"""
+        has_validators = metadata.get('etag') or metadata.get('last_modified')
+        return not has_validators and time.time() - metadata['fetched_at'] < FILE_CACHE_TTL
+
+    def conditional_headers(self, metadata: Dict) -> Dict[str, str]:
+        """Request headers that let the server answer 304 if the file is unchanged"""
+        headers = {}
+        if metadata.get('etag'):
+            headers['If-None-Match'] = metadata['etag']
+        if metadata.get('last_modified'):
+            headers['If-Modified-Since'] = metadata['last_modified']
+        return headers
+
+    def load(self, url: str) -> List[Dict]:
+        """Load the cached records for a URL"""
+        df = pd.read_parquet(self._path(url, ".parquet"))
+        return df.astype(object).where(df.notna(), None).to_dict('records')
+
+    def store(self, url: str, records: List[Dict], etag: Optional[str], last_modified: Optional[str]):
+        """Cache a file's parsed records with the validators it was served with"""
+        try:
+            pd.DataFrame.from_records(records).to_parquet(self._path(url, ".parquet"), index=False)
+            # Metadata is written last so an entry is only visible once its records exist
+            with open(self._path(url, ".json"), 'w') as f:
+                json.dump({
+                    'url': url,
+                    'etag': etag,
+                    'last_modified': last_modified,
+                    'fetched_at': time.time()
+                }, f)
+        except Exception as e:
+            logger.error(f"Error caching pricing file {url}: {e}")
@@ -1,24 +1,244 @@
 import asyncio
+from collections import defaultdict
 import aiohttp
+import numpy as np
+import orjson
 import pandas as pd
+import pyarrow.csv as pacsv
 import structlog
-from typing import List, Dict, Optional
+from typing import BinaryIO, Iterator, List, Dict, Optional, Tuple
 from datetime import datetime
 import re
-from urllib.parse import urljoin, urlparse
+import sys
+import tempfile
+import time
+from urllib.parse import ParseResult, parse_qsl, urljoin, urlparse
 import os
+from lxml import html as lxml_html
+from sqlalchemy import select
+from sqlalchemy.orm import Session
 
 from app.core.config import settings
 from app.models.hospital import Hospital, HospitalProcedure
 from app.core.database import SessionLocal
+from app.services.data_ingestion import replace_hospital_procedures
+from app.services.data_collection.file_cache import PricingFileCache
 
 logger = structlog.get_logger()
 
+# Connection pool shared by every request of a scraper session: keep-alive
+# connections are reused per host and DNS answers are cached
+SCRAPER_CONNECTION_LIMIT = 100
+SCRAPER_CONNECTIONS_PER_HOST = 8
+SCRAPER_DNS_CACHE_TTL = 300
+SCRAPER_REQUEST_TIMEOUT = 30
+
+# Pricing files can be hundreds of MB, so downloads have no total deadline;
+# they fail only when connecting or a single read stalls this many seconds
+DOWNLOAD_TIMEOUT = aiohttp.ClientTimeout(
+    total=None, sock_connect=SCRAPER_REQUEST_TIMEOUT, sock_read=SCRAPER_REQUEST_TIMEOUT
+)
+
+# Hospitals scraped at once, and pricing files downloaded at once across them
+SCRAPER_HOSPITAL_CONCURRENCY = 8
+SCRAPER_DOWNLOAD_CONCURRENCY = 8
+
+# Requests per second sent to any one host, with short bursts allowed; keeps
+# the scraper under hospital sites' rate limits instead of paying for
+# refused connections and timeouts
+SCRAPER_HOST_REQUEST_RATE = 5
+SCRAPER_HOST_REQUEST_BURST = 10
+
+SCRAPER_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
+}
+
+# Paths commonly used for price transparency pages
+TRANSPARENCY_PATHS = (
+    "/price-transparency",
+    "/pricing",
+    "/cost-estimator",
+    "/transparency",
+    "/financial-assistance/pricing"
+)
+
+# Page text that marks a price transparency page; it appears near the top
+# (title, headings), so only the first TRANSPARENCY_PROBE_BYTES are fetched
+TRANSPARENCY_INDICATORS = (
+    "price transparency",
+    "standard charges",
+    "machine readable",
+    "cms requirements",
+    "hospital price transparency",
+    "cost estimator"
+)
+TRANSPARENCY_PROBE_BYTES = 8192
+_INDICATOR_RE = re.compile('|'.join(map(re.escape, TRANSPARENCY_INDICATORS)))
+
+# Definite probe answers (url -> (expires_at, is_transparency_page)), shared by
+# every scraper in the process so later runs skip URLs already known to miss.
+# 404s and other client errors are cached; network errors, 429s and 5xxs are not.
+PROBE_CACHE_TTL = 3600
+PROBE_CACHE_MAX_SIZE = 10000
+_probe_cache: Dict[str, Tuple[float, bool]] = {}
+
+def _cached_probe(url: str) -> Optional[bool]:
+    """Get the cached probe answer for a URL, if it has not expired"""
+    entry = _probe_cache.get(url)
+    if entry is None:
+        return None
+    expires_at, answer = entry
+    if expires_at < time.monotonic():
+        del _probe_cache[url]
+        return None
+    return answer
+
+def _store_probe(url: str, answer: bool):
+    """Cache a probe answer, evicting the oldest entry when full"""
+    if url not in _probe_cache and len(_probe_cache) >= PROBE_CACHE_MAX_SIZE:
+        _probe_cache.pop(next(iter(_probe_cache)))
+    _probe_cache[url] = (time.monotonic() + PROBE_CACHE_TTL, answer)
+
+def _is_transient(status: int) -> bool:
+    """Whether an HTTP status may succeed on retry"""
+    return status == 429 or status >= 500
+
+# Link targets that may lead to a price transparency page
+_TRANSPARENCY_LINK_RE = re.compile(r'price|transparency|cost|pricing', re.IGNORECASE)
+# Link targets that may be a downloadable pricing file
+_FILE_LINK_RE = re.compile(r'\.(?:csv|xlsx?|json)$|download', re.IGNORECASE)
+# Words in a file path that mark it as pricing data
+PRICING_PATH_INDICATORS = (
+    "price", "pricing", "charges", "cost", "transparency",
+    "standard", "machine", "readable", "cms"
+)
+_PRICING_PATH_RE = re.compile('|'.join(PRICING_PATH_INDICATORS), re.IGNORECASE)
+# First number in a price cell once "$" and "," are removed
+_PRICE_RE = re.compile(r'(\d+\.?\d*)')
+
+# Hospital keys in priority order, each with the words its name must all contain
+HOSPITAL_KEYWORDS = (
+    ('northwestern', ('northwestern',)),
+    ('rush', ('rush',)),
+    ('uchicago', ('chicago', 'university')),
+    ('advocate', ('advocate',)),
+    ('loyola', ('loyola',)),
+    ('swedish', ('swedish',)),
+    ('presence', ('presence',)),
+    ('mercy', ('mercy',))
+)
+# Every keyword in one alternation, so a name is scanned once whatever the list size
+_HOSPITAL_KEYWORD_RE = re.compile('|'.join(
+    re.escape(word) for word in dict.fromkeys(
+        word for _, words in HOSPITAL_KEYWORDS for word in words
+    )
+))
+
+# Downloads are read in DOWNLOAD_CHUNK_SIZE pieces and kept in memory up to
+# DOWNLOAD_SPOOL_MAX_SIZE, then spilled to a temporary file
+DOWNLOAD_CHUNK_SIZE = 64 << 10
+DOWNLOAD_SPOOL_MAX_SIZE = 64 << 20
+
+# Bytes per block handed to each Arrow CSV reader thread
+CSV_BLOCK_SIZE = 8 << 20
+
+# Columns of a standardized procedure record
+STANDARD_TEXT_COLUMNS = ('cpt_code', 'procedure_name')
+STANDARD_PRICE_COLUMNS = ('cash_price', 'negotiated_rate', 'medicare_rate', 'medicaid_rate')
+
+# Lowercase substrings that identify each standard column in a source file
+COLUMN_ALIASES = (
+    ('cpt_code', ('cpt', 'cpt_code', 'procedure_code', 'code')),
+    ('procedure_name', ('procedure', 'description', 'service', 'procedure_name')),
+    ('cash_price', ('cash_price', 'self_pay', 'uninsured', 'gross_charge')),
+    ('negotiated_rate', ('negotiated_rate', 'insurance_rate', 'allowed_amount')),
+    ('medicare_rate', ('medicare', 'medicare_rate', 'cms_rate')),
+    ('medicaid_rate', ('medicaid', 'medicaid_rate'))
+)
+
+# Query parameters that only track the click and never select a different file
+_TRACKING_PARAMS = frozenset({'fbclid', 'gclid', 'msclkid', 'mc_cid', 'mc_eid'})
+
+def _file_link_key(parts: ParseResult) -> Tuple[str, str, Tuple[Tuple[str, str], ...]]:
+    """Identity of a linked file: host, case-folded path and non-tracking query parameters"""
+    query = tuple(sorted(
+        (name, value) for name, value in parse_qsl(parts.query, keep_blank_values=True)
+        if name.lower() not in _TRACKING_PARAMS and not name.lower().startswith('utm_')
+    ))
+    return parts.netloc.lower(), parts.path.lower(), query
+
+def _cms_charge_rows(items: List[Dict]) -> Iterator[Dict]:
+    """Flatten CMS template charge items into one standard-named row per charge setting"""
+    for item in items:
+        codes = item.get('code_information') or [{}]
+        code = next(
+            (info for info in codes if str(info.get('type', '')).upper() in ('CPT', 'HCPCS')),
+            codes[0]
+        )
+        for charge in item.get('standard_charges') or ():
+            row = {
+                'cpt_code': code.get('code'),
+                'procedure_name': item.get('description'),
+                'cash_price': charge.get('discounted_cash'),
+                'negotiated_rate': None,
+                'medicare_rate': None,
+                'medicaid_rate': None
+            }
+            # The first dollar rate seen per payer type fills its column
+            for payer in charge.get('payers_information') or ():
+                payer_name = str(payer.get('payer_name', '')).lower()
+                if 'medicare' in payer_name:
+                    column = 'medicare_rate'
+                elif 'medicaid' in payer_name:
+                    column = 'medicaid_rate'
+                else:
+                    column = 'negotiated_rate'
+                if row[column] is None:
+                    row[column] = payer.get('standard_charge_dollar')
+            yield row
+
+def _page_hrefs(html: str) -> List[str]:
+    """Get every href attribute value of a page, in document order, with one lxml parse"""
+    if not html.strip():
+        return []
+    return lxml_html.fromstring(html).xpath('//@href')
+
+class TokenBucket:
+    """Token bucket rate limiter: ``rate`` acquisitions per second, up to ``burst`` at once"""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        """Take a token, waiting for one to be refilled if the bucket is empty"""
+        async with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens < 1:
+                # Waiters queue on the lock, so tokens are handed out in arrival order
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+                self._tokens = 1.0
+                self._updated = time.monotonic()
+            self._tokens -= 1
+
 class IllinoisHospitalScraper:
     """Scraper for Illinois hospital pricing transparency data"""
     
-    def __init__(self):
-        self.session = None
+    def __init__(self, session: Optional[aiohttp.ClientSession] = None):
+        # A caller-provided session is shared and left open on exit
+        self.session = session
+        self._owns_session = session is None
+        self.file_cache = PricingFileCache(settings.SCRAPER_CACHE_DIR)
+        self._hospital_semaphore = None
+        self._download_semaphore = None
+        self._host_buckets: Dict[str, TokenBucket] = defaultdict(
+            lambda: TokenBucket(SCRAPER_HOST_REQUEST_RATE, SCRAPER_HOST_REQUEST_BURST)
+        )
         self.hospitals = settings.CHICAGO_HOSPITALS
         self.base_urls = {
             "northwestern": "https://www.nm.org",
@@ -32,37 +252,58 @@ class IllinoisHospitalScraper:
         }
         
     async def __aenter__(self):
-        self.session = aiohttp.ClientSession(
-            headers={
-                "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
-            }
-        )
+        # Separate limits so hospitals holding a permit never wait on their own downloads
+        self._hospital_semaphore = asyncio.Semaphore(SCRAPER_HOSPITAL_CONCURRENCY)
+        self._download_semaphore = asyncio.Semaphore(SCRAPER_DOWNLOAD_CONCURRENCY)
+        if self._owns_session:
+            self.session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=SCRAPER_CONNECTION_LIMIT,
+                    limit_per_host=SCRAPER_CONNECTIONS_PER_HOST,
+                    ttl_dns_cache=SCRAPER_DNS_CACHE_TTL,
+                    enable_cleanup_closed=True
+                ),
+                headers=SCRAPER_HEADERS,
+                timeout=aiohttp.ClientTimeout(total=SCRAPER_REQUEST_TIMEOUT)
+            )
         return self
         
+    async def _throttle(self, url: str):
+        """Wait until the URL's host may be sent another request"""
+        await self._host_buckets[urlparse(url).netloc].acquire()
+    
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        if self.session:
+        if self._owns_session and self.session:
             await self.session.close()
+            self.session = None
     
     async def scrape_all_hospitals(self) -> Dict[str, List[Dict]]:
         """Scrape pricing data from all target hospitals"""
         results = {}
         
-        for hospital_name in self.hospitals:
-            try:
-                logger.info(f"Scraping data for {hospital_name}")
-                hospital_data = await self.scrape_hospital(hospital_name)
-                if hospital_data:
-                    results[hospital_name] = hospital_data
-                    logger.info(f"Successfully scraped {len(hospital_data)} procedures from {hospital_name}")
-                else:
-                    logger.warning(f"No data found for {hospital_name}")
-                    
-            except Exception as e:
-                logger.error(f"Error scraping {hospital_name}: {e}")
-                continue
+        # Hospitals are scraped concurrently so their network waits overlap
+        outcomes = await asyncio.gather(
+            *(self._scrape_hospital_bounded(hospital_name) for hospital_name in self.hospitals),
+            return_exceptions=True
+        )
+        
+        for hospital_name, hospital_data in zip(self.hospitals, outcomes):
+            if isinstance(hospital_data, Exception):
+                logger.error(f"Error scraping {hospital_name}: {hospital_data}")
+            elif hospital_data:
+                results[hospital_name] = hospital_data
+                logger.info(f"Successfully scraped {len(hospital_data)} procedures from {hospital_name}")
+            else:
+                logger.warning(f"No data found for {hospital_name}")
                 
         return results
     
+    async def _scrape_hospital_bounded(self, hospital_name: str) -> Optional[List[Dict]]:
+        """Scrape a hospital once a hospital concurrency slot is free"""
+        async with self._hospital_semaphore:
+            logger.info(f"Scraping data for {hospital_name}")
+            return await self.scrape_hospital(hospital_name)
+    
     async def scrape_hospital(self, hospital_name: str) -> Optional[List[Dict]]:
         """Scrape pricing data from a specific hospital"""
         hospital_key = self._get_hospital_key(hospital_name)
@@ -91,73 +332,91 @@ class IllinoisHospitalScraper:
     async def _find_transparency_page(self, base_url: str, hospital_name: str) -> Optional[str]:
         """Find the pricing transparency page for a hospital"""
         try:
+            await self._throttle(base_url)
             async with self.session.get(base_url) as response:
                 if response.status != 200:
                     return None
                     
                 html = await response.text()
                 
-                # Look for common transparency page patterns
-                transparency_patterns = [
-                    r'href=["\']([^"\']*[pP]rice[^"\']*)["\']',
-                    r'href=["\']([^"\']*[tT]ransparency[^"\']*)["\']',
-                    r'href=["\']([^"\']*[cC]ost[^"\']*)["\']',
-                    r'href=["\']([^"\']*[pP]ricing[^"\']*)["\']'
+                # Candidates: links that look like transparency pages, then common paths
+                candidate_urls = [
+                    urljoin(base_url, href) for href in _page_hrefs(html)
+                    if _TRANSPARENCY_LINK_RE.search(href)
                 ]
+                candidate_urls.extend(urljoin(base_url, path) for path in TRANSPARENCY_PATHS)
                 
-                for pattern in transparency_patterns:
-                    matches = re.findall(pattern, html, re.IGNORECASE)
-                    for match in matches:
-                        full_url = urljoin(base_url, match)
-                        if await self._is_transparency_page(full_url):
-                            return full_url
-                            
-                # Try common transparency URLs
-                common_paths = [
-                    "/price-transparency",
-                    "/pricing",
-                    "/cost-estimator",
-                    "/transparency",
-                    "/financial-assistance/pricing"
-                ]
-                
-                for path in common_paths:
-                    test_url = urljoin(base_url, path)
-                    if await self._is_transparency_page(test_url):
-                        return test_url
+                return await self._first_transparency_page(list(dict.fromkeys(candidate_urls)))
                         
         except Exception as e:
             logger.error(f"Error finding transparency page for {hospital_name}: {e}")
             
         return None
     
+    async def _first_transparency_page(self, candidate_urls: List[str]) -> Optional[str]:
+        """Probe all candidate URLs at once and return the first confirmed one in candidate order"""
+        probes = [asyncio.create_task(self._is_transparency_page(url)) for url in candidate_urls]
+        try:
+            # Answers are read in candidate order, so the result never depends on which probe finishes first
+            for url, probe in zip(candidate_urls, probes):
+                if await probe:
+                    return url
+        finally:
+            # Stop the probes still in flight and let them finish cancelling
+            for probe in probes:
+                probe.cancel()
+            await asyncio.gather(*probes, return_exceptions=True)
+        return None
+    
     async def _is_transparency_page(self, url: str) -> bool:
         """Check if a URL is a pricing transparency page"""
+        answer = _cached_probe(url)
+        if answer is not None:
+            return answer
+        
         try:
-            async with self.session.get(url) as response:
-                if response.status != 200:
-                    return False
-                    
-                html = await response.text().lower()
-                
-                # Look for transparency indicators
-                transparency_indicators = [
-                    "price transparency",
-                    "standard charges",
-                    "machine readable",
-                    "cms requirements",
-                    "hospital price transparency",
-                    "cost estimator"
-                ]
-                
-                return any(indicator in html for indicator in transparency_indicators)
-                
+            answer = await self._probe_url(url)
         except Exception:
             return False
+        
+        if answer is None:
+            return False
+        _store_probe(url, answer)
+        return answer
+    
+    async def _probe_url(self, url: str) -> Optional[bool]:
+        """Fetch the start of a URL and look for transparency indicators (None if transient)"""
+        # HEAD first to skip missing pages and non-HTML targets without a body
+        await self._throttle(url)
+        async with self.session.head(url, allow_redirects=True) as response:
+            # Some servers don't implement HEAD; fall through to the GET for those
+            if response.status not in (200, 405, 501):
+                return None if _is_transient(response.status) else False
+            content_type = response.headers.get('Content-Type', '')
+            if response.status == 200 and content_type and 'html' not in content_type:
+                return False
+        
+        await self._throttle(url)
+        async with self.session.get(
+            url, headers={'Range': f'bytes=0-{TRANSPARENCY_PROBE_BYTES - 1}'}
+        ) as response:
+            if response.status not in (200, 206):
+                return None if _is_transient(response.status) else False
+            
+            # Servers that ignore Range still only have the prefix read; read()
+            # would return after the first network chunk, so wait for the full
+            # window unless the body ends first
+            try:
+                head = await response.content.readexactly(TRANSPARENCY_PROBE_BYTES)
+            except asyncio.IncompleteReadError as e:
+                head = e.partial
+            
+        return bool(_INDICATOR_RE.search(head.decode('utf-8', 'ignore').lower()))
     
     async def _scrape_pricing_data(self, transparency_url: str, hospital_name: str) -> List[Dict]:
         """Scrape pricing data from a transparency page"""
         try:
+            await self._throttle(transparency_url)
             async with self.session.get(transparency_url) as response:
                 if response.status != 200:
                     return []
@@ -169,14 +428,16 @@ class IllinoisHospitalScraper:
                 
                 pricing_data = []
                 
-                for file_url in file_links:
-                    try:
-                        file_data = await self._download_and_parse_file(file_url, hospital_name)
-                        if file_data:
-                            pricing_data.extend(file_data)
-                    except Exception as e:
-                        logger.error(f"Error processing file {file_url}: {e}")
-                        continue
+                file_results = await asyncio.gather(
+                    *(self._download_and_parse_file(file_url, hospital_name) for file_url in file_links),
+                    return_exceptions=True
+                )
+                
+                for file_url, file_data in zip(file_links, file_results):
+                    if isinstance(file_data, Exception):
+                        logger.error(f"Error processing file {file_url}: {file_data}")
+                    elif file_data:
+                        pricing_data.extend(file_data)
                 
                 return pricing_data
                 
@@ -185,88 +446,116 @@ class IllinoisHospitalScraper:
             return []
     
     def _extract_file_links(self, html: str, base_url: str) -> List[str]:
-        """Extract links to pricing data files"""
-        file_patterns = [
-            r'href=["\']([^"\']*\.csv)["\']',
-            r'href=["\']([^"\']*\.xlsx?)["\']',
-            r'href=["\']([^"\']*\.json)["\']',
-            r'href=["\']([^"\']*[dD]ownload[^"\']*)["\']'
-        ]
-        
-        file_links = []
-        for pattern in file_patterns:
-            matches = re.findall(pattern, html, re.IGNORECASE)
-            for match in matches:
-                full_url = urljoin(base_url, match)
-                if self._is_pricing_file(full_url):
-                    file_links.append(full_url)
-        
-        return file_links
-    
-    def _is_pricing_file(self, url: str) -> bool:
-        """Check if a URL points to a pricing data file"""
-        filename = urlparse(url).path.lower()
-        pricing_indicators = [
-            "price", "pricing", "charges", "cost", "transparency",
-            "standard", "machine", "readable", "cms"
-        ]
+        """Extract links to pricing data files, each file once"""
+        file_links = {}
+        for href in _page_hrefs(html):
+            # Cheap href test first; only file-like links are resolved and parsed
+            if not _FILE_LINK_RE.search(href):
+                continue
+            full_url = urljoin(base_url, href)
+            parts = urlparse(full_url)
+            if _PRICING_PATH_RE.search(parts.path):
+                # Pages often link one file from several sections; keep the first link
+                file_links.setdefault(_file_link_key(parts), full_url)
         
-        return any(indicator in filename for indicator in pricing_indicators)
+        return list(file_links.values())
     
     async def _download_and_parse_file(self, file_url: str, hospital_name: str) -> List[Dict]:
-        """Download and parse a pricing data file"""
+        """Download and parse a pricing data file, reusing cached records while it is unchanged"""
         try:
-            async with self.session.get(file_url) as response:
-                if response.status != 200:
-                    return []
+            cached = self.file_cache.lookup(file_url)
+            if cached and self.file_cache.is_fresh(cached):
+                return await asyncio.to_thread(self.file_cache.load, file_url)
+            
+            headers = self.file_cache.conditional_headers(cached) if cached else {}
+            etag = last_modified = None
+            unchanged = False
+            
+            # Large files are streamed to a spool that moves to disk past
+            # DOWNLOAD_SPOOL_MAX_SIZE, so the body is never held in memory whole
+            with tempfile.SpooledTemporaryFile(max_size=DOWNLOAD_SPOOL_MAX_SIZE) as spool:
+                # Only the transfer holds a download slot; the file is parsed after
+                # the slot is released, so the next download runs alongside the parse
+                async with self._download_semaphore:
+                    await self._throttle(file_url)
+                    async with self.session.get(file_url, headers=headers, timeout=DOWNLOAD_TIMEOUT) as response:
+                        if response.status == 304 and cached:
+                            unchanged = True
+                        elif response.status != 200:
+                            return []
+                        else:
+                            etag = response.headers.get('ETag')
+                            last_modified = response.headers.get('Last-Modified')
+                            async for chunk in response.content.iter_chunked(DOWNLOAD_CHUNK_SIZE):
+                                spool.write(chunk)
                 
-                content = await response.read()
-                file_extension = self._get_file_extension(file_url)
+                if unchanged:
+                    logger.info(f"Pricing file unchanged, using cached records: {file_url}")
+                    return await asyncio.to_thread(self.file_cache.load, file_url)
                 
-                if file_extension == ".csv":
-                    return self._parse_csv_file(content, hospital_name)
-                elif file_extension in [".xlsx", ".xls"]:
-                    return self._parse_excel_file(content, hospital_name)
-                elif file_extension == ".json":
-                    return self._parse_json_file(content, hospital_name)
-                else:
-                    logger.warning(f"Unsupported file type: {file_extension}")
-                    return []
+                spool.seek(0)
+                # Parsing is CPU-bound; run it on a worker thread so other downloads keep flowing
+                records = await asyncio.to_thread(
+                    self._parse_file, spool, self._get_file_extension(file_url), hospital_name
+                )
+            
+            if records:
+                await asyncio.to_thread(self.file_cache.store, file_url, records, etag, last_modified)
+            return records
                     
         except Exception as e:
             logger.error(f"Error downloading file {file_url}: {e}")
             return []
     
+    def _parse_file(self, content: BinaryIO, file_extension: str, hospital_name: str) -> List[Dict]:
+        """Parse a downloaded pricing file by its extension"""
+        if file_extension == ".csv":
+            return self._parse_csv_file(content, hospital_name)
+        elif file_extension in [".xlsx", ".xls"]:
+            return self._parse_excel_file(content, hospital_name)
+        elif file_extension == ".json":
+            return self._parse_json_file(content, hospital_name)
+        else:
+            logger.warning(f"Unsupported file type: {file_extension}")
+            return []
+    
     def _get_file_extension(self, url: str) -> str:
         """Get file extension from URL"""
         path = urlparse(url).path
         return os.path.splitext(path)[1].lower()
     
-    def _parse_csv_file(self, content: bytes, hospital_name: str) -> List[Dict]:
+    def _parse_csv_file(self, content: BinaryIO, hospital_name: str) -> List[Dict]:
         """Parse CSV pricing data"""
         try:
-            df = pd.read_csv(pd.io.common.BytesIO(content))
-            return self._standardize_dataframe(df, hospital_name)
+            # Arrow's multithreaded C++ reader parses straight from the downloaded file
+            table = pacsv.read_csv(
+                content,
+                read_options=pacsv.ReadOptions(block_size=CSV_BLOCK_SIZE, use_threads=True)
+            )
+            return self._standardize_dataframe(table.to_pandas(), hospital_name)
         except Exception as e:
             logger.error(f"Error parsing CSV file: {e}")
             return []
     
-    def _parse_excel_file(self, content: bytes, hospital_name: str) -> List[Dict]:
+    def _parse_excel_file(self, content: BinaryIO, hospital_name: str) -> List[Dict]:
         """Parse Excel pricing data"""
         try:
-            df = pd.read_excel(pd.io.common.BytesIO(content))
+            df = pd.read_excel(content)
             return self._standardize_dataframe(df, hospital_name)
         except Exception as e:
             logger.error(f"Error parsing Excel file: {e}")
             return []
     
-    def _parse_json_file(self, content: bytes, hospital_name: str) -> List[Dict]:
+    def _parse_json_file(self, content: BinaryIO, hospital_name: str) -> List[Dict]:
         """Parse JSON pricing data"""
         try:
-            import json
-            data = json.loads(content.decode('utf-8'))
-            # Convert JSON to DataFrame for standardization
-            df = pd.json_normalize(data)
+            data = orjson.loads(content.read())
+            # Convert JSON to DataFrame for standardization; files in the CMS
+            # template are flattened directly instead of through json_normalize
+            if isinstance(data, dict) and isinstance(data.get('standard_charge_information'), list):
+                df = pd.DataFrame.from_records(_cms_charge_rows(data['standard_charge_information']))
+            else:
+                df = pd.json_normalize(data)
             return self._standardize_dataframe(df, hospital_name)
         except Exception as e:
             logger.error(f"Error parsing JSON file: {e}")
@@ -274,111 +563,121 @@ class IllinoisHospitalScraper:
     
     def _standardize_dataframe(self, df: pd.DataFrame, hospital_name: str) -> List[Dict]:
         """Standardize pricing data from various formats"""
-        standardized_data = []
-        
-        # Common column name mappings
-        column_mappings = {
-            'cpt_code': ['cpt', 'cpt_code', 'procedure_code', 'code'],
-            'procedure_name': ['procedure', 'description', 'service', 'procedure_name'],
-            'cash_price': ['cash_price', 'self_pay', 'uninsured', 'gross_charge'],
-            'negotiated_rate': ['negotiated_rate', 'insurance_rate', 'allowed_amount'],
-            'medicare_rate': ['medicare', 'medicare_rate', 'cms_rate'],
-            'medicaid_rate': ['medicaid', 'medicaid_rate']
-        }
-        
-        # Find actual column names
+        # Find actual column names: the first column containing any alias
+        columns_lower = [(str(col).lower(), col) for col in df.columns]
         actual_columns = {}
-        for standard_name, possible_names in column_mappings.items():
-            for col in df.columns:
-                if any(name.lower() in col.lower() for name in possible_names):
-                    actual_columns[standard_name] = col
-                    break
+        for standard_name, aliases in COLUMN_ALIASES:
+            match = next(
+                (col for col_lower, col in columns_lower if any(alias in col_lower for alias in aliases)),
+                None
+            )
+            if match is not None:
+                actual_columns[standard_name] = match
         
-        # Process each row
-        for _, row in df.iterrows():
-            try:
-                procedure_data = {
-                    'hospital_name': hospital_name,
-                    'cpt_code': str(row.get(actual_columns.get('cpt_code', ''), '')),
-                    'procedure_name': str(row.get(actual_columns.get('procedure_name', ''), '')),
-                    'cash_price': self._extract_price(row.get(actual_columns.get('cash_price', ''), '')),
-                    'negotiated_rate': self._extract_price(row.get(actual_columns.get('negotiated_rate', ''), '')),
-                    'medicare_rate': self._extract_price(row.get(actual_columns.get('medicare_rate', ''), '')),
-                    'medicaid_rate': self._extract_price(row.get(actual_columns.get('medicaid_rate', ''), '')),
-                    'source_file': hospital_name,
-                    'last_updated': datetime.now()
-                }
-                
-                # Only add if we have meaningful data
-                if procedure_data['procedure_name'] and procedure_data['cpt_code']:
-                    standardized_data.append(procedure_data)
-                    
-            except Exception as e:
-                logger.error(f"Error processing row: {e}")
-                continue
+        # Whole columns are converted at once; unmapped columns are missing everywhere
+        standardized = pd.DataFrame(index=df.index)
+        standardized['hospital_name'] = hospital_name
+        for name in STANDARD_TEXT_COLUMNS:
+            if name in actual_columns:
+                standardized[name] = df[actual_columns[name]].astype('string')
+            else:
+                standardized[name] = pd.Series(pd.NA, index=df.index, dtype='string')
+        for name in STANDARD_PRICE_COLUMNS:
+            if name in actual_columns:
+                standardized[name] = self._extract_prices(df[actual_columns[name]])
+            else:
+                standardized[name] = np.nan
+        standardized['source_file'] = hospital_name
+        standardized['last_updated'] = datetime.now()
+        
+        # Only keep rows with meaningful data
+        has_data = (
+            standardized['procedure_name'].fillna('').ne('')
+            & standardized['cpt_code'].fillna('').ne('')
+        )
+        standardized = standardized[has_data]
         
-        return standardized_data
+        # Missing values become None in the records
+        standardized = standardized.astype(object).where(standardized.notna(), None)
+        return standardized.to_dict('records')
     
-    def _extract_price(self, price_value) -> Optional[float]:
-        """Extract numeric price from various formats"""
-        if pd.isna(price_value) or price_value == '':
-            return None
-            
-        try:
-            # Remove common non-numeric characters
-            price_str = str(price_value).replace('$', '').replace(',', '').strip()
-            
-            # Extract first number found
-            price_match = re.search(r'[\d,]+\.?\d*', price_str)
-            if price_match:
-                return float(price_match.group().replace(',', ''))
-                
-        except Exception:
-            pass
-            
-        return None
+    def _extract_prices(self, values: pd.Series) -> pd.Series:
+        """Extract numeric prices from a column of mixed formats (NaN where there is none)"""
+        numbers = values.astype('string').str.replace(r'[$,]', '', regex=True).str.extract(_PRICE_RE, expand=False)
+        return pd.to_numeric(numbers, errors='coerce')
     
     def _get_hospital_key(self, hospital_name: str) -> Optional[str]:
         """Get hospital key from full name"""
-        hospital_name_lower = hospital_name.lower()
+        found = set(_HOSPITAL_KEYWORD_RE.findall(hospital_name.lower()))
+        if not found:
+            return None
+        
+        return next((key for key, words in HOSPITAL_KEYWORDS if found.issuperset(words)), None)
+
+def _procedure_rows(hospital_id: int, records: List[Dict]) -> Iterator[Dict]:
+    """Map standardized scraped records onto hospital_procedures columns"""
+    cpt_code_length = HospitalProcedure.cpt_code.type.length
+    procedure_name_length = HospitalProcedure.procedure_name.type.length
+    for record in records:
+        # A file gives one negotiated rate per row, so the range collapses to it
+        negotiated_rate = record['negotiated_rate']
+        yield {
+            'hospital_id': hospital_id,
+            'cpt_code': record['cpt_code'][:cpt_code_length],
+            'procedure_name': record['procedure_name'][:procedure_name_length],
+            'cash_price': record['cash_price'],
+            'negotiated_rate_min': negotiated_rate,
+            'negotiated_rate_max': negotiated_rate,
+            'negotiated_rate_median': negotiated_rate,
+            'medicare_rate': record['medicare_rate'],
+            'medicaid_rate': record['medicaid_rate'],
+            'source_file': record['source_file'],
+            'last_updated': record['last_updated']
+        }
+
+def save_scraped_procedures(db: Session, results: Dict[str, List[Dict]]) -> int:
+    """Save scraped procedures for hospitals that exist in the database
+
+    Each hospital's rows from the scraped source files replace the ones saved
+    by earlier scrapes; hospitals that yielded nothing keep their procedures.
+    Returns the number of procedures written.
+    """
+    hospital_ids = dict(db.execute(
+        select(Hospital.name, Hospital.id).where(Hospital.name.in_(list(results)))
+    ).all())
+    
+    written = 0
+    for hospital_name, procedures in results.items():
+        if not procedures:
+            continue
         
-        if 'northwestern' in hospital_name_lower:
-            return 'northwestern'
-        elif 'rush' in hospital_name_lower:
-            return 'rush'
-        elif 'chicago' in hospital_name_lower and 'university' in hospital_name_lower:
-            return 'uchicago'
-        elif 'advocate' in hospital_name_lower:
-            return 'advocate'
-        elif 'loyola' in hospital_name_lower:
-            return 'loyola'
-        elif 'swedish' in hospital_name_lower:
-            return 'swedish'
-        elif 'presence' in hospital_name_lower:
-            return 'presence'
-        elif 'mercy' in hospital_name_lower:
-            return 'mercy'
+        hospital_id = hospital_ids.get(hospital_name)
+        if hospital_id is None:
+            logger.warning(f"Skipping {len(procedures)} procedures for unknown hospital: {hospital_name}")
+            continue
         
-        return None
+        logger.info(f"Processing {len(procedures)} procedures for {hospital_name}")
+        source_files = {record['source_file'] for record in procedures}
+        written += replace_hospital_procedures(db, hospital_id, source_files, _procedure_rows(hospital_id, procedures))
+    
+    return written
 
 async def main():
     """Main function to run the scraper"""
     async with IllinoisHospitalScraper() as scraper:
         results = await scraper.scrape_all_hospitals()
-        
-        # Save results to database
-        db = SessionLocal()
-        try:
-            for hospital_name, procedures in results.items():
-                logger.info(f"Processing {len(procedures)} procedures for {hospital_name}")
-                
-                # Here you would save to database
-                # For now, just log the results
-                for procedure in procedures[:5]:  # Log first 5 procedures
-                    logger.info(f"Procedure: {procedure['procedure_name']}, Price: ${procedure['cash_price']}")
-                    
-        finally:
-            db.close()
+    
+    # Save results to database
+    db = SessionLocal()
+    try:
+        written = save_scraped_procedures(db, results)
+        logger.info(f"Saved {written} procedures")
+    finally:
+        db.close()
 
 if __name__ == "__main__":
+    # uvloop comes with uvicorn[standard] but has no Windows build
+    if sys.platform != "win32":
+        import uvloop
+        uvloop.install()
     asyncio.run(main())
@@ -0,0 +1,53 @@
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List
+import structlog
+from sqlalchemy import delete, insert
+from sqlalchemy.orm import Session
+
+from app.models.hospital import HospitalProcedure
+
+logger = structlog.get_logger()
+
+# Rows written per executemany call
+INGEST_BATCH_SIZE = 10000
+
+def _batches(rows: Iterable[Dict], batch_size: int) -> Iterator[List[Dict]]:
+    """Split rows into lists of at most batch_size rows"""
+    iterator = iter(rows)
+    while batch := list(islice(iterator, batch_size)):
+        yield batch
+
+def replace_hospital_procedures(
+    db: Session, hospital_id: int, source_files: Iterable[str], rows: Iterable[Dict],
+    batch_size: int = INGEST_BATCH_SIZE
+) -> int:
+    """Replace a hospital's procedures from the given source files in one transaction
+
+    Earlier rows from those files are deleted before the new rows are inserted
+    with executemany, so loading the same files again never duplicates them.
+    Rows are column dicts for hospital_procedures and must all share the same keys.
+    Returns the number of rows written (0 if the replacement was rolled back).
+    """
+    written = 0
+
+    try:
+        with db.no_autoflush:
+            db.execute(
+                delete(HospitalProcedure).where(
+                    HospitalProcedure.hospital_id == hospital_id,
+                    HospitalProcedure.source_file.in_(list(source_files))
+                )
+            )
+            for batch in _batches(rows, batch_size):
+                db.execute(insert(HospitalProcedure), batch)
+                written += len(batch)
+        db.commit()
+
+        logger.info(f"Replaced procedures of hospital {hospital_id} with {written} rows")
+
+    except Exception as e:
+        logger.error(f"Error replacing procedures of hospital {hospital_id}: {e}")
+        db.rollback()
+        return 0
+
+    return written
@@ -1,268 +1,362 @@
 import pandas as pd
 import numpy as np
-from typing import Dict, List, Tuple, Optional
-from datetime import datetime, timedelta
+from typing import Dict, Iterator, List, Tuple, Optional
+from datetime import datetime, timezone
+import re
 import structlog
+from dataclasses import dataclass
 from sqlalchemy.orm import Session
-from sqlalchemy import func, and_
+from sqlalchemy import func, and_, insert, select
+from sqlalchemy.engine import Row
 
-from app.models.hospital import Hospital
+from app.models.hospital import Hospital, HospitalProcedure
 from app.models.hospital_scoring import (
     HospitalTransparencyScore, HospitalExcellenceRecognition, 
     HospitalPeerGroup, HospitalAccountabilityTier,
-    HospitalSize, TransparencyCategory
+    HospitalSize, TransparencyCategory, SCORING_WEIGHTS
 )
 from app.core.database import SessionLocal
 
 logger = structlog.get_logger()
 
+# Transparency score rows inserted per executemany call and commit
+SCORING_WRITE_WINDOW = 10000
+
+# Hospital rows fetched per round trip when streaming hospitals
+HOSPITAL_STREAM_BATCH_SIZE = 1000
+
+# Transparency score components, in weight matrix column order
+SCORE_COMPONENTS = tuple(SCORING_WEIGHTS[HospitalSize.SMALL])
+
+# Bed counts at which a hospital becomes medium and large
+MEDIUM_HOSPITAL_BEDS = 50
+LARGE_HOSPITAL_BEDS = 200
+SIZE_BED_THRESHOLDS = np.array([MEDIUM_HOSPITAL_BEDS, LARGE_HOSPITAL_BEDS])
+
+# Weight matrix row of each hospital size
+SIZE_INDEX = {size: index for index, size in enumerate(HospitalSize)}
+SIZE_VALUES = np.array([size.value for size in HospitalSize])
+
+# Peer group of each hospital size
+PEER_GROUP_NAMES = {
+    HospitalSize.SMALL: 'Small Community Hospitals',
+    HospitalSize.MEDIUM: 'Medium Regional Hospitals',
+    HospitalSize.LARGE: 'Large Hospital Systems'
+}
+
+# Accountability tier of each hospital size:
+# (tier, enforcement level, compliance timeline in days, support level)
+ACCOUNTABILITY_BY_SIZE = {
+    HospitalSize.LARGE: ('strict', 'high', 30, 'minimal'),
+    HospitalSize.MEDIUM: ('supportive', 'medium', 60, 'partial'),
+    HospitalSize.SMALL: ('educational', 'low', 90, 'full')
+}
+
+# Enforcement actions available in each accountability tier (shared; treat as read-only)
+ENFORCEMENT_ACTIONS = {
+    'strict': [
+        'public_compliance_monitoring',
+        'regulatory_complaint_filing',
+        'media_pressure_campaigns',
+        'legal_action_support'
+    ],
+    'supportive': [
+        'compliance_assistance',
+        'gradual_improvement_timelines',
+        'partnership_opportunities',
+        'positive_reinforcement'
+    ],
+    'educational': [
+        'educational_resources',
+        'flexible_compliance_timelines',
+        'community_partnership_promotion',
+        'achievement_celebration'
+    ]
+}
+
+# Transparency file extensions that count as machine-readable; the pattern
+# matches them at the end of the URL path, before any query or fragment
+MACHINE_READABLE_EXTENSIONS = ('.csv', '.json', '.xml')
+_MACHINE_READABLE_URL_RE = re.compile(
+    r'(?:%s)(?:[?#]|$)' % '|'.join(map(re.escape, MACHINE_READABLE_EXTENSIONS)), re.IGNORECASE
+)
+
+# Procedure price columns that count as a distinct price type for completeness
+PRICE_TYPE_COUNTS = ('cash_count', 'negotiated_count', 'medicare_count', 'medicaid_count')
+
+# Procedure statistics of a hospital without any procedures
+NO_PROCEDURE_STATS = {
+    'procedure_count': 0,
+    **{column: 0 for column in PRICE_TYPE_COUNTS},
+    'cash_medicare_count': 0,
+    'reasonable_price_count': 0
+}
+
+# Cash to Medicare price ratios considered plausible by the accuracy score
+REASONABLE_PRICE_RATIO = (0.5, 10)
+
+# Hospital columns the transparency scores are calculated from
+SCORING_HOSPITAL_COLUMNS = (
+    'bed_count', 'transparency_file_url', 'website', 'last_data_update', 'data_quality_score',
+    'medicaid_participant', 'medicare_participant', 'illinois_region', 'hospital_type'
+)
+
+@dataclass
+class HospitalArray:
+    """Scoring inputs of many hospitals as one NumPy array per field, index-aligned
+
+    Text and timestamp columns are decoded once in from_frame, so the batched
+    scores are plain boolean and numeric array arithmetic.
+    """
+    hospital_id: np.ndarray
+    bed_count: np.ndarray  # float, 0 where unknown
+    has_transparency_url: np.ndarray
+    machine_readable_url: np.ndarray
+    has_website: np.ndarray
+    days_since_update: np.ndarray  # float, NaN where never updated
+    data_quality_score: np.ndarray  # float, 0 where unknown
+    medicaid_participant: np.ndarray
+    medicare_participant: np.ndarray
+    rural: np.ndarray
+    community: np.ndarray
+    critical_access: np.ndarray
+    procedure_count: np.ndarray
+    price_types: np.ndarray  # Number of price types (see PRICE_TYPE_COUNTS) present
+    cash_medicare_count: np.ndarray
+    reasonable_price_count: np.ndarray
+    
+    def __len__(self) -> int:
+        return len(self.hospital_id)
+    
+    @classmethod
+    def from_frame(cls, frame: pd.DataFrame, now: datetime) -> 'HospitalArray':
+        """Build the arrays from a scoring frame (see load_scoring_frame), measuring update ages at ``now``"""
+        url = frame['transparency_file_url'].fillna('')
+        # Regions and hospital types repeat across hospitals; as categoricals each
+        # distinct value is searched once and the flags are mapped back by code
+        region = frame['illinois_region'].fillna('').astype('category')
+        hospital_type = frame['hospital_type'].fillna('').astype('category')
+        days_since_update = (pd.Timestamp(now) - pd.to_datetime(frame['last_data_update'], utc=True)).dt.days
+        
+        return cls(
+            hospital_id=frame['hospital_id'].to_numpy(),
+            bed_count=frame['bed_count'].fillna(0).to_numpy(dtype=float),
+            has_transparency_url=url.ne('').to_numpy(dtype=bool),
+            machine_readable_url=url.str.contains(_MACHINE_READABLE_URL_RE).to_numpy(dtype=bool),
+            has_website=frame['website'].fillna('').ne('').to_numpy(dtype=bool),
+            days_since_update=days_since_update.to_numpy(dtype=float),
+            data_quality_score=frame['data_quality_score'].fillna(0).to_numpy(dtype=float),
+            medicaid_participant=frame['medicaid_participant'].fillna(False).to_numpy(dtype=bool),
+            medicare_participant=frame['medicare_participant'].fillna(False).to_numpy(dtype=bool),
+            rural=region.str.contains('rural', case=False, regex=False).to_numpy(dtype=bool),
+            community=region.str.contains('community', case=False, regex=False).to_numpy(dtype=bool),
+            critical_access=hospital_type.str.contains('critical access', case=False, regex=False).to_numpy(dtype=bool),
+            procedure_count=frame['procedure_count'].to_numpy(dtype=np.int64),
+            price_types=sum((frame[column] > 0).to_numpy(dtype=np.int64) for column in PRICE_TYPE_COUNTS),
+            cash_medicare_count=frame['cash_medicare_count'].to_numpy(dtype=float),
+            reasonable_price_count=frame['reasonable_price_count'].to_numpy(dtype=float)
+        )
+
 class HospitalScoringService:
     """Service for fair hospital transparency scoring and recognition"""
     
     def __init__(self):
-        self.scoring_weights = {
-            HospitalSize.SMALL: {
-                'data_accessibility': 0.4,  # Higher weight - easier to achieve
-                'data_completeness': 0.3,   # Lower weight - harder for small hospitals
-                'data_accuracy': 0.2,
-                'update_frequency': 0.1
-            },
-            HospitalSize.MEDIUM: {
-                'data_accessibility': 0.3,
-                'data_completeness': 0.3,
-                'data_accuracy': 0.25,
-                'update_frequency': 0.15
-            },
-            HospitalSize.LARGE: {
-                'data_accessibility': 0.2,
-                'data_completeness': 0.3,
-                'data_accuracy': 0.3,
-                'update_frequency': 0.2
-            }
-        }
+        # Shared with the generated weighted score columns
+        self.scoring_weights = SCORING_WEIGHTS
+        # The same weights as a (sizes x components) matrix, rows in SIZE_INDEX order
+        self.weights_matrix = np.array([
+            [SCORING_WEIGHTS[size][component] for component in SCORE_COMPONENTS]
+            for size in HospitalSize
+        ])
+    
+    def _rank_in_group(self, scores: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Rank scores (1 = highest, ties share a rank, unscored NaNs last) and compute 0-100 percent ranks
+
+        Matches SQL RANK() ordered by score descending and 100 * PERCENT_RANK()
+        ordered ascending, with unscored hospitals at the bottom of both.
+        """
+        scored = ~np.isnan(scores)
+        ordered = np.sort(scores[scored])
+        unscored_count = len(scores) - len(ordered)
+        
+        # Hospitals scoring strictly higher (for ranks) and strictly lower (for percentiles)
+        higher = len(ordered) - np.searchsorted(ordered, scores, side='right')
+        lower = unscored_count + np.searchsorted(ordered, scores, side='left')
+        
+        ranks = np.where(scored, higher + 1, len(ordered) + 1)
+        below = np.where(scored, lower, 0)
+        percentiles = below / (len(scores) - 1) * 100 if len(scores) > 1 else np.zeros(len(scores))
+        return ranks, percentiles
+    
+    def _rank_within_groups(self, groups: np.ndarray, scores: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Rank scores and compute percent ranks within each group, with the same rules as _rank_in_group"""
+        ranks = np.zeros(len(scores), dtype=np.int64)
+        percentiles = np.zeros(len(scores), dtype=np.float64)
+        
+        for group in np.unique(groups):
+            members = np.flatnonzero(groups == group)
+            ranks[members], percentiles[members] = self._rank_in_group(scores[members])
+        
+        return ranks, percentiles
     
     def calculate_hospital_size(self, bed_count: Optional[int]) -> HospitalSize:
         """Determine hospital size category based on bed count"""
         if not bed_count:
             return HospitalSize.SMALL  # Default to small if unknown
         
-        if bed_count < 50:
+        if bed_count < MEDIUM_HOSPITAL_BEDS:
             return HospitalSize.SMALL
-        elif bed_count < 200:
+        elif bed_count < LARGE_HOSPITAL_BEDS:
             return HospitalSize.MEDIUM
         else:
             return HospitalSize.LARGE
     
-    def calculate_transparency_scores(self, hospital: Hospital) -> Dict[str, float]:
-        """Calculate transparency scores for a hospital"""
-        try:
-            # Get hospital size
-            hospital_size = self.calculate_hospital_size(hospital.bed_count)
-            
-            # Calculate individual scores (0-100 scale)
-            scores = {
-                'data_accessibility': self._calculate_accessibility_score(hospital),
-                'data_completeness': self._calculate_completeness_score(hospital),
-                'data_accuracy': self._calculate_accuracy_score(hospital),
-                'update_frequency': self._calculate_frequency_score(hospital)
-            }
-            
-            # Apply size-adjusted weights
-            weights = self.scoring_weights[hospital_size]
-            weighted_scores = {
-                'weighted_accessibility': scores['data_accessibility'] * weights['data_accessibility'],
-                'weighted_completeness': scores['data_completeness'] * weights['data_completeness'],
-                'weighted_accuracy': scores['data_accuracy'] * weights['data_accuracy'],
-                'weighted_frequency': scores['update_frequency'] * weights['update_frequency']
-            }
-            
-            # Calculate overall score
-            overall_score = sum(weighted_scores.values())
-            
-            # Add contextual metrics
-            scores.update(weighted_scores)
-            scores['overall_transparency_score'] = overall_score
-            scores['hospital_size'] = hospital_size
-            scores['cost_per_bed_transparency'] = self._calculate_cost_per_bed(hospital, overall_score)
-            scores['community_impact_score'] = self._calculate_community_impact(hospital)
-            scores['patient_satisfaction_score'] = self._calculate_patient_satisfaction(hospital)
-            
-            return scores
-            
-        except Exception as e:
-            logger.error(f"Error calculating transparency scores for hospital {hospital.id}: {e}")
-            return {}
+    def calculate_sizes_bulk(self, bed_counts: np.ndarray) -> np.ndarray:
+        """Size index (see SIZE_INDEX) of every bed count at once; unknown (NaN) counts are small"""
+        return np.searchsorted(SIZE_BED_THRESHOLDS, np.nan_to_num(bed_counts, nan=0), side='right')
     
-    def _calculate_accessibility_score(self, hospital: Hospital) -> float:
-        """Calculate data accessibility score (0-100)"""
-        score = 0
-        
-        # Check if transparency file URL exists and is accessible
-        if hospital.transparency_file_url:
-            score += 40
-        
-        # Check if data is in machine-readable format
-        if hospital.transparency_file_url and any(ext in hospital.transparency_file_url.lower() 
-                                                for ext in ['.csv', '.json', '.xml']):
-            score += 30
-        
-        # Check if data is easily findable on website
-        if hospital.website:
-            score += 20
-        
-        # Check if data is updated recently
-        if hospital.last_data_update and (datetime.now() - hospital.last_data_update).days < 30:
-            score += 10
-        
-        return min(score, 100)
+    def _procedure_stats_query(self):
+        """Grouped per-hospital procedure counts behind the completeness and accuracy scores"""
+        has_cash_and_medicare = and_(HospitalProcedure.cash_price != 0, HospitalProcedure.medicare_rate != 0)
+        # NULLIF keeps the division safe whatever order the filter conditions run in
+        price_ratio = HospitalProcedure.cash_price / func.nullif(HospitalProcedure.medicare_rate, 0)
+        return select(
+            HospitalProcedure.hospital_id,
+            func.count().label('procedure_count'),
+            # A zero price is treated as missing, like a NULL one
+            func.count().filter(HospitalProcedure.cash_price != 0).label('cash_count'),
+            func.count().filter(HospitalProcedure.negotiated_rate_min != 0).label('negotiated_count'),
+            func.count().filter(HospitalProcedure.medicare_rate != 0).label('medicare_count'),
+            func.count().filter(HospitalProcedure.medicaid_rate != 0).label('medicaid_count'),
+            func.count().filter(has_cash_and_medicare).label('cash_medicare_count'),
+            func.count().filter(
+                has_cash_and_medicare,
+                price_ratio.between(*REASONABLE_PRICE_RATIO)
+            ).label('reasonable_price_count')
+        ).group_by(HospitalProcedure.hospital_id)
     
-    def _calculate_completeness_score(self, hospital: Hospital) -> float:
-        """Calculate data completeness score (0-100)"""
-        score = 0
-        
-        # Check if hospital has procedure data
-        if hospital.procedures:
-            procedure_count = len(hospital.procedures)
-            if procedure_count > 1000:
-                score += 40
-            elif procedure_count > 500:
-                score += 30
-            elif procedure_count > 100:
-                score += 20
-            else:
-                score += 10
-        
-        # Check if data includes multiple price types
-        if hospital.procedures:
-            price_types = set()
-            for proc in hospital.procedures:
-                if proc.cash_price:
-                    price_types.add('cash')
-                if proc.negotiated_rate_min:
-                    price_types.add('negotiated')
-                if proc.medicare_rate:
-                    price_types.add('medicare')
-                if proc.medicaid_rate:
-                    price_types.add('medicaid')
-            
-            score += min(len(price_types) * 15, 60)
+    def load_scoring_frame(self, db: Session) -> pd.DataFrame:
+        """Load every hospital's scoring inputs and procedure statistics, one row per hospital, in a single query"""
+        stats = self._procedure_stats_query().subquery()
+        stmt = select(
+            Hospital.id.label('hospital_id'),
+            *(getattr(Hospital, column) for column in SCORING_HOSPITAL_COLUMNS),
+            # Hospitals without procedures have no stats row; their counts are zero
+            *(func.coalesce(stats.c[column], 0).label(column) for column in NO_PROCEDURE_STATS)
+        ).outerjoin(stats, stats.c.hospital_id == Hospital.id)
         
-        return min(score, 100)
+        return pd.read_sql(stmt, db.connection())
     
-    def _calculate_accuracy_score(self, hospital: Hospital) -> float:
-        """Calculate data accuracy score (0-100)"""
-        score = 0
-        
-        # Check data quality score
-        if hospital.data_quality_score:
-            score += hospital.data_quality_score * 0.6
-        
-        # Check if data is consistent
-        if hospital.procedures:
-            # Check for reasonable price ranges
-            reasonable_prices = 0
-            total_prices = 0
-            
-            for proc in hospital.procedures:
-                if proc.cash_price and proc.medicare_rate:
-                    if 0.5 <= proc.cash_price / proc.medicare_rate <= 10:  # Reasonable range
-                        reasonable_prices += 1
-                    total_prices += 1
-            
-            if total_prices > 0:
-                score += (reasonable_prices / total_prices) * 40
-        
-        return min(score, 100)
+    def _accessibility_scores(self, hospitals: HospitalArray) -> np.ndarray:
+        """Data accessibility score (0-100) of every hospital"""
+        return np.minimum(
+            40 * hospitals.has_transparency_url
+            + 30 * hospitals.machine_readable_url
+            + 20 * hospitals.has_website
+            + 10 * (hospitals.days_since_update < 30),
+            100
+        )
     
-    def _calculate_frequency_score(self, hospital: Hospital) -> float:
-        """Calculate update frequency score (0-100)"""
-        if not hospital.last_data_update:
-            return 0
-        
-        days_since_update = (datetime.now() - hospital.last_data_update).days
-        
-        if days_since_update <= 7:
-            return 100
-        elif days_since_update <= 30:
-            return 80
-        elif days_since_update <= 90:
-            return 60
-        elif days_since_update <= 180:
-            return 40
-        else:
-            return 20
+    def _completeness_scores(self, hospitals: HospitalArray) -> np.ndarray:
+        """Data completeness score (0-100) of every hospital"""
+        procedure_count = hospitals.procedure_count
+        return np.minimum(
+            np.select(
+                [procedure_count > 1000, procedure_count > 500, procedure_count > 100, procedure_count > 0],
+                [40, 30, 20, 10],
+                0
+            ) + np.where(procedure_count > 0, np.minimum(hospitals.price_types * 15, 60), 0),
+            100
+        )
     
-    def _calculate_cost_per_bed(self, hospital: Hospital, transparency_score: float) -> float:
-        """Calculate cost per bed for transparency compliance"""
-        if not hospital.bed_count or hospital.bed_count == 0:
-            return 0
-        
-        # Estimate transparency compliance cost (simplified)
-        estimated_cost = transparency_score * 100  # $100 per point
-        return estimated_cost / hospital.bed_count
+    def _accuracy_scores(self, hospitals: HospitalArray) -> np.ndarray:
+        """Data accuracy score (0-100) of every hospital"""
+        reasonable_share = np.divide(
+            hospitals.reasonable_price_count, hospitals.cash_medicare_count,
+            out=np.zeros(len(hospitals)), where=hospitals.cash_medicare_count > 0
+        )
+        return np.minimum(hospitals.data_quality_score * 0.6 + reasonable_share * 40, 100)
     
-    def _calculate_community_impact(self, hospital: Hospital) -> float:
-        """Calculate community impact score (0-100)"""
-        score = 0
-        
-        # Check if hospital participates in community programs
-        if hospital.medicaid_participant:
-            score += 25
-        if hospital.medicare_participant:
-            score += 25
-        
-        # Check if hospital is in rural area
-        if hospital.illinois_region and 'rural' in hospital.illinois_region.lower():
-            score += 20
-        
-        # Check if hospital is critical access
-        if hospital.hospital_type and 'critical access' in hospital.hospital_type.lower():
-            score += 30
-        
-        return min(score, 100)
+    def _frequency_scores(self, hospitals: HospitalArray) -> np.ndarray:
+        """Update frequency score (0-100) of every hospital"""
+        days_since_update = hospitals.days_since_update
+        return np.select(
+            [np.isnan(days_since_update), days_since_update <= 7, days_since_update <= 30,
+             days_since_update <= 90, days_since_update <= 180],
+            [0, 100, 80, 60, 40],
+            20
+        )
+    
+    def _community_impact_scores(self, hospitals: HospitalArray) -> np.ndarray:
+        """Community impact score (0-100) of every hospital"""
+        return np.minimum(
+            25 * hospitals.medicaid_participant
+            + 25 * hospitals.medicare_participant
+            + 20 * hospitals.rural
+            + 30 * hospitals.critical_access,
+            100
+        )
+    
+    def _patient_satisfaction_scores(self, hospitals: HospitalArray) -> np.ndarray:
+        """Patient satisfaction score (0-100) of every hospital"""
+        beds = hospitals.bed_count
+        return np.minimum(
+            50
+            + np.select([(beds != 0) & (beds < 50), (beds != 0) & (beds < 200)], [20, 10], 0)
+            + 15 * hospitals.community,
+            100
+        )
     
-    def _calculate_patient_satisfaction(self, hospital: Hospital) -> float:
-        """Calculate patient satisfaction score (0-100)"""
-        # This would typically come from patient satisfaction surveys
-        # For now, use a simplified calculation based on hospital characteristics
+    def score_hospitals(self, frame: pd.DataFrame, now: datetime) -> pd.DataFrame:
+        """Calculate transparency scores for every hospital of a scoring frame at once (see load_scoring_frame)
+
+        Score a single hospital by passing a one-row frame.
+
+        Update ages are measured at ``now`` (timezone-aware).
+        Returns one row per hospital with the transparency score columns.
+        """
+        hospitals = HospitalArray.from_frame(frame, now)
+        size_index = self.calculate_sizes_bulk(hospitals.bed_count)
         
-        score = 50  # Base score
+        scores = pd.DataFrame({'hospital_id': hospitals.hospital_id, 'hospital_size': SIZE_VALUES[size_index]})
+        scores['data_accessibility_score'] = self._accessibility_scores(hospitals)
+        scores['data_completeness_score'] = self._completeness_scores(hospitals)
+        scores['data_accuracy_score'] = self._accuracy_scores(hospitals)
+        scores['update_frequency_score'] = self._frequency_scores(hospitals)
         
-        # Adjust based on hospital size (smaller hospitals often have higher satisfaction)
-        if hospital.bed_count:
-            if hospital.bed_count < 50:
-                score += 20
-            elif hospital.bed_count < 200:
-                score += 10
+        # Same size-adjusted weighting the database applies in the generated columns:
+        # each hospital's component scores dotted with its size's weight row
+        components = scores[[f'{component}_score' for component in SCORE_COMPONENTS]].to_numpy(dtype=float)
+        overall = np.einsum('ij,ij->i', components, self.weights_matrix[size_index])
+        scores['overall_transparency_score'] = overall
         
-        # Adjust based on community focus
-        if hospital.illinois_region and 'community' in hospital.illinois_region.lower():
-            score += 15
+        scores['cost_per_bed_transparency'] = np.divide(
+            overall * 100, hospitals.bed_count, out=np.zeros(len(hospitals)), where=hospitals.bed_count != 0
+        )
+        scores['community_impact_score'] = self._community_impact_scores(hospitals)
+        scores['patient_satisfaction_score'] = self._patient_satisfaction_scores(hospitals)
         
-        return min(score, 100)
+        return scores
+    
+    def _stream_hospital_sizes(self, db: Session) -> Iterator[Row]:
+        """Stream (id, bed_count) rows of every hospital in batches, without loading Hospital objects"""
+        return db.query(Hospital.id, Hospital.bed_count).yield_per(HOSPITAL_STREAM_BATCH_SIZE)
     
-    def create_peer_groups(self, db: Session) -> Dict[str, List[Hospital]]:
-        """Create peer groups for fair hospital comparisons"""
+    def group_hospitals_by_size(self, db: Session) -> Dict[HospitalSize, List[Row]]:
+        """Stream every hospital once and group them by size, sizing each hospital once"""
+        hospitals_by_size = {size: [] for size in HospitalSize}
+        for hospital in self._stream_hospital_sizes(db):
+            hospitals_by_size[self.calculate_hospital_size(hospital.bed_count)].append(hospital)
+        return hospitals_by_size
+    
+    def create_peer_groups(self, db: Session, hospitals_by_size: Optional[Dict[HospitalSize, List[Row]]] = None) -> Dict[str, List[Row]]:
+        """Create peer groups for fair hospital comparisons (hospitals_by_size from group_hospitals_by_size)"""
         try:
-            # Get all hospitals
-            hospitals = db.query(Hospital).all()
-            
-            # Group by size
-            peer_groups = {
-                'Small Community Hospitals': [],
-                'Medium Regional Hospitals': [],
-                'Large Hospital Systems': []
-            }
+            if hospitals_by_size is None:
+                hospitals_by_size = self.group_hospitals_by_size(db)
             
-            for hospital in hospitals:
-                size = self.calculate_hospital_size(hospital.bed_count)
-                
-                if size == HospitalSize.SMALL:
-                    peer_groups['Small Community Hospitals'].append(hospital)
-                elif size == HospitalSize.MEDIUM:
-                    peer_groups['Medium Regional Hospitals'].append(hospital)
-                else:
-                    peer_groups['Large Hospital Systems'].append(hospital)
+            # Peer groups are the size groups
+            peer_groups = {PEER_GROUP_NAMES[size]: hospitals for size, hospitals in hospitals_by_size.items()}
             
             # Calculate peer group metrics
             for group_name, group_hospitals in peer_groups.items():
@@ -275,56 +369,69 @@ class HospitalScoringService:
             logger.error(f"Error creating peer groups: {e}")
             return {}
     
-    def _calculate_peer_group_metrics(self, db: Session, group_name: str, hospitals: List[Hospital]):
+    def _calculate_peer_group_metrics(self, db: Session, group_name: str, hospitals: List[Row]):
         """Calculate metrics for a peer group"""
         try:
-            transparency_scores = []
-            bed_counts = []
-            community_impacts = []
-            cost_effectiveness = []
+            # Latest transparency score of every hospital in the group, in one query
+            latest_scores = db.query(
+                HospitalTransparencyScore.hospital_id,
+                HospitalTransparencyScore.overall_transparency_score,
+                HospitalTransparencyScore.community_impact_score,
+                HospitalTransparencyScore.cost_per_bed_transparency
+            ).filter(
+                HospitalTransparencyScore.hospital_id.in_([hospital.id for hospital in hospitals])
+            ).distinct(
+                HospitalTransparencyScore.hospital_id
+            ).order_by(
+                HospitalTransparencyScore.hospital_id, HospitalTransparencyScore.id.desc()
+            ).all()
             
-            for hospital in hospitals:
-                # Get or calculate transparency score
-                score = db.query(HospitalTransparencyScore).filter(
-                    HospitalTransparencyScore.hospital_id == hospital.id
-                ).first()
-                
-                if score:
-                    transparency_scores.append(score.overall_transparency_score)
-                    community_impacts.append(score.community_impact_score)
-                    cost_effectiveness.append(score.cost_per_bed_transparency)
-                
-                if hospital.bed_count:
-                    bed_counts.append(hospital.bed_count)
+            bed_counts = [hospital.bed_count for hospital in hospitals if hospital.bed_count]
             
-            if transparency_scores:
+            if latest_scores:
+                # None becomes NaN, so missing contextual metrics drop out of the means
+                scored_ids, transparency_scores, community_impacts, cost_effectiveness = (
+                    np.array(column, dtype=float) for column in zip(*latest_scores)
+                )
+                
                 # Calculate group statistics
                 avg_transparency = np.mean(transparency_scores)
                 median_transparency = np.median(transparency_scores)
                 std_transparency = np.std(transparency_scores)
                 
                 avg_bed_count = np.mean(bed_counts) if bed_counts else 0
-                avg_community_impact = np.mean(community_impacts) if community_impacts else 0
-                avg_cost_effectiveness = np.mean(cost_effectiveness) if cost_effectiveness else 0
+                avg_community_impact = np.nanmean(community_impacts) if np.isfinite(community_impacts).any() else 0
+                avg_cost_effectiveness = np.nanmean(cost_effectiveness) if np.isfinite(cost_effectiveness).any() else 0
                 
-                # Update peer group records for each hospital
-                for i, hospital in enumerate(hospitals):
-                    peer_group = HospitalPeerGroup(
-                        hospital_id=hospital.id,
-                        peer_group_name=group_name,
-                        peer_group_size=len(hospitals),
-                        group_avg_transparency_score=avg_transparency,
-                        group_median_transparency_score=median_transparency,
-                        group_std_transparency_score=std_transparency,
-                        rank_in_group=i + 1,  # Will be updated with actual ranking
-                        percentile_in_group=0,  # Will be calculated
-                        group_avg_bed_count=avg_bed_count,
-                        group_avg_community_impact=avg_community_impact,
-                        group_avg_cost_effectiveness=avg_cost_effectiveness
-                    )
-                    
-                    db.add(peer_group)
+                # Every hospital's latest score in group order (NaN if never scored), ranked at once
+                score_by_id = dict(zip(scored_ids.tolist(), transparency_scores.tolist()))
+                group_scores = np.array([score_by_id.get(hospital.id, np.nan) for hospital in hospitals])
+                ranks, percentiles = self._rank_in_group(group_scores)
+                vs_peers = group_scores - avg_transparency
                 
+                # Insert peer group records for each hospital as plain rows in one executemany
+                group_metrics = {
+                    'peer_group_name': group_name,
+                    'peer_group_size': len(hospitals),
+                    'group_avg_transparency_score': avg_transparency,
+                    'group_median_transparency_score': median_transparency,
+                    'group_std_transparency_score': std_transparency,
+                    'group_avg_bed_count': avg_bed_count,
+                    'group_avg_community_impact': avg_community_impact,
+                    'group_avg_cost_effectiveness': avg_cost_effectiveness
+                }
+                db.execute(insert(HospitalPeerGroup), [
+                    {
+                        'hospital_id': hospital.id,
+                        **group_metrics,
+                        'rank_in_group': rank,
+                        'percentile_in_group': percentile,
+                        'transparency_vs_peers': None if np.isnan(difference) else difference
+                    }
+                    for hospital, rank, percentile, difference in zip(
+                        hospitals, ranks.tolist(), percentiles.tolist(), vs_peers.tolist()
+                    )
+                ])
                 db.commit()
                 logger.info(f"Created peer group metrics for {group_name} with {len(hospitals)} hospitals")
                 
@@ -332,10 +439,11 @@ class HospitalScoringService:
             logger.error(f"Error calculating peer group metrics for {group_name}: {e}")
             db.rollback()
     
-    def assign_accountability_tiers(self, db: Session) -> Dict[str, List[Hospital]]:
-        """Assign accountability tiers based on hospital size and characteristics"""
+    def assign_accountability_tiers(self, db: Session, hospitals_by_size: Optional[Dict[HospitalSize, List[Row]]] = None) -> Dict[str, List[Row]]:
+        """Assign accountability tiers based on hospital size and characteristics (hospitals_by_size from group_hospitals_by_size)"""
         try:
-            hospitals = db.query(Hospital).all()
+            if hospitals_by_size is None:
+                hospitals_by_size = self.group_hospitals_by_size(db)
             
             tiers = {
                 'strict': [],      # Large hospitals - strict enforcement
@@ -343,42 +451,28 @@ class HospitalScoringService:
                 'educational': []  # Small hospitals - educational support
             }
             
-            for hospital in hospitals:
-                size = self.calculate_hospital_size(hospital.bed_count)
-                
-                if size == HospitalSize.LARGE:
-                    tier = 'strict'
-                    enforcement_level = 'high'
-                    compliance_timeline = 30
-                    support_level = 'minimal'
-                elif size == HospitalSize.MEDIUM:
-                    tier = 'supportive'
-                    enforcement_level = 'medium'
-                    compliance_timeline = 60
-                    support_level = 'partial'
-                else:
-                    tier = 'educational'
-                    enforcement_level = 'low'
-                    compliance_timeline = 90
-                    support_level = 'full'
+            tier_rows = []
+            for size, hospitals in hospitals_by_size.items():
+                tier, enforcement_level, compliance_timeline, support_level = ACCOUNTABILITY_BY_SIZE[size]
+                tiers[tier].extend(hospitals)
                 
-                # Create accountability tier record
-                accountability_tier = HospitalAccountabilityTier(
-                    hospital_id=hospital.id,
-                    tier=tier,
-                    enforcement_level=enforcement_level,
-                    compliance_timeline_days=compliance_timeline,
-                    support_level=support_level,
-                    enforcement_actions=self._get_enforcement_actions(tier),
-                    tier_reason=f"Assigned based on hospital size ({size.value}) and resources",
-                    size_factor=True,
-                    resource_factor=True,
-                    community_factor=size == HospitalSize.SMALL
-                )
-                
-                db.add(accountability_tier)
-                tiers[tier].append(hospital)
+                for hospital in hospitals:
+                    # Accountability tier record, inserted with the others in one executemany
+                    tier_rows.append({
+                        'hospital_id': hospital.id,
+                        'tier': tier,
+                        'enforcement_level': enforcement_level,
+                        'compliance_timeline_days': compliance_timeline,
+                        'support_level': support_level,
+                        'enforcement_actions': self._get_enforcement_actions(tier),
+                        'tier_reason': f"Assigned based on hospital size ({size.value}) and resources",
+                        'size_factor': True,
+                        'resource_factor': True,
+                        'community_factor': size == HospitalSize.SMALL
+                    })
             
+            if tier_rows:
+                db.execute(insert(HospitalAccountabilityTier), tier_rows)
             db.commit()
             logger.info(f"Assigned accountability tiers: {len(tiers['strict'])} strict, {len(tiers['supportive'])} supportive, {len(tiers['educational'])} educational")
             
@@ -389,45 +483,36 @@ class HospitalScoringService:
             db.rollback()
             return {}
     
-    def _get_enforcement_actions(self, tier: str) -> str:
+    def _get_enforcement_actions(self, tier: str) -> List[str]:
         """Get available enforcement actions for a tier"""
-        actions = {
-            'strict': [
-                'public_compliance_monitoring',
-                'regulatory_complaint_filing',
-                'media_pressure_campaigns',
-                'legal_action_support'
-            ],
-            'supportive': [
-                'compliance_assistance',
-                'gradual_improvement_timelines',
-                'partnership_opportunities',
-                'positive_reinforcement'
-            ],
-            'educational': [
-                'educational_resources',
-                'flexible_compliance_timelines',
-                'community_partnership_promotion',
-                'achievement_celebration'
-            ]
-        }
-        
-        import json
-        return json.dumps(actions.get(tier, []))
+        return ENFORCEMENT_ACTIONS.get(tier, [])
     
     def identify_excellence_candidates(self, db: Session) -> List[Dict]:
         """Identify hospitals for excellence recognition"""
         try:
             excellence_candidates = []
-            
-            # Get hospitals with high transparency scores
-            high_scoring_hospitals = db.query(HospitalTransparencyScore).filter(
-                HospitalTransparencyScore.overall_transparency_score >= 80
+            recognition_rows = []
+            
+            # Get hospitals whose latest transparency score is high, projecting only the
+            # columns used; the size recorded with the score avoids loading the hospital
+            latest_scores = select(
+                HospitalTransparencyScore.hospital_id,
+                HospitalTransparencyScore.hospital_size,
+                HospitalTransparencyScore.overall_transparency_score,
+                HospitalTransparencyScore.community_impact_score,
+                HospitalTransparencyScore.cost_per_bed_transparency,
+                HospitalTransparencyScore.patient_satisfaction_score
+            ).distinct(
+                HospitalTransparencyScore.hospital_id
+            ).order_by(
+                HospitalTransparencyScore.hospital_id, HospitalTransparencyScore.id.desc()
+            ).subquery()
+            high_scoring_hospitals = db.execute(
+                select(latest_scores).where(latest_scores.c.overall_transparency_score >= 80)
             ).all()
             
             for score in high_scoring_hospitals:
-                hospital = score.hospital
-                size = self.calculate_hospital_size(hospital.bed_count)
+                size = HospitalSize(score.hospital_size)
                 
                 # Determine excellence category
                 if size == HospitalSize.SMALL:
@@ -444,35 +529,41 @@ class HospitalScoringService:
                     category = TransparencyCategory.CRITICAL_ACCESS_EXCELLENCE
                     title = "Large Hospital Transparency Excellence"
                 
-                # Create excellence recognition
-                recognition = HospitalExcellenceRecognition(
-                    hospital_id=hospital.id,
-                    category=category,
-                    title=title,
-                    description=f"Recognized for outstanding transparency practices and community impact",
-                    transparency_score=score.overall_transparency_score,
-                    community_impact_score=score.community_impact_score,
-                    cost_effectiveness_score=score.cost_per_bed_transparency,
-                    patient_satisfaction_score=score.patient_satisfaction_score,
-                    is_featured=True,
-                    is_spotlight=score.overall_transparency_score >= 90,
-                    achievements=json.dumps([
+                # Formatted once; the achievements list and the cost details both show it
+                cost_per_bed = f"{score.cost_per_bed_transparency:.1f}"
+                
+                # Excellence recognition record, inserted with the others in one executemany
+                # (achievements is encoded by the engine's orjson JSON serializer)
+                recognition = {
+                    'hospital_id': score.hospital_id,
+                    'category': category.value,
+                    'title': title,
+                    'description': f"Recognized for outstanding transparency practices and community impact",
+                    'transparency_score': score.overall_transparency_score,
+                    'community_impact_score': score.community_impact_score,
+                    'cost_effectiveness_score': score.cost_per_bed_transparency,
+                    'patient_satisfaction_score': score.patient_satisfaction_score,
+                    'is_featured': True,
+                    'is_spotlight': score.overall_transparency_score >= 90,
+                    'achievements': [
                         f"Transparency Score: {score.overall_transparency_score:.1f}/100",
                         f"Community Impact: {score.community_impact_score:.1f}/100",
-                        f"Cost Effectiveness: {score.cost_per_bed_transparency:.1f} per bed"
-                    ]),
-                    community_impact_details=f"Demonstrates exceptional commitment to community healthcare and transparency",
-                    cost_optimization_details=f"Achieves high transparency compliance at {score.cost_per_bed_transparency:.1f} cost per bed"
-                )
+                        f"Cost Effectiveness: {cost_per_bed} per bed"
+                    ],
+                    'community_impact_details': f"Demonstrates exceptional commitment to community healthcare and transparency",
+                    'cost_optimization_details': f"Achieves high transparency compliance at {cost_per_bed} cost per bed"
+                }
                 
-                db.add(recognition)
+                recognition_rows.append(recognition)
                 excellence_candidates.append({
-                    'hospital': hospital,
+                    'hospital_id': score.hospital_id,
                     'recognition': recognition,
                     'category': category,
                     'title': title
                 })
             
+            if recognition_rows:
+                db.execute(insert(HospitalExcellenceRecognition), recognition_rows)
             db.commit()
             logger.info(f"Identified {len(excellence_candidates)} excellence candidates")
             
@@ -488,58 +579,54 @@ class HospitalScoringService:
         try:
             logger.info("Starting complete hospital scoring analysis...")
             
-            # Get all hospitals
-            hospitals = db.query(Hospital).all()
+            # Score every hospital from one joined query with column expressions
+            now = datetime.now(timezone.utc)
+            scores = self.score_hospitals(self.load_scoring_frame(db), now)
+            
+            # Peer groups are by size, so rank every hospital within its size group up front
+            peer_ranks, peer_percentiles = self._rank_within_groups(
+                scores['hospital_size'].to_numpy(),
+                scores['overall_transparency_score'].to_numpy(dtype=float)
+            )
+            scores['peer_group_rank'] = peer_ranks
+            scores['peer_group_percentile'] = peer_percentiles
+            scores['scoring_methodology'] = "v1.0"
+            
+            # Save transparency scores as plain rows, so they never enter the identity map;
+            # the weighted and overall columns are generated by the database
+            score_rows = scores.drop(columns='overall_transparency_score').to_dict('records')
+            
+            for start in range(0, len(score_rows), SCORING_WRITE_WINDOW):
+                db.execute(insert(HospitalTransparencyScore), score_rows[start:start + SCORING_WRITE_WINDOW])
+                db.commit()
             
-            # Calculate transparency scores
-            scoring_results = []
-            for hospital in hospitals:
-                scores = self.calculate_transparency_scores(hospital)
-                if scores:
-                    # Save transparency score
-                    transparency_score = HospitalTransparencyScore(
-                        hospital_id=hospital.id,
-                        hospital_size=scores['hospital_size'],
-                        data_accessibility_score=scores['data_accessibility'],
-                        data_completeness_score=scores['data_completeness'],
-                        data_accuracy_score=scores['data_accuracy'],
-                        update_frequency_score=scores['update_frequency'],
-                        weighted_accessibility=scores['weighted_accessibility'],
-                        weighted_completeness=scores['weighted_completeness'],
-                        weighted_accuracy=scores['weighted_accuracy'],
-                        weighted_frequency=scores['weighted_frequency'],
-                        overall_transparency_score=scores['overall_transparency_score'],
-                        cost_per_bed_transparency=scores['cost_per_bed_transparency'],
-                        community_impact_score=scores['community_impact_score'],
-                        patient_satisfaction_score=scores['patient_satisfaction_score'],
-                        scoring_methodology="v1.0"
-                    )
-                    
-                    db.add(transparency_score)
-                    scoring_results.append({
-                        'hospital': hospital,
-                        'scores': scores
-                    })
+            # Each phase reloads what it needs, so release the previous phase's
+            # objects instead of letting the identity map grow across the run
+            db.expunge_all()
             
-            db.commit()
+            # One hospital scan, sized once, feeds both peer groups and accountability tiers
+            hospitals_by_size = self.group_hospitals_by_size(db)
             
             # Create peer groups
-            peer_groups = self.create_peer_groups(db)
+            peer_groups = self.create_peer_groups(db, hospitals_by_size)
+            db.expunge_all()
             
             # Assign accountability tiers
-            accountability_tiers = self.assign_accountability_tiers(db)
+            accountability_tiers = self.assign_accountability_tiers(db, hospitals_by_size)
+            db.expunge_all()
             
             # Identify excellence candidates
             excellence_candidates = self.identify_excellence_candidates(db)
+            db.expunge_all()
             
             # Calculate summary statistics
             summary = {
-                'total_hospitals': len(hospitals),
-                'scoring_results': len(scoring_results),
+                'total_hospitals': len(scores),
+                'scoring_results': len(score_rows),
                 'peer_groups': {name: len(hospitals) for name, hospitals in peer_groups.items()},
                 'accountability_tiers': {tier: len(hospitals) for tier, hospitals in accountability_tiers.items()},
                 'excellence_candidates': len(excellence_candidates),
-                'analysis_date': datetime.now()
+                'analysis_date': now
             }
             
             logger.info(f"Complete scoring analysis finished: {summary}")
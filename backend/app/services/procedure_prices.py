@@ -0,0 +1,36 @@
+from typing import Iterable, Optional, Sequence, Tuple
+import numpy as np
+
+# Every price/fee column of HospitalProcedure, in model order
+PROC_PRICE_FIELDS = (
+    'cash_price',
+    'negotiated_rate_min',
+    'negotiated_rate_max',
+    'negotiated_rate_median',
+    'medicare_rate',
+    'medicaid_rate',
+    'facility_fee',
+    'professional_fee',
+    'anesthesia_fee',
+)
+
+# One fixed-size record per procedure row; missing prices are NaN
+PROC_PRICE_DTYPE = np.dtype([(name, 'f8') for name in PROC_PRICE_FIELDS])
+
+def price_records(rows: Sequence, fields: Iterable[str] = PROC_PRICE_FIELDS) -> np.ndarray:
+    """Pack the given price columns of query rows into a PROC_PRICE_DTYPE array
+
+    NULL prices become NaN; columns not in ``fields`` are left as NaN.
+    """
+    records = np.full(len(rows), np.nan, dtype=PROC_PRICE_DTYPE)
+    for name in fields:
+        records[name] = np.array([getattr(row, name) for row in rows], dtype=float)
+    return records
+
+def price_range(records: np.ndarray, field: str = 'cash_price') -> Tuple[Optional[float], Optional[float], Optional[float]]:
+    """Get (min, median, max) of one price column, ignoring missing prices"""
+    values = records[field]
+    values = values[~np.isnan(values)]
+    if not len(values):
+        return None, None, None
+    return float(values.min()), float(np.median(values)), float(values.max())
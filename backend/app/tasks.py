@@ -0,0 +1,112 @@
+import asyncio
+from decimal import Decimal
+from typing import Dict
+
+from celery.result import AsyncResult
+import structlog
+
+from app.celery_app import celery_app
+from app.core.cache import close_redis, invalidate
+
+logger = structlog.get_logger()
+
+# The API process imports this module only to enqueue tasks and read job status,
+# so the scraper and scoring services (pandas, numpy, aiohttp) are imported inside
+# the task bodies and load in the worker only
+
+# Cached read endpoints whose data is rebuilt by the scoring analysis
+SCORING_CACHE_PREFIXES = (
+    "excellence-featured",
+    "excellence-spotlight",
+    "excellence-categories",
+    "peer-groups",
+    "peer-group-hospital",
+)
+
+# Cached read endpoints built from scraped procedures
+PROCEDURE_CACHE_PREFIXES = (
+    "procedure-search",
+    "illinois-overview",
+)
+
+async def _invalidate(*prefixes: str):
+    """Invalidate cache prefixes from a worker, releasing the loop-bound client"""
+    try:
+        await invalidate(*prefixes)
+    finally:
+        await close_redis()
+
+async def _scrape_hospitals() -> Dict:
+    """Scrape all Illinois hospitals, save the procedures found and summarize the results"""
+    from app.core.database import SessionLocal
+    from app.services.data_collection.illinois_hospital_scraper import (
+        IllinoisHospitalScraper, save_scraped_procedures
+    )
+    
+    async with IllinoisHospitalScraper() as scraper:
+        results = await scraper.scrape_all_hospitals()
+    
+    total_procedures = sum(len(procedures) for procedures in results.values())
+    
+    db = SessionLocal()
+    try:
+        saved_procedures = save_scraped_procedures(db, results)
+    finally:
+        db.close()
+    
+    if saved_procedures:
+        await _invalidate(*PROCEDURE_CACHE_PREFIXES)
+    
+    return {
+        'message': f'Data scraping completed. Found {total_procedures} procedures.',
+        'hospitals_processed': len(results),
+        'total_procedures': total_procedures,
+        'saved_procedures': saved_procedures
+    }
+
+@celery_app.task(name="scoring.run_analysis")
+def run_scoring_analysis_task() -> Dict:
+    """Run the complete hospital scoring analysis and refresh cached results
+
+    The result also carries the claim denial and payment statistics for the same run.
+    """
+    from app.core.database import SessionLocal
+    from app.services.claims_analysis import calculate_claim_statistics
+    from app.services.hospital_scoring import run_hospital_scoring_analysis
+    
+    logger.info("Starting hospital scoring analysis...")
+    results = run_hospital_scoring_analysis()
+    asyncio.run(_invalidate(*SCORING_CACHE_PREFIXES))
+    
+    db = SessionLocal()
+    try:
+        claim_statistics = calculate_claim_statistics(db)
+    finally:
+        db.close()
+    
+    # Celery results are JSON, so the Decimal dollar amounts are reported as floats
+    results['claim_statistics'] = {
+        key: float(value) if isinstance(value, Decimal) else value
+        for key, value in claim_statistics.items()
+    }
+    return results
+
+@celery_app.task(name="hospitals.scrape_data")
+def scrape_hospital_data_task() -> Dict:
+    """Scrape pricing data for Illinois hospitals"""
+    logger.info("Starting hospital data scraping...")
+    summary = asyncio.run(_scrape_hospitals())
+    logger.info(f"Data scraping completed. Total procedures found: {summary['total_procedures']}")
+    return summary
+
+def get_job_status(job_id: str) -> Dict:
+    """Get the state (and result or error, once finished) of a background job"""
+    result = AsyncResult(job_id, app=celery_app)
+    status = {'job_id': job_id, 'status': result.status.lower()}
+    
+    if result.successful():
+        status['result'] = result.result
+    elif result.failed():
+        status['error'] = str(result.result)
+    
+    return status
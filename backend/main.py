@@ -1,11 +1,15 @@
 from fastapi import FastAPI, Depends
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
+import sys
 import uvicorn
 import structlog
 
 from app.core.config import settings
-from app.core.database import engine
+from app.core.database import dispose_engines
+from app.core.cache import close_redis
+from app.core.responses import ORJSONResponse
 from app.api.v1.api import api_router
 from app.core.logging import setup_logging
 
@@ -21,20 +25,29 @@ app = FastAPI(
     openapi_url="/api/openapi.json",
     docs_url="/api/docs",
     redoc_url="/api/redoc",
+    default_response_class=ORJSONResponse,
 )
 
 # Add middleware
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=settings.ALLOWED_HOSTS,
+    allow_origins=list(settings.ALLOWED_HOSTS),
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_methods=list(settings.CORS_ALLOW_METHODS),
+    allow_headers=list(settings.CORS_ALLOW_HEADERS),
 )
 
+# A wildcard accepts every Host header, so the middleware would only add a pass-through layer
+if "*" not in settings.ALLOWED_HOSTS:
+    app.add_middleware(
+        TrustedHostMiddleware,
+        allowed_hosts=list(settings.ALLOWED_HOSTS)
+    )
+
+# Compress responses for clients that accept gzip; tiny bodies are sent as-is
 app.add_middleware(
-    TrustedHostMiddleware,
-    allowed_hosts=settings.ALLOWED_HOSTS
+    GZipMiddleware,
+    minimum_size=settings.GZIP_MINIMUM_SIZE
 )
 
 # Include API router
@@ -48,7 +61,8 @@ async def startup_event():
 @app.on_event("shutdown")
 async def shutdown_event():
     logger.info("Shutting down Melena.ai Healthcare API")
-    # Additional cleanup tasks can go here
+    await close_redis()
+    await dispose_engines()
 
 @app.get("/")
 async def root():
@@ -63,10 +77,16 @@ async def health_check():
     return {"status": "healthy"}
 
 if __name__ == "__main__":
+    # The file watcher only runs in development; it cannot be combined with workers
+    reload = settings.ENVIRONMENT == "development"
     uvicorn.run(
         "main:app",
-        host="0.0.0.0",
-        port=8000,
-        reload=True,
+        host=settings.HOST,
+        port=settings.PORT,
+        reload=reload,
+        workers=None if reload else settings.WEB_CONCURRENCY,
+        # uvloop comes with uvicorn[standard] but has no Windows build
+        loop="asyncio" if sys.platform == "win32" else "uvloop",
+        http="httptools",
         log_level="info"
     )
@@ -0,0 +1,36 @@
+import fnmatch
+
+import pytest
+
+from app.core import cache
+
+class InMemoryRedis:
+    """The subset of the redis.asyncio client the cache uses, backed by a dict"""
+
+    def __init__(self):
+        self.store = {}
+
+    async def get(self, key):
+        return self.store.get(key)
+
+    async def setex(self, key, ttl, value):
+        self.store[key] = value.encode() if isinstance(value, str) else value
+
+    async def delete(self, *keys):
+        for key in keys:
+            self.store.pop(key, None)
+
+    async def scan_iter(self, match):
+        for key in list(self.store):
+            if fnmatch.fnmatch(key, match):
+                yield key
+
+    async def close(self):
+        pass
+
+@pytest.fixture(autouse=True)
+def redis_client(monkeypatch):
+    """Serve the response cache from memory so tests never reach a Redis server"""
+    client = InMemoryRedis()
+    monkeypatch.setattr(cache, "_client", client)
+    return client
@@ -0,0 +1,60 @@
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pandas as pd
+import pytest
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+
+from app.api.v1.endpoints import analytics
+from app.ml.price_analysis import load_procedure_frame
+from app.schemas.analytics import ProcedurePriceQuery
+
+async def test_price_predictions_use_the_shared_analyzer():
+    analyzer = MagicMock()
+    analyzer.predict_procedure_prices.return_value = [{'predicted_price': 120.0}]
+
+    with patch.object(analytics, "get_analyzer", return_value=analyzer) as get_analyzer:
+        predictions = await analytics.predict_procedure_prices(
+            [ProcedurePriceQuery(cpt_code="70551", hospital_name="Hospital A", medicare_rate=90.0)]
+        )
+
+    get_analyzer.assert_called_once_with()
+    assert predictions == [{'predicted_price': 120.0}]
+    (queries,), _ = analyzer.predict_procedure_prices.call_args
+    assert queries[0]['cpt_code'] == "70551"
+    assert queries[0]['medicare_rate'] == 90.0
+    assert queries[0]['facility_fee'] == 0
+
+async def test_price_anomalies_run_on_the_procedure_frame():
+    frame = pd.DataFrame({'procedure_id': [1]})
+    db = MagicMock()
+    db.run_sync = AsyncMock(return_value=frame)
+    analyzer = MagicMock()
+    analyzer.detect_price_anomalies.return_value = [{'procedure_id': 1}]
+
+    with patch.object(analytics, "get_analyzer", return_value=analyzer):
+        anomalies = await analytics.get_price_anomalies(db=db)
+
+    db.run_sync.assert_awaited_once_with(load_procedure_frame)
+    analyzer.detect_price_anomalies.assert_called_once_with(frame)
+    assert anomalies == [{'procedure_id': 1}]
+
+async def test_price_anomaly_errors_are_reported_as_server_errors():
+    db = MagicMock()
+    db.run_sync = AsyncMock(side_effect=RuntimeError("boom"))
+
+    with pytest.raises(HTTPException) as error:
+        await analytics.get_price_anomalies(db=db)
+
+    assert error.value.status_code == 500
+
+def test_price_prediction_batches_are_bounded():
+    app = FastAPI()
+    app.include_router(analytics.router)
+    query = {'cpt_code': "70551", 'hospital_name': "Hospital A"}
+
+    with patch.object(analytics, "get_analyzer") as get_analyzer:
+        response = TestClient(app).post("/price-predictions", json=[query] * (analytics.MAX_PREDICTION_BATCH + 1))
+
+    assert response.status_code == 422
+    get_analyzer.assert_not_called()
@@ -0,0 +1,76 @@
+import json
+
+from fastapi import Response
+from redis.exceptions import RedisError
+
+from app.core import cache
+from tests.conftest import InMemoryRedis
+
+async def test_cached_serves_hits_without_calling_the_endpoint():
+    calls = []
+
+    @cache.cached("things")
+    async def endpoint(limit: int = 10, db=None):
+        calls.append(limit)
+        return {"limit": limit}
+
+    assert await endpoint(limit=5, db=object()) == {"limit": 5}
+    hit = await endpoint(limit=5, db=object())
+
+    # Hits are served as the stored JSON bytes, never decoded and re-encoded
+    assert json.loads(hit.body) == {"limit": 5}
+    assert hit.media_type == "application/json"
+
+    assert calls == [5]
+
+async def test_cached_keys_on_parameters(redis_client):
+    @cache.cached("things")
+    async def endpoint(limit: int = 10):
+        return [limit]
+
+    await endpoint(limit=1)
+    await endpoint(limit=2)
+
+    assert len(redis_client.store) == 2
+
+async def test_invalidate_only_deletes_the_given_prefixes(redis_client):
+    @cache.cached("procedure-search")
+    async def search(q: str):
+        return {"q": q}
+
+    @cache.cached("peer-groups")
+    async def peer_groups(q: str):
+        return {"q": q}
+
+    await search(q="mri")
+    await search(q="ct")
+    await peer_groups(q="small")
+
+    await cache.invalidate("procedure-search")
+
+    assert list(redis_client.store) == [cache._build_key("peer-groups", {"q": "small"})]
+
+async def test_redis_errors_fall_through_to_the_endpoint(monkeypatch):
+    class BrokenRedis(InMemoryRedis):
+        async def get(self, key):
+            raise RedisError("down")
+
+        async def setex(self, key, ttl, value):
+            raise RedisError("down")
+
+    monkeypatch.setattr(cache, "_client", BrokenRedis())
+
+    @cache.cached("things")
+    async def endpoint(limit: int = 10):
+        return {"limit": limit}
+
+    assert await endpoint(limit=3) == {"limit": 3}
+
+async def test_cached_stores_encoded_responses_by_body(redis_client):
+    @cache.cached("things")
+    async def endpoint(limit: int = 10):
+        return Response(b'[1,2]', media_type="application/json")
+
+    await endpoint(limit=1)
+
+    assert list(redis_client.store.values()) == [b'[1,2]']
@@ -0,0 +1,49 @@
+from decimal import Decimal
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+from sqlalchemy.dialects import postgresql
+
+from app.services.claims_analysis import calculate_claim_statistics
+
+def _db(**totals):
+    db = MagicMock()
+    db.execute.return_value.one.return_value = SimpleNamespace(**totals)
+    return db
+
+def test_claim_statistics_come_from_one_aggregate_query():
+    db = _db(
+        total_claims=8, denied_claims=2, total_billed=Decimal("1000.00"),
+        total_paid=Decimal("640.25"), avg_allowed_amount=Decimal("95.13")
+    )
+
+    statistics = calculate_claim_statistics(db)
+
+    assert statistics == {
+        'total_claims': 8,
+        'denied_claims': 2,
+        'denial_rate': 25.0,
+        'total_billed': Decimal("1000.00"),
+        'total_paid': Decimal("640.25"),
+        'avg_allowed_amount': Decimal("95.13")
+    }
+    db.execute.assert_called_once()
+    sql = str(db.execute.call_args.args[0].compile(dialect=postgresql.dialect()))
+    assert "count(*) FILTER (WHERE insurance_claims.status IN" in sql
+    assert "sum(insurance_claims.billed_amount)" in sql
+    assert "avg(insurance_claims.allowed_amount)" in sql
+
+def test_claim_statistics_without_claims():
+    db = _db(total_claims=0, denied_claims=0, total_billed=None, total_paid=None, avg_allowed_amount=None)
+
+    statistics = calculate_claim_statistics(db)
+
+    assert statistics['denial_rate'] == 0.0
+    assert statistics['total_billed'] == 0
+    assert statistics['avg_allowed_amount'] is None
+
+def test_claim_statistics_on_database_errors():
+    db = MagicMock()
+    db.execute.side_effect = RuntimeError("connection lost")
+
+    assert calculate_claim_statistics(db) == {}
@@ -0,0 +1,21 @@
+import pytest
+from pydantic import ValidationError
+
+from app.core.config import Settings, settings
+
+def test_settings_are_frozen():
+    with pytest.raises(ValidationError):
+        settings.DEBUG = not settings.DEBUG
+
+def test_constant_collections_are_immutable():
+    assert isinstance(settings.CHICAGO_HOSPITALS, tuple)
+    assert isinstance(settings.SUPPORTED_FILE_TYPES, frozenset)
+    assert ".csv" in settings.SUPPORTED_FILE_TYPES
+    # Every instance shares the same defaults, so none can leak into another
+    assert Settings().CHICAGO_HOSPITALS == settings.CHICAGO_HOSPITALS
+
+def test_allowed_hosts_are_an_immutable_tuple(monkeypatch):
+    assert settings.ALLOWED_HOSTS == ("*",)
+
+    monkeypatch.setenv("ALLOWED_HOSTS", '["api.melena.ai", "melena.ai"]')
+    assert Settings().ALLOWED_HOSTS == ("api.melena.ai", "melena.ai")
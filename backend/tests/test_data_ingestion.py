@@ -0,0 +1,46 @@
+from unittest.mock import MagicMock
+
+from app.services.data_ingestion import _batches, replace_hospital_procedures
+
+def _procedure(cpt_code: str) -> dict:
+    return {'hospital_id': 1, 'cpt_code': cpt_code, 'procedure_name': 'Office visit', 'source_file': 'prices.csv'}
+
+def test_batches_splits_rows_into_bounded_lists():
+    assert list(_batches(range(5), 2)) == [[0, 1], [2, 3], [4]]
+
+def test_batches_of_no_rows_is_empty():
+    assert list(_batches([], 10)) == []
+
+def test_replace_deletes_before_inserting_and_commits_once():
+    db = MagicMock()
+    rows = [_procedure(str(code)) for code in range(5)]
+
+    written = replace_hospital_procedures(db, 1, {'prices.csv'}, iter(rows), batch_size=2)
+
+    assert written == 5
+    statements = [call.args[0] for call in db.execute.call_args_list]
+    assert statements[0].is_delete
+    assert all(statement.is_insert for statement in statements[1:])
+    assert [len(call.args[1]) for call in db.execute.call_args_list[1:]] == [2, 2, 1]
+    db.commit.assert_called_once()
+    db.rollback.assert_not_called()
+
+def test_replace_only_deletes_the_hospitals_rows_from_the_given_files():
+    db = MagicMock()
+
+    replace_hospital_procedures(db, 7, ['a.csv', 'b.csv'], [])
+
+    delete_statement = db.execute.call_args_list[0].args[0]
+    params = delete_statement.compile().params
+    assert 7 in params.values()
+    assert ['a.csv', 'b.csv'] in params.values()
+
+def test_replace_rolls_back_everything_on_failure():
+    db = MagicMock()
+    db.execute.side_effect = [None, RuntimeError("connection lost")]
+
+    written = replace_hospital_procedures(db, 1, {'prices.csv'}, [_procedure('99213')])
+
+    assert written == 0
+    db.rollback.assert_called_once()
+    db.commit.assert_not_called()
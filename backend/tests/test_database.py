@@ -0,0 +1,35 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core import database
+
+def test_api_sessions_run_on_asyncpg():
+    assert database.async_engine.dialect.driver == "asyncpg"
+    assert database.AsyncSessionLocal.class_ is AsyncSession
+    # Rows stay readable after commit without another round trip
+    assert database.AsyncSessionLocal.kw['expire_on_commit'] is False
+
+def test_scripts_keep_a_synchronous_engine():
+    assert database.engine.dialect.driver == "psycopg2"
+
+def test_hospital_relationships_use_the_configured_loader():
+    from app.models.hospital import HospitalProcedure
+    from app.models.hospital_scoring import HospitalExcellenceRecognition, HospitalPeerGroup, HospitalTransparencyScore
+
+    assert database.RELATIONSHIP_LAZY == "select"
+    for model in (HospitalProcedure, HospitalTransparencyScore, HospitalExcellenceRecognition, HospitalPeerGroup):
+        assert model.hospital.property.lazy == database.RELATIONSHIP_LAZY
+
+def test_updated_at_triggers_cover_every_table_with_the_column():
+    from unittest.mock import MagicMock
+    from app.models.hospital import Hospital
+    import app.models.hospital_scoring  # noqa: F401
+
+    connection = MagicMock()
+    database.create_updated_at_triggers(database.Base.metadata, connection)
+
+    statements = [str(call.args[0]) for call in connection.execute.call_args_list]
+    assert "CREATE TRIGGER set_updated_at BEFORE UPDATE ON hospitals FOR EACH ROW EXECUTE FUNCTION set_updated_at()" in statements
+    triggered = {statement.split(" ON ")[1].split()[0] for statement in statements if statement.startswith("CREATE")}
+    assert triggered == {table.name for table in database.Base.metadata.sorted_tables if "updated_at" in table.c}
+    # The ORM leaves updated_at to the trigger instead of sending now() itself
+    assert Hospital.__table__.c.updated_at.onupdate is None
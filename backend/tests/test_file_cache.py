@@ -0,0 +1,38 @@
+import time
+
+import pytest
+
+from app.services.data_collection import file_cache
+from app.services.data_collection.file_cache import PricingFileCache
+
+URL = "https://www.rush.edu/files/standard-charges.csv"
+
+@pytest.fixture
+def cache(tmp_path):
+    return PricingFileCache(str(tmp_path / "scraper_cache"))
+
+def test_stored_records_round_trip_with_their_validators(cache):
+    records = [
+        {'cpt_code': "99213", 'cash_price': 150.0, 'medicare_rate': None},
+        {'cpt_code': "70450", 'cash_price': None, 'medicare_rate': 400.25}
+    ]
+
+    cache.store(URL, records, etag='"abc"', last_modified="Mon, 01 Jan 2024 00:00:00 GMT")
+
+    metadata = cache.lookup(URL)
+    assert cache.load(URL) == records
+    assert cache.conditional_headers(metadata) == {
+        'If-None-Match': '"abc"', 'If-Modified-Since': "Mon, 01 Jan 2024 00:00:00 GMT"
+    }
+    # Entries with validators are always revalidated
+    assert not cache.is_fresh(metadata)
+
+def test_unknown_urls_have_no_entry(cache):
+    assert cache.lookup(URL) is None
+
+def test_entries_without_validators_expire(cache):
+    metadata = {'etag': None, 'last_modified': None, 'fetched_at': time.time()}
+
+    assert cache.is_fresh(metadata)
+    metadata['fetched_at'] -= file_cache.FILE_CACHE_TTL + 1
+    assert not cache.is_fresh(metadata)
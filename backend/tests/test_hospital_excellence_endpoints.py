@@ -0,0 +1,251 @@
+import json
+from datetime import datetime
+from types import SimpleNamespace
+from typing import Dict
+from unittest.mock import AsyncMock, MagicMock
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app import tasks
+from app.core.database import get_db
+from app.core.responses import ORJSONResponse
+from app.api.v1.endpoints import hospital_excellence
+from app.models.hospital_scoring import TransparencyCategory
+from app.schemas.hospital_excellence import (
+    AccountabilityTierResponse, ExcellenceCategoryInfo, HospitalExcellenceResponse, PeerGroupComparison,
+    TransparencyScoreResponse
+)
+
+def _result(rows) -> MagicMock:
+    """A query result holding the given rows, read either as rows or as scalars"""
+    result = MagicMock()
+    result.all.return_value = rows
+    result.first.return_value = rows[0] if rows else None
+    result.scalars.return_value.all.return_value = rows
+    result.scalars.return_value.first.return_value = rows[0] if rows else None
+    result.scalars.return_value.__iter__.side_effect = lambda: iter(rows)
+    result.mappings.return_value.all.return_value = rows
+    result.__iter__.side_effect = lambda: iter(rows)
+    return result
+
+def _db(*results) -> MagicMock:
+    """An AsyncSession stand-in answering successive execute() calls with the given rows"""
+    db = MagicMock()
+    db.execute = AsyncMock(side_effect=[_result(rows) for rows in results])
+    return db
+
+def _peer_group(hospital_id: int, name: str, rank: int, group: str = "small_rural") -> SimpleNamespace:
+    """A HospitalPeerGroup row with its hospital loaded"""
+    return SimpleNamespace(
+        peer_group_name=group, peer_group_size=2, group_avg_transparency_score=60.0,
+        group_median_transparency_score=60.0, group_std_transparency_score=5.0, group_avg_bed_count=40.0,
+        group_avg_community_impact=70.0, group_avg_cost_effectiveness=50.0,
+        hospital_id=hospital_id, hospital=SimpleNamespace(name=name), rank_in_group=rank,
+        percentile_in_group=100.0 - rank, transparency_vs_peers=None,
+        cost_effectiveness_vs_peers=None, community_impact_vs_peers=None
+    )
+
+def _peer_group_row(hospital_id: int, name: str, rank: int, group: str = "small_rural") -> SimpleNamespace:
+    """A peer group listing row: group stats followed by the member's columns"""
+    row = _peer_group(hospital_id, name, rank, group)
+    del row.hospital
+    row.hospital_name = name
+    return row
+
+async def test_peer_groups_are_ordered_in_sql_and_grouped_in_one_pass():
+    db = _db([
+        _peer_group_row(3, "Hospital C", 1, group="large_urban"),
+        _peer_group_row(1, "Hospital A", 1),
+        _peer_group_row(2, "Hospital B", 2)
+    ])
+
+    response = await hospital_excellence.get_peer_groups(group_name=None, db=db)
+
+    statement = str(db.execute.await_args.args[0])
+    assert "JOIN hospitals ON hospital_peer_groups.hospital_id = hospitals.id" in statement
+    assert "ORDER BY hospital_peer_groups.peer_group_name, hospital_peer_groups.rank_in_group" in statement
+    assert "hospitals.name AS hospital_name" in statement
+    assert all(isinstance(group, PeerGroupComparison) for group in response)
+    assert [group.group_name for group in response] == ["large_urban", "small_rural"]
+    assert [hospital.hospital_id for hospital in response[1].hospitals] == [1, 2]
+    assert response[1].hospitals[0].hospital_name == "Hospital A"
+    assert response[1].group_avg_bed_count == 40.0
+
+def _member(hospital_id: int, name: str, rank: int) -> dict:
+    """A peer group member row as selected by get_hospital_peer_group"""
+    return {
+        'hospital_id': hospital_id, 'hospital_name': name, 'rank_in_group': rank,
+        'percentile_in_group': 100.0 - rank, 'transparency_vs_peers': None,
+        'cost_effectiveness_vs_peers': None, 'community_impact_vs_peers': None
+    }
+
+async def test_hospital_peer_group_selects_member_columns_ordered_by_rank():
+    db = _db(
+        [_peer_group(1, "Hospital A", 1)],
+        [_member(1, "Hospital A", 1), _member(2, "Hospital B", 2)]
+    )
+
+    response = await hospital_excellence.get_hospital_peer_group(hospital_id=1, db=db)
+
+    statement = str(db.execute.await_args.args[0])
+    assert statement.startswith("SELECT hospital_peer_groups.hospital_id, hospitals.name AS hospital_name")
+    assert "ORDER BY hospital_peer_groups.rank_in_group" in statement
+    assert isinstance(response, PeerGroupComparison)
+    assert response.group_name == "small_rural"
+    assert [hospital.model_dump() for hospital in response.hospitals] == [
+        _member(1, "Hospital A", 1), _member(2, "Hospital B", 2)
+    ]
+
+async def test_hospital_peer_group_is_served_from_cache_until_scoring_reruns():
+    db = _db(
+        [_peer_group(1, "Hospital A", 1)],
+        [_member(1, "Hospital A", 1), _member(2, "Hospital B", 2)]
+    )
+
+    await hospital_excellence.get_hospital_peer_group(hospital_id=1, db=db)
+    cached = await hospital_excellence.get_hospital_peer_group(hospital_id=1, db=db)
+
+    assert db.execute.await_count == 2
+    group = json.loads(cached.body)
+    assert group['group_name'] == "small_rural"
+    assert [hospital['hospital_id'] for hospital in group['hospitals']] == [1, 2]
+    assert "peer-group-hospital" in tasks.SCORING_CACHE_PREFIXES
+
+async def test_excellence_categories_count_with_one_grouped_query():
+    db = _db([(TransparencyCategory.RURAL_INNOVATION, 3), (TransparencyCategory.COMMUNITY_FOCUS, 1)])
+
+    categories = await hospital_excellence.get_excellence_categories(db=db)
+
+    db.execute.assert_awaited_once()
+    assert categories['rural_innovation']['count'] == 3
+    assert categories['community_focus']['count'] == 1
+    # Categories without active recognitions are still listed
+    assert categories['small_hospital_excellence']['count'] == 0
+    assert categories['rural_innovation']['name'] == "Rural Innovation"
+
+def test_excellence_categories_declare_a_typed_response_model():
+    route = next(route for route in hospital_excellence.router.routes if route.path == "/excellence/categories")
+
+    assert route.response_model == Dict[str, ExcellenceCategoryInfo]
+
+def _transparency_score(hospital_id: int, score: float) -> SimpleNamespace:
+    hospital = SimpleNamespace(id=hospital_id, name=f"Hospital {hospital_id}", city="Peoria",
+                               county="Peoria", bed_count=25, hospital_type="Critical Access")
+    return SimpleNamespace(hospital_id=hospital_id, hospital=hospital, overall_transparency_score=score,
+                           community_impact_score=80.0, cost_per_bed_transparency=1.0)
+
+async def test_small_hospital_excellence_loads_recognitions_in_one_query():
+    recognition = SimpleNamespace(hospital_id=2, title="Rural Innovation", is_featured=True, is_spotlight=False)
+    db = _db([_transparency_score(1, 75.0), _transparency_score(2, 90.0)], [recognition])
+
+    response = await hospital_excellence.get_small_hospital_excellence(limit=10, db=db)
+
+    assert db.execute.await_count == 2
+    assert "IN (__[POSTCOMPILE_hospital_id_1])" in str(db.execute.await_args.args[0])
+    first, second = response.small_hospitals
+    assert (first.hospital.id, first.excellence_recognition, first.is_featured) == (2, "Rural Innovation", True)
+    assert (second.hospital.id, second.excellence_recognition) == (1, None)
+
+async def test_rural_heroes_are_ordered_by_community_impact_in_sql():
+    db = _db([_transparency_score(2, 90.0), _transparency_score(1, 75.0)])
+
+    response = await hospital_excellence.get_rural_hospital_heroes(limit=5, db=db)
+
+    statement = str(db.execute.await_args.args[0])
+    assert "ORDER BY hospital_transparency_scores.community_impact_score DESC" in statement
+    assert [hero.hospital.id for hero in response.rural_heroes] == [2, 1]
+    assert response.rural_heroes[0].rural_hero_qualities == list(hospital_excellence.RURAL_HERO_QUALITIES)
+
+def test_category_metadata_is_built_once_for_every_category():
+    assert set(hospital_excellence._CATEGORY_META) == set(TransparencyCategory)
+    assert hospital_excellence._CATEGORY_META[TransparencyCategory.RURAL_INNOVATION] == {
+        'name': "Rural Innovation",
+        'description': hospital_excellence._get_category_description(TransparencyCategory.RURAL_INNOVATION)
+    }
+
+async def test_excellence_listings_load_only_the_returned_columns():
+    db = _db([_transparency_score(1, 75.0)])
+
+    await hospital_excellence.get_rural_hospital_heroes(limit=5, db=db)
+
+    selected = str(db.execute.await_args.args[0]).split(" FROM ")[0]
+    assert "hospitals.county" in selected
+    assert "hospitals.address" not in selected
+    assert "hospital_transparency_scores.price_availability_score" not in selected
+
+def _recognition_row(hospital_id: int) -> SimpleNamespace:
+    """A Row-like projection of every HospitalExcellenceResponse column"""
+    return SimpleNamespace(
+        id=1, hospital_id=hospital_id, category=TransparencyCategory.RURAL_INNOVATION.value,
+        title="Rural Innovation Leader", description=None, transparency_score=90.0,
+        community_impact_score=80.0, cost_effectiveness_score=70.0, patient_satisfaction_score=75.0,
+        is_featured=True, is_spotlight=False, is_active=True, achievements=None,
+        community_impact_details=None, cost_optimization_details=None,
+        recognition_start_date=datetime(2024, 1, 1), recognition_end_date=None,
+        created_at=datetime(2024, 1, 1), updated_at=None
+    )
+
+async def test_hospital_excellence_selects_only_the_response_columns():
+    db = _db([_recognition_row(7)])
+
+    recognition = await hospital_excellence.get_hospital_excellence(hospital_id=7, db=db)
+
+    statement = db.execute.await_args.args[0]
+    assert [column.name for column in statement.selected_columns] == list(HospitalExcellenceResponse.model_fields)
+    # The trusted Row is copied into the response schema without validation
+    assert isinstance(recognition, HospitalExcellenceResponse)
+    assert recognition.hospital_id == 7
+    assert recognition.title == "Rural Innovation Leader"
+
+async def test_featured_hospitals_are_returned_as_response_schemas():
+    db = _db([_recognition_row(7), _recognition_row(8)])
+
+    recognitions = await hospital_excellence.get_featured_hospitals(category=None, limit=10, db=db)
+
+    assert all(isinstance(recognition, HospitalExcellenceResponse) for recognition in recognitions)
+    assert [recognition.hospital_id for recognition in recognitions] == [7, 8]
+    assert recognitions[0].category == TransparencyCategory.RURAL_INNOVATION
+
+async def test_accountability_tiers_are_built_from_rows_by_field_name():
+    row = SimpleNamespace(**dict.fromkeys(AccountabilityTierResponse.response_fields))
+    row.__dict__.update(
+        id=1, hospital_id=7, tier="supportive", enforcement_level="medium", compliance_timeline_days=90,
+        support_level="partial", size_factor=True, resource_factor=False, community_factor=True,
+        tier_assignment_date=datetime(2024, 1, 1), created_at=datetime(2024, 1, 1)
+    )
+    db = _db([row])
+
+    tiers = await hospital_excellence.get_accountability_tiers(tier=None, db=db)
+
+    statement = db.execute.await_args.args[0]
+    assert [column.name for column in statement.selected_columns] == list(AccountabilityTierResponse.response_fields)
+    assert [(tier.hospital_id, tier.tier, tier.support_level) for tier in tiers] == [(7, "supportive", "partial")]
+
+async def test_transparency_scores_are_built_from_rows_by_field_name():
+    row = SimpleNamespace(**dict.fromkeys(TransparencyScoreResponse.response_fields, 50.0))
+    row.__dict__.update(
+        id=1, hospital_id=7, hospital_size="small", peer_group_rank=2, scoring_methodology="size_adjusted",
+        last_calculated=datetime(2024, 1, 1), created_at=datetime(2024, 1, 1), updated_at=None
+    )
+
+    scores = await hospital_excellence.get_transparency_scores(
+        hospital_size=None, min_score=None, max_score=None, limit=50, db=_db([row])
+    )
+
+    assert isinstance(scores[0], TransparencyScoreResponse)
+    assert scores[0].hospital_size.value == "small"
+    assert scores[0].overall_transparency_score == 50.0
+
+def test_spotlight_hospitals_are_serialized_through_the_response_model():
+    app = FastAPI(default_response_class=ORJSONResponse)
+    app.include_router(hospital_excellence.router)
+    app.dependency_overrides[get_db] = lambda: _db([_recognition_row(7)])
+
+    response = TestClient(app).get("/excellence/spotlight")
+
+    assert response.status_code == 200
+    recognition, = response.json()
+    assert recognition['hospital_id'] == 7
+    assert recognition['category'] == "rural_innovation"
+    assert recognition['recognition_start_date'] == "2024-01-01T00:00:00"
@@ -0,0 +1,294 @@
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pandas as pd
+import pytest
+from sqlalchemy import REAL
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.dialects.postgresql import JSONB
+
+from app.services import hospital_scoring
+from app.models.hospital_scoring import (
+    HospitalAccountabilityTier, HospitalExcellenceRecognition, HospitalSize, HospitalTransparencyScore
+)
+from app.services.hospital_scoring import HospitalArray, HospitalScoringService
+
+NOW = datetime(2024, 6, 1, tzinfo=timezone.utc)
+
+@pytest.fixture
+def service():
+    return HospitalScoringService()
+
+def _frame(**overrides) -> pd.DataFrame:
+    """A one-hospital scoring frame (see load_scoring_frame) with the given columns overridden"""
+    row = {
+        'hospital_id': 1, 'bed_count': 25, 'transparency_file_url': "https://a.org/standard-charges.csv?v=1",
+        'website': "https://a.org", 'last_data_update': NOW - timedelta(days=3), 'data_quality_score': 50.0,
+        'medicaid_participant': True, 'medicare_participant': True, 'illinois_region': "Rural Southern",
+        'hospital_type': "Critical Access Hospital", **hospital_scoring.NO_PROCEDURE_STATS,
+        'procedure_count': 150, 'cash_count': 150, 'negotiated_count': 100
+    }
+    row.update(overrides)
+    return pd.DataFrame([row])
+
+def test_peer_groups_are_inserted_already_ranked(service):
+    db = MagicMock()
+    db.query.return_value.filter.return_value.distinct.return_value.order_by.return_value.all.return_value = [
+        (10, 60.0, 70.0, 1.0), (11, 80.0, 50.0, 2.0)
+    ]
+
+    hospitals = [SimpleNamespace(id=10, bed_count=25), SimpleNamespace(id=11, bed_count=40), SimpleNamespace(id=12, bed_count=30)]
+    service._calculate_peer_group_metrics(db, "Small Community Hospitals", hospitals)
+
+    rows = db.execute.call_args.args[1]
+    assert [(row['hospital_id'], row['rank_in_group']) for row in rows] == [(10, 2), (11, 1), (12, 3)]
+    assert [row['transparency_vs_peers'] for row in rows] == [-10.0, 10.0, None]
+    db.execute.assert_called_once()
+    db.commit.assert_called_once()
+
+def test_group_ranks_match_sql_rank_and_percent_rank(service):
+    ranks, percentiles = service._rank_in_group(np.array([70.0, 90.0, 70.0, np.nan, 50.0]))
+
+    assert ranks.tolist() == [2, 1, 2, 5, 4]
+    assert percentiles.tolist() == [50.0, 100.0, 50.0, 0.0, 25.0]
+
+def test_peer_group_means_skip_missing_contextual_metrics(service):
+    db = MagicMock()
+    db.query.return_value.filter.return_value.distinct.return_value.order_by.return_value.all.return_value = [
+        (10, 80.0, None, None), (11, 60.0, 50.0, None)
+    ]
+
+    hospitals = [SimpleNamespace(id=10, bed_count=25), SimpleNamespace(id=11, bed_count=None)]
+    service._calculate_peer_group_metrics(db, "Small Community Hospitals", hospitals)
+
+    row = db.execute.call_args.args[1][0]
+    assert row['group_avg_transparency_score'] == 70.0
+    assert row['group_avg_community_impact'] == 50.0
+    assert row['group_avg_cost_effectiveness'] == 0
+    assert row['group_avg_bed_count'] == 25
+
+def test_weighted_scores_are_generated_by_the_database():
+    columns = HospitalTransparencyScore.__table__.c
+
+    assert columns.weighted_accessibility.computed.persisted
+    assert str(columns.weighted_accessibility.computed.sqltext) == (
+        "CAST(data_accessibility_score AS DOUBLE PRECISION) * CASE hospital_size "
+        "WHEN 'small' THEN 0.4 WHEN 'medium' THEN 0.3 WHEN 'large' THEN 0.2 END"
+    )
+    overall = str(columns.overall_transparency_score.computed.sqltext)
+    assert overall.count(" + ") == 3
+    assert "CAST(update_frequency_score AS DOUBLE PRECISION) * CASE hospital_size" in overall
+
+def test_bounded_scores_are_stored_as_real():
+    columns = HospitalTransparencyScore.__table__.c
+
+    for column in ('data_accessibility_score', 'community_impact_score', 'peer_group_percentile'):
+        assert isinstance(columns[column].type, REAL)
+    assert not isinstance(columns.cost_per_bed_transparency.type, REAL)
+
+def test_scores_are_ranked_within_their_size_group(service):
+    groups = np.array(['small', 'large', 'small', 'small', 'large'])
+    scores = np.array([80.0, 60.0, 90.0, 40.0, 95.0])
+
+    ranks, percentiles = service._rank_within_groups(groups, scores)
+
+    assert ranks.tolist() == [2, 2, 1, 3, 1]
+    assert percentiles.tolist() == [50.0, 0.0, 100.0, 0.0, 100.0]
+
+def test_single_member_group_is_top_ranked_at_percent_rank_zero(service):
+    ranks, percentiles = service._rank_within_groups(np.array(['small']), np.array([42.0]))
+
+    assert (ranks.tolist(), percentiles.tolist()) == ([1], [0.0])
+
+def test_score_ranks_share_ties_like_peer_group_ranks(service):
+    groups = np.array(['small', 'small', 'small'])
+    scores = np.array([70.0, 90.0, 70.0])
+
+    ranks, percentiles = service._rank_within_groups(groups, scores)
+
+    assert (ranks.tolist(), percentiles.tolist()) == tuple(values.tolist() for values in service._rank_in_group(scores))
+    assert ranks.tolist() == [2, 1, 2]
+
+def test_enforcement_actions_are_stored_as_jsonb_lists(service):
+    actions = service._get_enforcement_actions('strict')
+
+    assert isinstance(actions, list) and actions
+    assert all(isinstance(action, str) for action in actions)
+    assert service._get_enforcement_actions('unknown') == []
+    assert isinstance(HospitalAccountabilityTier.__table__.c.enforcement_actions.type, JSONB)
+    assert isinstance(HospitalExcellenceRecognition.__table__.c.achievements.type, JSONB)
+
+def test_accountability_tiers_are_inserted_in_one_statement(service):
+    db = MagicMock()
+    db.query.return_value.yield_per.return_value = iter([SimpleNamespace(id=1, bed_count=30), SimpleNamespace(id=2, bed_count=400)])
+
+    tiers = service.assign_accountability_tiers(db)
+
+    statement, rows = db.execute.call_args.args
+    assert statement.table.name == HospitalAccountabilityTier.__tablename__
+    assert [(row['hospital_id'], row['tier']) for row in rows] == [(1, 'educational'), (2, 'strict')]
+    assert [hospital.id for hospital in tiers['strict']] == [2]
+    db.add.assert_not_called()
+
+def test_weights_matrix_rows_match_the_scoring_weights(service):
+    for size, row in hospital_scoring.SIZE_INDEX.items():
+        assert service.weights_matrix[row].tolist() == [
+            hospital_scoring.SCORING_WEIGHTS[size][component] for component in hospital_scoring.SCORE_COMPONENTS
+        ]
+
+def test_bulk_sizes_match_the_scalar_size(service):
+    bed_counts = [np.nan, 0, 1, 49, 50, 199, 200, 900]
+
+    sizes = hospital_scoring.SIZE_VALUES[service.calculate_sizes_bulk(np.array(bed_counts))]
+
+    assert sizes.tolist() == [
+        service.calculate_hospital_size(None if np.isnan(beds) else beds).value for beds in bed_counts
+    ]
+
+def test_enforcement_actions_come_from_the_shared_table(service):
+    assert service._get_enforcement_actions('supportive') is hospital_scoring.ENFORCEMENT_ACTIONS['supportive']
+
+def test_hospitals_are_streamed_as_id_and_bed_count_rows(service):
+    db = MagicMock()
+
+    service._stream_hospital_sizes(db)
+
+    columns = db.query.call_args.args
+    assert [column.key for column in columns] == ['id', 'bed_count']
+    db.query.return_value.yield_per.assert_called_once_with(hospital_scoring.HOSPITAL_STREAM_BATCH_SIZE)
+
+def test_one_sized_scan_feeds_peer_groups_and_tiers(service):
+    db = MagicMock()
+    hospitals_by_size = {
+        HospitalSize.SMALL: [SimpleNamespace(id=1, bed_count=30)],
+        HospitalSize.MEDIUM: [],
+        HospitalSize.LARGE: [SimpleNamespace(id=2, bed_count=400)]
+    }
+
+    peer_groups = service.create_peer_groups(db, hospitals_by_size)
+    tiers = service.assign_accountability_tiers(db, hospitals_by_size)
+
+    assert peer_groups['Large Hospital Systems'] == hospitals_by_size[HospitalSize.LARGE]
+    assert tiers['educational'] == hospitals_by_size[HospitalSize.SMALL]
+    db.query.return_value.yield_per.assert_not_called()
+
+def test_excellence_candidates_come_from_the_latest_scores(service):
+    db = MagicMock()
+    db.execute.return_value.all.return_value = [SimpleNamespace(
+        hospital_id=4, hospital_size='small', overall_transparency_score=92.0,
+        community_impact_score=70.0, cost_per_bed_transparency=3.0, patient_satisfaction_score=60.0
+    )]
+
+    candidates = service.identify_excellence_candidates(db)
+
+    query = str(db.execute.call_args_list[0].args[0].compile(dialect=postgresql.dialect()))
+    assert "DISTINCT ON" in query
+    assert "FROM hospitals" not in query
+    statement, rows = db.execute.call_args.args
+    assert statement.table.name == HospitalExcellenceRecognition.__tablename__
+    assert rows[0]['hospital_id'] == 4 and rows[0]['is_spotlight']
+    assert rows[0]['achievements'][-1] == "Cost Effectiveness: 3.0 per bed"
+    assert rows[0]['cost_optimization_details'].endswith("at 3.0 cost per bed")
+    assert [candidate['hospital_id'] for candidate in candidates] == [4]
+    db.add.assert_not_called()
+
+def test_hospital_array_decodes_text_and_dates():
+    now = datetime(2024, 6, 1, tzinfo=timezone.utc)
+    frame = pd.DataFrame([{
+        'hospital_id': 1, 'bed_count': None, 'transparency_file_url': "https://a.org/charges.csv?v=1", 'website': None,
+        'last_data_update': None, 'data_quality_score': None, 'medicaid_participant': True, 'medicare_participant': None,
+        'illinois_region': "Rural Southern", 'hospital_type': "Critical Access Hospital",
+        **hospital_scoring.NO_PROCEDURE_STATS, 'procedure_count': 150, 'cash_count': 150, 'negotiated_count': 100
+    }])
+
+    hospitals = HospitalArray.from_frame(frame, now)
+
+    assert len(hospitals) == 1
+    assert hospitals.bed_count.tolist() == [0.0]
+    assert hospitals.machine_readable_url.tolist() == [True]
+    assert hospitals.has_website.tolist() == [False]
+    assert np.isnan(hospitals.days_since_update[0])
+    assert hospitals.medicare_participant.tolist() == [False]
+    assert hospitals.rural.tolist() == [True] and hospitals.community.tolist() == [False]
+    assert hospitals.critical_access.tolist() == [True]
+    assert hospitals.price_types.tolist() == [2]
+
+def test_region_and_type_flags_ignore_case_across_repeated_values():
+    frame = pd.DataFrame([
+        {'hospital_id': hospital_id, 'bed_count': 100, 'transparency_file_url': None, 'website': None,
+         'last_data_update': None, 'data_quality_score': None, 'medicaid_participant': None, 'medicare_participant': None,
+         'illinois_region': region, 'hospital_type': hospital_type, **hospital_scoring.NO_PROCEDURE_STATS}
+        for hospital_id, region, hospital_type in [
+            (1, "RURAL North", "critical access"), (2, "Chicago Community", None), (3, "RURAL North", "General")
+        ]
+    ])
+
+    hospitals = HospitalArray.from_frame(frame, datetime(2024, 6, 1, tzinfo=timezone.utc))
+
+    assert hospitals.rural.tolist() == [True, False, True]
+    assert hospitals.community.tolist() == [False, True, False]
+    assert hospitals.critical_access.tolist() == [True, False, False]
+
+def test_score_hospitals_scores_a_small_rural_hospital(service):
+    scores = service.score_hospitals(_frame(), NOW).iloc[0]
+
+    assert scores['hospital_size'] == HospitalSize.SMALL.value
+    assert scores['data_accessibility_score'] == 100
+    assert scores['data_completeness_score'] == 20 + 2 * 15
+    assert scores['data_accuracy_score'] == 30
+    assert scores['update_frequency_score'] == 100
+    # Small hospital weights: 0.4, 0.3, 0.2, 0.1
+    assert scores['overall_transparency_score'] == pytest.approx(40 + 15 + 6 + 10)
+    assert scores['cost_per_bed_transparency'] == pytest.approx(71 * 100 / 25)
+    assert scores['community_impact_score'] == 100
+    assert scores['patient_satisfaction_score'] == 70
+
+def test_score_hospitals_handles_missing_inputs(service):
+    frame = _frame(
+        bed_count=None, transparency_file_url=None, website=None, last_data_update=None,
+        data_quality_score=None, illinois_region=None, hospital_type=None, **hospital_scoring.NO_PROCEDURE_STATS
+    )
+
+    scores = service.score_hospitals(frame, NOW).iloc[0]
+
+    assert scores['data_accessibility_score'] == 0
+    assert scores['data_completeness_score'] == 0
+    assert scores['update_frequency_score'] == 0
+    assert scores['overall_transparency_score'] == 0
+    assert scores['cost_per_bed_transparency'] == 0
+    assert scores['patient_satisfaction_score'] == 50
+
+def test_accuracy_score_uses_the_plausible_price_share(service):
+    frame = _frame(data_quality_score=0.0, cash_medicare_count=4, reasonable_price_count=3)
+
+    assert service.score_hospitals(frame, NOW).iloc[0]['data_accuracy_score'] == pytest.approx(30)
+
+def test_update_ages_are_measured_at_the_given_time(service):
+    frame = _frame(last_data_update=NOW - timedelta(days=20))
+
+    assert service.score_hospitals(frame, NOW).iloc[0]['update_frequency_score'] == 80
+    assert service.score_hospitals(frame, NOW + timedelta(days=100)).iloc[0]['update_frequency_score'] == 40
+
+@pytest.mark.parametrize("url, machine_readable", [
+    ("https://a.org/prices.CSV", True),
+    ("https://a.org/prices.json?v=2", True),
+    ("https://a.org/prices.xml#top", True),
+    ("https://a.org/prices.csv.html", False),
+    ("https://a.org/download?file=prices.pdf", False),
+])
+def test_machine_readable_files_are_matched_by_path_suffix(url, machine_readable):
+    assert bool(hospital_scoring._MACHINE_READABLE_URL_RE.search(url)) is machine_readable
+
+def test_analysis_is_dated_with_the_utc_scoring_time(service):
+    db = MagicMock()
+    with patch.object(service, 'load_scoring_frame', return_value=_frame()), \
+            patch.object(service, 'score_hospitals', wraps=service.score_hospitals) as score_hospitals, \
+            patch.object(service, 'group_hospitals_by_size', return_value={}), \
+            patch.object(service, 'identify_excellence_candidates', return_value=[]):
+        summary = service.run_complete_scoring_analysis(db)
+
+    assert summary['analysis_date'].tzinfo is not None
+    assert summary['analysis_date'] == score_hospitals.call_args.args[1]
+    assert summary['scoring_results'] == 1
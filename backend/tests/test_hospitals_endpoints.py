@@ -0,0 +1,210 @@
+import json
+from datetime import datetime
+from decimal import Decimal
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from fastapi import HTTPException
+from fastapi.exceptions import RequestValidationError
+from sqlalchemy.dialects import postgresql
+
+# Hospital's relationships name the scoring models, which must be mapped too
+import app.models.hospital_scoring  # noqa: F401
+from app.api.v1.endpoints import hospitals
+from app.schemas.hospital import HospitalProcedureResponse
+
+def _result(rows) -> MagicMock:
+    """A query result holding the given rows"""
+    result = MagicMock()
+    result.all.return_value = rows
+    result.one.return_value = rows[0] if rows else None
+    result.scalar.return_value = rows[0] if rows else None
+    result.scalars.return_value.all.return_value = rows
+    result.scalars.return_value.__iter__.side_effect = lambda: iter(rows)
+    return result
+
+def _db(*results) -> MagicMock:
+    """An AsyncSession stand-in answering successive execute() calls with the given rows"""
+    db = MagicMock()
+    db.execute = AsyncMock(side_effect=[_result(rows) for rows in results])
+    return db
+
+def _statement(db, call: int = 0):
+    statement = db.execute.await_args_list[call].args[0]
+    return str(statement.compile(dialect=postgresql.dialect()))
+
+async def test_illinois_overview_counts_regions_in_one_query():
+    counts = SimpleNamespace(total=5, chicago_metro=3, central_illinois=1, southern_illinois=1)
+    db = _db([counts], [42], ["Chicago", "Peoria"], ["Acute Care"])
+
+    overview = await hospitals.get_illinois_overview(db=db)
+
+    assert overview.total_hospitals == 5
+    assert overview.total_procedures == 42
+    assert overview.regions.model_dump() == {'chicago_metro': 3, 'central_illinois': 1, 'southern_illinois': 1}
+    assert overview.cities == ["Chicago", "Peoria"]
+    assert overview.hospital_types == ["Acute Care"]
+    # All region buckets come from conditional aggregates on a single statement
+    assert _statement(db, 0).count("FILTER (WHERE") == 3
+    # NULL hospital types are dropped in SQL rather than in Python
+    assert "hospitals.hospital_type IS NOT NULL" in _statement(db, 3)
+
+async def test_illinois_overview_is_cached_as_its_schema_json():
+    counts = SimpleNamespace(total=5, chicago_metro=3, central_illinois=1, southern_illinois=1)
+    db = _db([counts], [42], ["Chicago"], ["Acute Care"])
+
+    overview = await hospitals.get_illinois_overview(db=db)
+    cached = await hospitals.get_illinois_overview(db=db)
+
+    assert db.execute.await_count == 4
+    assert json.loads(cached.body) == overview.model_dump()
+
+def _search_row(cpt_code: str, hospital_name: str, cash_price) -> SimpleNamespace:
+    return SimpleNamespace(
+        cpt_code=cpt_code, procedure_name="MRI", hospital_name=hospital_name, city="Chicago",
+        cash_price=cash_price, negotiated_rate_min=None, negotiated_rate_max=None,
+        medicare_rate=None, medicaid_rate=None
+    )
+
+async def test_search_procedures_groups_sql_ordered_rows():
+    db = _db([
+        _search_row("70551", "Hospital A", 100.0),
+        _search_row("70551", "Hospital B", None),
+        _search_row("70553", "Hospital A", 300.0)
+    ])
+
+    response = await hospitals.search_procedures(
+        procedure_name="MRI", city=None, max_price=None, limit=50, offset=0, db=db
+    )
+
+    statement = _statement(db)
+    assert "ORDER BY hospital_procedures.cpt_code, hospital_procedures.procedure_name, " \
+        "hospital_procedures.cash_price ASC NULLS LAST" in statement
+    assert response.total_procedures == 2
+    assert [h.hospital_name for h in response.results[0].hospitals] == ["Hospital A", "Hospital B"]
+    assert response.results[1].cpt_code == "70553"
+    # Missing cash prices are left out of the comparison range
+    assert (response.results[0].cash_price_min, response.results[0].cash_price_max) == (100.0, 100.0)
+
+async def test_search_procedures_is_cached_for_an_hour(redis_client):
+    db = _db([_search_row("70551", "Hospital A", 100.0)])
+    search = dict(procedure_name="MRI", city=None, max_price=None, limit=50, offset=0)
+
+    with patch.object(redis_client, "setex", wraps=redis_client.setex) as setex:
+        await hospitals.search_procedures(**search, db=db)
+    cached = await hospitals.search_procedures(**search, db=db)
+
+    assert db.execute.await_count == 1
+    assert setex.await_args.args[1] == hospitals.PROCEDURE_SEARCH_CACHE_TTL == 3600
+    assert json.loads(cached.body)['results'][0]['cpt_code'] == "70551"
+
+def _procedure_row(hospital_id: int, procedure_id: int, cpt_code: str) -> SimpleNamespace:
+    """The outer join's row for one procedure of a hospital"""
+    row = _empty_procedure_row(hospital_id)
+    row.__dict__.update(
+        id=procedure_id, hospital_id=hospital_id, cpt_code=cpt_code, procedure_name="MRI brain",
+        cash_price=Decimal("1200.00"), created_at=datetime(2024, 1, 1)
+    )
+    return row
+
+def _empty_procedure_row(hospital_id: int) -> SimpleNamespace:
+    """The outer join's row for a hospital without matching procedures"""
+    return SimpleNamespace(
+        found_hospital_id=hospital_id, **dict.fromkeys(HospitalProcedureResponse.response_fields)
+    )
+
+async def test_hospital_procedures_check_existence_in_the_same_query():
+    db = _db([_procedure_row(1, 7, "70551")])
+
+    response = await hospitals.get_hospital_procedures(
+        hospital_id=1, cpt_code="70551", procedure_name=None, limit=100, after_id=None, db=db
+    )
+
+    assert [(procedure.id, procedure.cpt_code) for procedure in response] == [(7, "70551")]
+    # Money columns come back as Decimal and are returned as floats
+    assert response[0].cash_price == 1200.0 and isinstance(response[0].cash_price, float)
+    assert db.execute.await_count == 1
+    assert "LEFT OUTER JOIN hospital_procedures" in _statement(db)
+
+async def test_hospital_procedures_distinguish_empty_from_missing():
+    response = await hospitals.get_hospital_procedures(
+        hospital_id=1, cpt_code=None, procedure_name=None, limit=100, after_id=None, db=_db([_empty_procedure_row(1)])
+    )
+    assert response == []
+
+    with pytest.raises(HTTPException) as excinfo:
+        await hospitals.get_hospital_procedures(
+            hospital_id=2, cpt_code=None, procedure_name=None, limit=100, after_id=None, db=_db([])
+        )
+    assert excinfo.value.status_code == 404
+
+async def test_hospital_listing_is_paginated_by_id():
+    db = _db([])
+
+    await hospitals.get_hospitals(city=None, state="IL", hospital_type=None, limit=20, offset=0, after_id=40, db=db)
+
+    statement = _statement(db)
+    assert "hospitals.id > %(id_1)s" in statement
+    assert statement.endswith("ORDER BY hospitals.id \n LIMIT %(param_1)s OFFSET %(param_2)s")
+
+async def test_search_pages_over_distinct_procedures():
+    db = _db([])
+
+    await hospitals.search_procedures(procedure_name="MRI", city=None, max_price=None, limit=10, offset=20, db=db)
+
+    statement = _statement(db)
+    assert "JOIN (SELECT DISTINCT hospital_procedures.cpt_code AS cpt_code, " \
+        "hospital_procedures.procedure_name AS procedure_name" in statement
+    assert "LIMIT %(param_1)s OFFSET %(param_2)s" in statement
+
+async def test_hospital_procedures_page_by_id_inside_the_outer_join():
+    db = _db([_empty_procedure_row(1)])
+
+    await hospitals.get_hospital_procedures(hospital_id=1, cpt_code=None, procedure_name=None, limit=25, after_id=300, db=db)
+
+    statement = _statement(db)
+    # The cursor belongs to the join, so an exhausted page still returns the hospital row
+    assert "AND hospital_procedures.id > %(id_1)s \nWHERE" in statement
+    assert statement.endswith("ORDER BY hospital_procedures.id \n LIMIT %(param_1)s")
+
+def _upload(*procedures) -> MagicMock:
+    """A request whose raw body is the given procedures as a JSON array"""
+    request = MagicMock()
+    request.body = AsyncMock(return_value=json.dumps(list(procedures)).encode())
+    return request
+
+def _new_procedure(hospital_id: int, cpt_code: str) -> dict:
+    return {'hospital_id': hospital_id, 'cpt_code': cpt_code, 'procedure_name': "MRI brain", 'cash_price': 1200.0}
+
+async def test_bulk_procedures_are_inserted_in_one_statement():
+    db = _db([1, 2], [])
+    db.commit = AsyncMock()
+
+    created = await hospitals.bulk_create_procedures(
+        request=_upload(_new_procedure(1, "70551"), _new_procedure(2, "70553")), db=db
+    )
+
+    assert created == {'created': 2}
+    insert_rows = db.execute.await_args_list[1].args[1]
+    assert [(row['hospital_id'], row['cpt_code']) for row in insert_rows] == [(1, "70551"), (2, "70553")]
+    db.commit.assert_awaited_once()
+
+async def test_bulk_procedures_reject_invalid_rows_before_touching_the_database():
+    db = _db()
+
+    with pytest.raises(RequestValidationError):
+        await hospitals.bulk_create_procedures(request=_upload({'hospital_id': 1}), db=db)
+
+    db.execute.assert_not_awaited()
+
+async def test_bulk_procedures_for_unknown_hospitals_are_not_found():
+    db = _db([1])
+
+    with pytest.raises(HTTPException) as excinfo:
+        await hospitals.bulk_create_procedures(
+            request=_upload(_new_procedure(1, "70551"), _new_procedure(9, "70551")), db=db
+        )
+
+    assert excinfo.value.status_code == 404
+    assert db.execute.await_count == 1
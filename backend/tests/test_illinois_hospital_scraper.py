@@ -0,0 +1,383 @@
+import asyncio
+import io
+from datetime import datetime
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import orjson
+import pandas as pd
+import pytest
+
+from app.services.data_collection import illinois_hospital_scraper as scraper_module
+from app.services.data_collection.illinois_hospital_scraper import (
+    TRANSPARENCY_PROBE_BYTES, IllinoisHospitalScraper, TokenBucket, _page_hrefs, _procedure_rows, save_scraped_procedures
+)
+
+@pytest.fixture
+def scraper(tmp_path, monkeypatch):
+    # The pricing file cache directory is relative to the working directory
+    monkeypatch.chdir(tmp_path)
+    return IllinoisHospitalScraper()
+
+@pytest.fixture(autouse=True)
+def probe_cache(monkeypatch):
+    """Start every test with an empty process-wide probe cache"""
+    cache = {}
+    monkeypatch.setattr(scraper_module, "_probe_cache", cache)
+    return cache
+
+def test_page_hrefs_reads_links_in_document_order():
+    html = '<a href="/a">A</a><link href="/style.css"><a HREF="/B">B</a>'
+
+    assert _page_hrefs(html) == ["/a", "/style.css", "/B"]
+    assert _page_hrefs("  ") == []
+
+def test_extract_file_links_keeps_pricing_files(scraper):
+    html = """
+        <a href="/files/standard-charges.csv">CSV</a>
+        <a href="/files/Pricing.XLSX">Excel</a>
+        <a href="/files/annual-report.pdf">Report</a>
+        <a href="/about/download">Not pricing</a>
+    """
+
+    links = scraper._extract_file_links(html, "https://www.rush.edu/pricing")
+
+    assert links == [
+        "https://www.rush.edu/files/standard-charges.csv",
+        "https://www.rush.edu/files/Pricing.XLSX"
+    ]
+
+async def test_hospitals_are_scraped_concurrently_and_fail_independently():
+    running = []
+    peak = 0
+
+    async def scrape_hospital(hospital_name):
+        nonlocal peak
+        running.append(hospital_name)
+        peak = max(peak, len(running))
+        await asyncio.sleep(0.01)
+        running.remove(hospital_name)
+        if hospital_name == "Broken Hospital":
+            raise RuntimeError("timeout")
+        return [{'cpt_code': "99213"}] if hospital_name != "Empty Hospital" else []
+
+    async with IllinoisHospitalScraper(session=MagicMock()) as scraper:
+        scraper.hospitals = ["Rush University Medical Center", "Broken Hospital", "Empty Hospital"]
+        scraper.scrape_hospital = scrape_hospital
+        results = await scraper.scrape_all_hospitals()
+
+    assert peak == 3
+    assert results == {"Rush University Medical Center": [{'cpt_code': "99213"}]}
+
+async def test_first_transparency_page_follows_candidate_order(scraper):
+    delays = {"https://a.org/pricing": 0.02, "https://a.org/price-transparency": 0.0, "https://a.org/cost": 5}
+    cancelled = []
+
+    async def is_transparency_page(url):
+        try:
+            await asyncio.sleep(delays[url])
+        except asyncio.CancelledError:
+            cancelled.append(url)
+            raise
+        return url != "https://a.org/cost"
+
+    scraper._is_transparency_page = is_transparency_page
+
+    # The later candidate answers first, but the earlier confirmed one wins
+    url = await scraper._first_transparency_page(list(delays))
+
+    assert url == "https://a.org/pricing"
+    # The probe still in flight was cancelled and awaited before returning
+    assert cancelled == ["https://a.org/cost"]
+
+async def test_first_transparency_page_without_a_confirmed_candidate(scraper):
+    async def is_transparency_page(url):
+        return False
+
+    scraper._is_transparency_page = is_transparency_page
+
+    assert await scraper._first_transparency_page(["https://a.org/pricing", "https://a.org/cost"]) is None
+
+def _probe_session(head_status: int, content_type: str = "text/html", body: bytes = b"") -> MagicMock:
+    """A session answering one HEAD and one ranged GET"""
+    session = MagicMock()
+    session.head.return_value.__aenter__.return_value = MagicMock(
+        status=head_status, headers={'Content-Type': content_type}
+    )
+    get_response = MagicMock(status=206)
+    # Bodies shorter than the probe window end the read early
+    get_response.content.readexactly = AsyncMock(
+        side_effect=asyncio.IncompleteReadError(body, TRANSPARENCY_PROBE_BYTES)
+    )
+    session.get.return_value.__aenter__.return_value = get_response
+    return session
+
+async def test_transparency_probe_reads_only_the_start_of_the_page(scraper):
+    scraper.session = _probe_session(200, body=b"<h1>Standard Charges</h1>")
+
+    assert await scraper._is_transparency_page("https://www.rush.edu/pricing") is True
+
+    assert scraper.session.get.call_args.kwargs['headers'] == {'Range': f"bytes=0-{TRANSPARENCY_PROBE_BYTES - 1}"}
+    scraper.session.get.return_value.__aenter__.return_value.content.readexactly.assert_awaited_once_with(
+        TRANSPARENCY_PROBE_BYTES
+    )
+
+async def test_transparency_probe_matches_indicators_late_in_the_window(scraper):
+    scraper.session = _probe_session(200)
+    window = b" " * (TRANSPARENCY_PROBE_BYTES - 20) + b"standard charges"
+    scraper.session.get.return_value.__aenter__.return_value.content.readexactly = AsyncMock(return_value=window)
+
+    assert await scraper._is_transparency_page("https://www.rush.edu/pricing") is True
+
+async def test_transparency_probe_skips_missing_and_non_html_targets_after_head(scraper):
+    for session in (_probe_session(404), _probe_session(200, content_type="application/pdf")):
+        scraper.session = session
+
+        assert await scraper._is_transparency_page("https://www.rush.edu/pricing") is False
+        session.get.assert_not_called()
+
+async def test_transparency_probe_falls_back_to_get_when_head_is_unsupported(scraper):
+    scraper.session = _probe_session(405, content_type="", body=b"Hospital Price Transparency")
+
+    assert await scraper._is_transparency_page("https://www.rush.edu/pricing") is True
+
+def test_extract_prices_strips_currency_formatting(scraper):
+    prices = scraper._extract_prices(pd.Series(["$1,234.50", "99", "USD 45.00 per visit", "N/A", None]))
+
+    assert prices.iloc[:3].tolist() == [1234.5, 99, 45]
+    assert prices.iloc[3:].isna().all()
+
+def test_standardize_maps_aliases_and_drops_rows_without_code_or_name(scraper):
+    df = pd.DataFrame({
+        "CPT Code": ["99213", "", "70450", None],
+        "Description": ["Office visit", "No code", "CT head", "No code either"],
+        "Self_Pay Price": ["$120.00", "$5", "$1,050", "$7"],
+        "Medicare Rate": ["80", None, "400.25", None]
+    })
+
+    records = scraper._standardize_dataframe(df, "Rush University Medical Center")
+
+    assert [record['cpt_code'] for record in records] == ["99213", "70450"]
+    assert records[1]['cash_price'] == 1050
+    assert records[1]['medicare_rate'] == 400.25
+    assert records[0]['negotiated_rate'] is None
+    assert records[0]['source_file'] == "Rush University Medical Center"
+
+def test_parse_csv_file(scraper):
+    content = io.BytesIO(b"cpt_code,procedure_name,cash_price\n99213,Office visit,$150\n")
+
+    records = scraper._parse_csv_file(content, "Rush University Medical Center")
+
+    assert len(records) == 1
+    assert records[0]['cpt_code'] == "99213"
+    assert records[0]['procedure_name'] == "Office visit"
+    assert records[0]['cash_price'] == 150
+
+async def test_definite_probe_answers_are_cached(scraper, probe_cache):
+    scraper.session = _probe_session(404)
+
+    assert await scraper._is_transparency_page("https://www.rush.edu/missing") is False
+    assert await scraper._is_transparency_page("https://www.rush.edu/missing") is False
+
+    scraper.session.head.assert_called_once()
+    assert probe_cache["https://www.rush.edu/missing"][1] is False
+
+async def test_transient_probe_failures_are_retried(scraper, probe_cache):
+    scraper.session = _probe_session(503)
+
+    assert await scraper._is_transparency_page("https://www.rush.edu/pricing") is False
+    assert await scraper._is_transparency_page("https://www.rush.edu/pricing") is False
+
+    assert scraper.session.head.call_count == 2
+    assert probe_cache == {}
+
+def test_probe_cache_evicts_the_oldest_url_when_full(monkeypatch, probe_cache):
+    monkeypatch.setattr(scraper_module, "PROBE_CACHE_MAX_SIZE", 2)
+
+    for url in ("https://a.org/1", "https://a.org/2", "https://a.org/3"):
+        scraper_module._store_probe(url, False)
+
+    assert list(probe_cache) == ["https://a.org/2", "https://a.org/3"]
+    assert scraper_module._cached_probe("https://a.org/3") is False
+
+async def test_unchanged_pricing_files_are_served_from_the_file_cache(scraper):
+    record = {'cpt_code': "99213", 'procedure_name': "Office visit", 'cash_price': 150.0}
+    scraper.file_cache.store("https://www.rush.edu/charges.csv", [record], etag='"v1"', last_modified=None)
+    scraper.session = MagicMock()
+    scraper.session.get.return_value.__aenter__.return_value = MagicMock(status=304)
+    scraper._parse_file = MagicMock(side_effect=AssertionError("unchanged files are not parsed"))
+    scraper._download_semaphore = asyncio.Semaphore(1)
+
+    records = await scraper._download_and_parse_file("https://www.rush.edu/charges.csv", "Rush University Medical Center")
+
+    assert records == [record]
+    assert scraper.session.get.call_args.kwargs['headers'] == {'If-None-Match': '"v1"'}
+
+def test_hospital_key_requires_every_keyword(scraper):
+    assert scraper._get_hospital_key("University of Chicago Medical Center") == "uchicago"
+    assert scraper._get_hospital_key("Rush University Medical Center") == "rush"
+    assert scraper._get_hospital_key("Chicago General") is None
+
+def test_hospital_key_keeps_the_keyword_priority(scraper):
+    assert scraper._get_hospital_key("Northwestern Memorial, a Chicago university hospital") == "northwestern"
+    assert scraper._get_hospital_key("Mercy Hospital of Advocate") == "advocate"
+
+def test_standardize_picks_the_first_matching_column_in_file_order(scraper):
+    df = pd.DataFrame({
+        0: ["ignored"],
+        "CPT": ["99213"],
+        "SERVICE": ["Office visit"],
+        "Gross_Charge": ["$300"],
+        "Self_Pay": ["$120"]
+    })
+
+    records = scraper._standardize_dataframe(df, "Rush University Medical Center")
+
+    assert records[0]['procedure_name'] == "Office visit"
+    assert records[0]['cash_price'] == 300
+
+async def test_downloads_are_streamed_in_chunks_to_the_parser(scraper):
+    async def iter_chunked(size):
+        assert size == scraper_module.DOWNLOAD_CHUNK_SIZE
+        for chunk in (b"cpt_code,procedure_name,cash_price\n", b"99213,Office visit,$150\n"):
+            yield chunk
+
+    response = MagicMock(status=200, headers={})
+    response.content.iter_chunked = iter_chunked
+    scraper.session = MagicMock()
+    scraper.session.get.return_value.__aenter__.return_value = response
+    scraper._download_semaphore = asyncio.Semaphore(1)
+    parse_file = scraper._parse_file
+    slot_held_while_parsing = []
+
+    def parse_after_release(*args):
+        slot_held_while_parsing.append(scraper._download_semaphore.locked())
+        return parse_file(*args)
+
+    scraper._parse_file = parse_after_release
+
+    records = await scraper._download_and_parse_file("https://www.rush.edu/charges.csv", "Rush University Medical Center")
+
+    response.read.assert_not_called()
+    # Downloads only time out on stalls, not on a total deadline
+    assert scraper.session.get.call_args.kwargs['timeout'] is scraper_module.DOWNLOAD_TIMEOUT
+    assert scraper_module.DOWNLOAD_TIMEOUT.total is None
+    assert [record['cpt_code'] for record in records] == ["99213"]
+    # The download slot is released before the file is parsed
+    assert slot_held_while_parsing == [False]
+
+def test_parse_json_file_flattens_cms_charge_items(scraper):
+    document = {
+        "standard_charge_information": [{
+            "description": "CT head",
+            "code_information": [{"code": "0123", "type": "RC"}, {"code": "70450", "type": "CPT"}],
+            "standard_charges": [{
+                "discounted_cash": 900,
+                "payers_information": [
+                    {"payer_name": "Medicare Advantage", "standard_charge_dollar": 400},
+                    {"payer_name": "Blue Cross", "standard_charge_dollar": 700},
+                    {"payer_name": "Aetna", "standard_charge_dollar": 650}
+                ]
+            }]
+        }]
+    }
+
+    records = scraper._parse_json_file(io.BytesIO(orjson.dumps(document)), "Rush University Medical Center")
+
+    assert len(records) == 1
+    record = records[0]
+    assert record['cpt_code'] == "70450"
+    assert record['cash_price'] == 900
+    assert record['medicare_rate'] == 400
+    # The first non-government payer fills the negotiated rate
+    assert record['negotiated_rate'] == 700
+
+def test_parse_json_file_normalizes_other_layouts(scraper):
+    document = [{"cpt_code": "99213", "description": "Office visit", "cash_price": "$150"}]
+
+    records = scraper._parse_json_file(io.BytesIO(orjson.dumps(document)), "Rush University Medical Center")
+
+    assert [(record['cpt_code'], record['cash_price']) for record in records] == [("99213", 150)]
+
+def test_extract_file_links_dedupes_tracking_variants(scraper):
+    html = """
+        <a href="/files/standard-charges.csv">CSV</a>
+        <a href="/files/Standard-Charges.csv?utm_source=footer">CSV again</a>
+        <a href="/download/standard-charges.csv?version=2">Other version</a>
+        <a href="/files/annual-report.pdf">Report</a>
+        <a href="/about/download">Not pricing</a>
+    """
+
+    links = scraper._extract_file_links(html, "https://www.rush.edu/pricing")
+
+    assert links == [
+        "https://www.rush.edu/files/standard-charges.csv",
+        "https://www.rush.edu/download/standard-charges.csv?version=2"
+    ]
+
+def test_extract_file_links_checks_the_resolved_path(scraper):
+    html = '<a href="files/2024.csv">Data</a><a href="/files/2024.csv">Elsewhere</a>'
+
+    links = scraper._extract_file_links(html, "https://www.rush.edu/price-transparency/")
+
+    # Only the link resolving under the transparency page has a pricing path
+    assert links == ["https://www.rush.edu/price-transparency/files/2024.csv"]
+
+def _scraped(cpt_code: str = "99213") -> dict:
+    """A standardized scraped record"""
+    return {
+        'cpt_code': cpt_code, 'procedure_name': "Office visit", 'cash_price': 120.0, 'negotiated_rate': 95.0,
+        'medicare_rate': None, 'medicaid_rate': None, 'source_file': "Rush University Medical Center",
+        'last_updated': datetime(2024, 1, 1)
+    }
+
+def test_procedure_rows_collapse_the_negotiated_rate_and_truncate():
+    row = next(_procedure_rows(3, [_scraped("99213-EXTRA-LONG")]))
+
+    assert row['hospital_id'] == 3
+    assert row['cpt_code'] == "99213-EXTR"
+    assert row['negotiated_rate_min'] == row['negotiated_rate_max'] == row['negotiated_rate_median'] == 95.0
+
+def test_save_scraped_procedures_replaces_per_hospital_and_skips_unknown_and_empty():
+    db = MagicMock()
+    db.execute.return_value.all.return_value = [("Rush University Medical Center", 3), ("Loyola University Medical Center", 4)]
+    results = {
+        "Rush University Medical Center": [_scraped(), _scraped("70450")],
+        "Loyola University Medical Center": [],
+        "Unknown Hospital": [_scraped()]
+    }
+
+    with patch.object(scraper_module, 'replace_hospital_procedures', return_value=2) as replace:
+        written = save_scraped_procedures(db, results)
+
+    assert written == 2
+    replace.assert_called_once()
+    _, hospital_id, source_files, rows = replace.call_args.args
+    assert hospital_id == 3
+    assert source_files == {"Rush University Medical Center"}
+    assert len(list(rows)) == 2
+
+async def test_token_bucket_allows_a_burst_then_paces_requests(monkeypatch):
+    clock = [100.0]
+    sleeps = []
+
+    async def fake_sleep(delay):
+        sleeps.append(delay)
+        clock[0] += delay
+
+    monkeypatch.setattr(scraper_module.time, 'monotonic', lambda: clock[0])
+    monkeypatch.setattr(scraper_module.asyncio, 'sleep', fake_sleep)
+    bucket = TokenBucket(rate=5, burst=2)
+
+    for _ in range(3):
+        await bucket.acquire()
+
+    assert sleeps == [pytest.approx(0.2)]
+
+async def test_scraper_keeps_one_bucket_per_host():
+    scraper = IllinoisHospitalScraper(session=MagicMock())
+
+    await scraper._throttle("https://www.nm.org/a")
+    await scraper._throttle("https://www.nm.org/b")
+    await scraper._throttle("https://www.rush.edu/")
+
+    assert set(scraper._host_buckets) == {"www.nm.org", "www.rush.edu"}
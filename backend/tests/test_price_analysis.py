@@ -0,0 +1,253 @@
+import os
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.ensemble import IsolationForest, RandomForestRegressor
+
+# Hospital's relationships name the scoring models, which must be mapped too
+import app.models.hospital_scoring  # noqa: F401
+from app.ml import price_analysis
+from app.ml.price_analysis import PRICE_COLUMNS, HealthcarePriceAnalyzer
+
+@pytest.fixture
+def analyzer(tmp_path, monkeypatch):
+    """An analyzer whose models directory lives under a temporary working directory"""
+    monkeypatch.chdir(tmp_path)
+    return HealthcarePriceAnalyzer()
+
+def _procedure_frame() -> pd.DataFrame:
+    return pd.DataFrame.from_records([
+        {
+            'procedure_id': 1, 'cpt_code': "70551", 'procedure_name': "MRI", 'hospital_name': "Hospital A",
+            **dict.fromkeys(PRICE_COLUMNS, 100.0), 'facility_fee': None
+        },
+        {
+            'procedure_id': 2, 'cpt_code': "99213", 'procedure_name': "Office visit", 'hospital_name': "Hospital B",
+            **dict.fromkeys(PRICE_COLUMNS, 50.0)
+        }
+    ])
+
+def test_procedure_frame_is_loaded_with_one_joined_projection():
+    db = MagicMock()
+
+    with patch.object(price_analysis.pd, "read_sql", return_value=_procedure_frame()) as read_sql:
+        price_analysis.load_procedure_frame(db)
+
+    statement, connection = read_sql.call_args.args
+    assert connection is db.connection.return_value
+    assert str(statement).startswith("SELECT hospital_procedures.id AS procedure_id")
+    assert "JOIN hospitals ON hospital_procedures.hospital_id = hospitals.id" in str(statement)
+
+def test_prepare_data_accepts_a_frame_or_orm_procedures(analyzer):
+    frame = _procedure_frame()
+    procedures = [
+        SimpleNamespace(id=row.procedure_id, cpt_code=row.cpt_code, procedure_name=row.procedure_name,
+                        hospital=SimpleNamespace(name=row.hospital_name),
+                        **{column: getattr(row, column) for column in PRICE_COLUMNS})
+        for row in frame.itertuples()
+    ]
+
+    from_frame = analyzer.prepare_data(frame)
+    from_orm = HealthcarePriceAnalyzer().prepare_data(procedures)
+
+    assert from_frame.loc[0, 'facility_fee'] == 0
+    pd.testing.assert_frame_equal(from_frame, from_orm, check_dtype=False)
+
+def test_missing_prices_are_zero_filled_in_every_column(analyzer):
+    frame = _procedure_frame()
+    frame.loc[1, PRICE_COLUMNS] = None
+
+    df = analyzer.prepare_data(frame)
+
+    assert not df[PRICE_COLUMNS].isna().any().any()
+    assert (df.loc[1, PRICE_COLUMNS] == 0).all()
+    assert df.loc[1, 'price_range'] == 0
+
+def test_forest_models_use_the_configured_parallelism(analyzer):
+    assert analyzer.anomaly_detector.n_jobs == price_analysis.settings.ML_N_JOBS
+    assert analyzer.price_predictor.n_jobs == price_analysis.settings.ML_N_JOBS
+
+def test_prepared_frame_is_reused_by_both_trainers(analyzer):
+    df = analyzer.prepare_data(_procedure_frame())
+
+    assert analyzer.prepare_data(df, fit=False) is df
+    assert set(price_analysis.DERIVED_COLUMNS).issubset(df.columns)
+    assert df.loc[0, 'insurance_discount'] == df.loc[0, 'cash_price'] - df.loc[0, 'negotiated_rate_min']
+
+def test_train_models_fits_the_vocabularies_once_and_shares_the_frame(analyzer):
+    with patch.object(price_analysis, "SessionLocal"), \
+            patch.object(price_analysis, "load_procedure_frame", return_value=_procedure_frame()), \
+            patch.object(price_analysis, "reload_analyzer"), \
+            patch.object(HealthcarePriceAnalyzer, "prepare_data", autospec=True,
+                         side_effect=HealthcarePriceAnalyzer.prepare_data) as prepare_data:
+        price_analysis.train_models()
+
+    fits = [call.kwargs.get('fit', True) for call in prepare_data.call_args_list]
+    assert fits == [True, False, False]
+    # Both trainers get the one prepared frame
+    _, anomaly_frame = prepare_data.call_args_list[1].args
+    _, predictor_frame = prepare_data.call_args_list[2].args
+    assert anomaly_frame is predictor_frame
+    assert set(price_analysis.DERIVED_COLUMNS).issubset(anomaly_frame.columns)
+
+def test_refitting_a_prepared_frame_learns_its_vocabularies(analyzer):
+    df = HealthcarePriceAnalyzer().prepare_data(_procedure_frame())
+
+    refitted = analyzer.prepare_data(df)
+
+    assert refitted is not df
+    assert list(analyzer.procedure_categories) == sorted(df['cpt_code'].unique())
+    assert list(analyzer.hospital_categories) == sorted(df['hospital_name'].unique())
+
+def test_categorical_codes_match_label_encoding(analyzer):
+    from sklearn.preprocessing import LabelEncoder
+
+    frame = _procedure_frame()
+    df = analyzer.prepare_data(frame)
+
+    assert list(df['cpt_code_encoded']) == list(LabelEncoder().fit_transform(frame['cpt_code']))
+    assert analyzer.procedure_categories.get_loc("99213") == df.loc[1, 'cpt_code_encoded']
+
+def test_category_vocabularies_are_saved_with_the_price_predictor(analyzer):
+    frame = pd.concat([_procedure_frame()] * 5, ignore_index=True)
+    assert analyzer.train_price_predictor(frame)['model_trained']
+
+    restored = HealthcarePriceAnalyzer()
+    restored._load_models()
+
+    assert list(restored.procedure_categories) == ["70551", "99213"]
+    assert list(restored.hospital_categories) == ["Hospital A", "Hospital B"]
+
+def test_detection_encodes_with_the_training_vocabulary(analyzer):
+    analyzer.prepare_data(_procedure_frame())
+    unseen = _procedure_frame().iloc[[1]].assign(cpt_code="00000").reset_index(drop=True)
+
+    df = analyzer.prepare_data(unseen, fit=False)
+
+    assert list(analyzer.procedure_categories) == ["70551", "99213"]
+    assert df.loc[0, 'cpt_code_encoded'] == -1
+    assert df.loc[0, 'hospital_encoded'] == analyzer.hospital_categories.get_loc("Hospital B")
+
+def _training_frame() -> pd.DataFrame:
+    """Twenty ordinary procedures and one priced far above the rest"""
+    frame = pd.concat([_procedure_frame()] * 10, ignore_index=True)
+    frame['procedure_id'] = range(len(frame))
+    outlier = frame.iloc[[0]].assign(procedure_id=99, cash_price=100000.0, negotiated_rate_max=90000.0)
+    return pd.concat([frame, outlier], ignore_index=True)
+
+def test_anomalies_come_from_one_decision_function_pass(analyzer):
+    frame = _training_frame()
+    assert analyzer.train_anomaly_detector(frame)['model_trained']
+
+    with patch.object(IsolationForest, "predict", side_effect=AssertionError("predict walks the trees again")):
+        anomalies = analyzer.detect_price_anomalies(frame)
+
+    outlier = next(anomaly for anomaly in anomalies if anomaly['procedure_id'] == 99)
+    assert outlier['cash_price'] == 100000.0
+    assert outlier['hospital_name'] == "Hospital A"
+    assert "Cash price significantly higher than negotiated rates" in outlier['recommendations']
+
+def _anomaly_features(analyzer, **prices) -> np.ndarray:
+    """The anomaly feature matrix for the given price columns, other prices missing"""
+    size = len(next(iter(prices.values())))
+    frame = pd.DataFrame({column: prices.get(column, [None] * size) for column in price_analysis.ANOMALY_PRICE_COLUMNS})
+    return analyzer._anomaly_features(frame)
+
+def test_anomalies_are_classified_by_markup_thresholds(analyzer):
+    features = _anomaly_features(
+        analyzer,
+        cash_price=[600.0, 400.0, 900.0, 100.0, 500.0],
+        medicare_rate=[100.0, 100.0, 0.0, 100.0, 0.0],
+        medicaid_rate=[0.0, 0.0, 100.0, 100.0, 0.0]
+    )
+
+    assert list(analyzer._classify_anomalies(features)) == [
+        "Excessive Cash Markup", "High Cash Markup", "Excessive Medicaid Markup", "Price Outlier", "Price Outlier"
+    ]
+
+def test_batch_prediction_calls_the_forest_once(analyzer):
+    assert analyzer.train_price_predictor(_training_frame())['model_trained']
+    procedures = [
+        {'cpt_code': "70551", 'hospital_name': "Hospital A", **dict.fromkeys(price_analysis.PREDICTOR_PRICE_FEATURES, 100.0)},
+        {'cpt_code': "00000", 'hospital_name': "Unknown", **dict.fromkeys(price_analysis.PREDICTOR_PRICE_FEATURES, 50.0)}
+    ]
+
+    with patch.object(RandomForestRegressor, "predict", autospec=True, side_effect=RandomForestRegressor.predict) as predict:
+        predictions = analyzer.predict_procedure_prices(procedures)
+
+    predict.assert_called_once()
+    features = predict.call_args.args[1]
+    assert features.dtype == np.float32
+    assert features[1, :2].tolist() == [-1, -1]
+    assert len(predictions) == 2
+    assert predictions[0]['confidence_lower'] < predictions[0]['predicted_price'] < predictions[0]['confidence_upper']
+    assert analyzer.predict_procedure_price(procedures[0])['predicted_price'] == predictions[0]['predicted_price']
+
+def test_orm_fallback_builds_typed_columns(analyzer):
+    procedure = SimpleNamespace(id=5, cpt_code="70551", procedure_name="MRI", hospital=SimpleNamespace(name="Hospital A"),
+                                **dict.fromkeys(PRICE_COLUMNS, None))
+
+    df = analyzer.prepare_data([procedure])
+
+    assert df['procedure_id'].dtype == np.int64
+    assert (df[PRICE_COLUMNS].dtypes == np.float64).all()
+    assert (df.loc[0, PRICE_COLUMNS] == 0).all()
+
+def test_prediction_accuracy_ignores_unpriced_procedures(analyzer):
+    frame = _training_frame()
+    frame.loc[frame.index % 3 == 0, 'cash_price'] = None
+
+    metrics = analyzer.train_price_predictor(frame)['metrics']
+
+    assert np.isfinite(metrics['prediction_accuracy'])
+    assert metrics['rmse'] >= metrics['mae'] >= 0
+
+def test_cash_markup_takes_priority_over_medicaid_markup(analyzer):
+    features = _anomaly_features(analyzer, cash_price=[1000.0], medicare_rate=[250.0], medicaid_rate=[100.0])
+
+    assert list(analyzer._classify_anomalies(features)) == ["High Cash Markup"]
+
+def test_saved_models_are_loaded_once_by_the_shared_analyzer(analyzer):
+    assert analyzer.train_price_predictor(_training_frame())['model_trained']
+    price_analysis.get_analyzer.cache_clear()
+
+    with patch.object(HealthcarePriceAnalyzer, "_load_models", autospec=True,
+                      side_effect=HealthcarePriceAnalyzer._load_models) as load_models:
+        shared = price_analysis.get_analyzer()
+        assert price_analysis.get_analyzer() is shared
+        shared.predict_procedure_prices([{'cpt_code': "70551", 'hospital_name': "Hospital A"}])
+
+    price_analysis.get_analyzer.cache_clear()
+    load_models.assert_called_once()
+    assert list(shared.procedure_categories) == ["70551", "99213"]
+
+def test_anomaly_features_match_the_prepared_frame(analyzer):
+    frame = _procedure_frame()
+    procedures = [
+        SimpleNamespace(**{column: getattr(row, column) for column in PRICE_COLUMNS})
+        for row in frame.itertuples()
+    ]
+
+    expected = analyzer.prepare_data(frame)[price_analysis.ANOMALY_FEATURES].to_numpy(dtype=np.float32)
+
+    np.testing.assert_array_equal(analyzer._anomaly_features(frame), expected)
+    np.testing.assert_array_equal(analyzer._anomaly_features(procedures), expected)
+
+def test_shared_analyzer_reloads_only_through_the_hook_after_retraining(analyzer):
+    assert analyzer.train_price_predictor(_training_frame())['model_trained']
+    price_analysis.get_analyzer.cache_clear()
+    shared = price_analysis.get_analyzer()
+
+    assert price_analysis.reload_analyzer() is shared
+
+    # Retraining rewrites the model files; only the reload hook notices
+    os.utime(os.path.join(price_analysis.MODELS_DIR, 'price_predictor.pkl'), ns=(0, 0))
+    assert price_analysis.get_analyzer() is shared
+    reloaded = price_analysis.reload_analyzer()
+
+    price_analysis.get_analyzer.cache_clear()
+    assert reloaded is not shared
+    assert reloaded.models_version == price_analysis._model_files_version()
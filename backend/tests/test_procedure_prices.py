@@ -0,0 +1,25 @@
+import math
+from types import SimpleNamespace
+
+from app.services.procedure_prices import PROC_PRICE_DTYPE, PROC_PRICE_FIELDS, price_range, price_records
+
+def _row(cash_price, medicare_rate=None) -> SimpleNamespace:
+    return SimpleNamespace(cash_price=cash_price, medicare_rate=medicare_rate)
+
+def test_price_records_pack_missing_prices_as_nan():
+    records = price_records([_row(100.0, 80.0), _row(None)], fields=('cash_price', 'medicare_rate'))
+
+    assert records.dtype == PROC_PRICE_DTYPE
+    assert records.dtype.names == PROC_PRICE_FIELDS
+    assert records['cash_price'][0] == 100.0
+    assert math.isnan(records['medicare_rate'][1])
+    # Columns that were not requested stay NaN
+    assert math.isnan(records['facility_fee'][0])
+
+def test_price_range_ignores_missing_prices():
+    records = price_records([_row(300.0), _row(None), _row(100.0), _row(200.0)], fields=('cash_price',))
+
+    assert price_range(records) == (100.0, 200.0, 300.0)
+
+def test_price_range_without_prices_is_empty():
+    assert price_range(price_records([_row(None)], fields=('cash_price',))) == (None, None, None)
@@ -0,0 +1,24 @@
+from datetime import datetime, timezone
+from decimal import Decimal
+
+import numpy as np
+import orjson
+
+from app.core.responses import ORJSONResponse
+
+def test_orjson_response_renders_values_json_cannot():
+    response = ORJSONResponse({
+        'created_at': datetime(2024, 1, 1), 'price': Decimal("12.50"),
+        'codes': frozenset({"70551"}), 'scores': np.array([1.5, 2.0]), 7: "id"
+    })
+
+    assert orjson.loads(response.body) == {
+        'created_at': "2024-01-01T00:00:00Z", 'price': 12.5,
+        'codes': ["70551"], 'scores': [1.5, 2.0], '7': "id"
+    }
+    assert response.media_type == "application/json"
+
+def test_orjson_response_writes_utc_datetimes_with_a_z_suffix():
+    response = ORJSONResponse({'updated_at': datetime(2024, 1, 1, 12, 30, tzinfo=timezone.utc)})
+
+    assert orjson.loads(response.body) == {'updated_at': "2024-01-01T12:30:00Z"}
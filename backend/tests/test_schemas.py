@@ -0,0 +1,103 @@
+import pickle
+from datetime import datetime
+from decimal import Decimal
+from types import SimpleNamespace
+from typing import get_args
+from unittest.mock import patch
+
+import pytest
+from pydantic import ValidationError
+
+from app.schemas.hospital import HospitalBase, HospitalProcedureResponse, HospitalUpdate
+from app.models import hospital_scoring as scoring_models
+from app.schemas.hospital_excellence import (
+    AccountabilityTierBase, AccountabilityTierName, EnforcementLevel, HospitalExcellenceBase,
+    HospitalExcellenceResponse, SupportLevel, TransparencyCategory
+)
+
+def _procedure(**overrides) -> SimpleNamespace:
+    """A hospital_procedures row as read back from the database"""
+    row = dict(
+        id=7, hospital_id=1, cpt_code="70551", hcpcs_code=None, procedure_name="MRI brain",
+        procedure_description=None, cash_price=1200.0, negotiated_rate_min=900.0,
+        negotiated_rate_max=1500.0, negotiated_rate_median=1100.0, medicare_rate=None,
+        medicaid_rate=None, facility_fee=None, professional_fee=None, anesthesia_fee=None,
+        source_file="standard_charges.csv", last_updated=None,
+        created_at=datetime(2024, 1, 1), updated_at=None
+    )
+    row.update(overrides)
+    return SimpleNamespace(**row)
+
+def test_trusted_rows_build_the_same_model_as_validation():
+    row = _procedure()
+
+    assert HospitalProcedureResponse.from_orm_trusted(row) == HospitalProcedureResponse.model_validate(row)
+
+def test_trusted_rows_skip_validation():
+    with patch.object(HospitalProcedureResponse, "model_validate", side_effect=AssertionError):
+        response = HospitalProcedureResponse.from_orm_trusted(_procedure())
+
+    assert response.response_fields == tuple(HospitalProcedureResponse.model_fields)
+    assert response.cpt_code == "70551"
+
+def test_trusted_rows_convert_money_decimals_in_float_fields():
+    response = HospitalProcedureResponse.from_orm_trusted(_procedure(cash_price=Decimal("1200.50")))
+
+    assert type(response.cash_price) is float and response.cash_price == 1200.5
+    assert not HospitalProcedureResponse.validate_rows
+
+def test_trusted_schemas_with_validators_or_enums_are_still_validated():
+    row = SimpleNamespace(
+        **_excellence("rural_innovation"), description=None, is_featured=True, is_spotlight=False, is_active=True,
+        achievements=None, community_impact_details=None, cost_optimization_details=None, id=1, hospital_id=2,
+        recognition_start_date=datetime(2024, 1, 1), recognition_end_date=None,
+        created_at=datetime(2024, 1, 1), updated_at=None
+    )
+
+    response = HospitalExcellenceResponse.from_orm_trusted(row)
+
+    assert HospitalExcellenceResponse.validate_rows
+    assert response.category is TransparencyCategory.RURAL_INNOVATION
+
+def test_response_schemas_are_frozen():
+    response = HospitalProcedureResponse.from_orm_trusted(_procedure())
+
+    with pytest.raises(ValidationError):
+        response.cash_price = 0.0
+    assert HospitalProcedureResponse.model_config['revalidate_instances'] == "never"
+
+def _excellence(category) -> dict:
+    return dict(
+        category=category, title="Rural Innovation Leader", transparency_score=90.0,
+        community_impact_score=80.0, cost_effectiveness_score=70.0, patient_satisfaction_score=75.0
+    )
+
+def test_categories_resolve_through_the_value_lookup():
+    excellence = HospitalExcellenceBase.model_validate(_excellence("rural_innovation"))
+
+    assert excellence.category is TransparencyCategory.RURAL_INNOVATION
+
+def test_unknown_categories_are_still_rejected():
+    with pytest.raises(ValidationError):
+        HospitalExcellenceBase.model_validate(_excellence("not_a_category"))
+
+def test_update_schemas_are_all_optional_copies_of_their_base():
+    assert set(HospitalUpdate.model_fields) == set(HospitalBase.model_fields) - {"npi_number"}
+    assert HospitalUpdate().model_dump(exclude_unset=True) == {}
+    assert HospitalUpdate.model_fields['city'].description == HospitalBase.model_fields['city'].description
+
+def test_update_schemas_pickle():
+    update = HospitalUpdate(city="Peoria")
+
+    assert pickle.loads(pickle.dumps(update)) == update
+
+def test_tier_literals_match_the_stored_codes():
+    assert get_args(AccountabilityTierName) == scoring_models.ACCOUNTABILITY_TIERS
+    assert get_args(EnforcementLevel) == scoring_models.ENFORCEMENT_LEVELS
+    assert get_args(SupportLevel) == scoring_models.SUPPORT_LEVELS
+
+def test_unknown_tiers_are_rejected():
+    with pytest.raises(ValidationError):
+        AccountabilityTierBase(
+            tier="lenient", enforcement_level="low", compliance_timeline_days=90, support_level="full"
+        )
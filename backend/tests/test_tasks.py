@@ -0,0 +1,102 @@
+import subprocess
+import sys
+from decimal import Decimal
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from app import tasks
+
+def test_scoring_task_invalidates_scoring_caches():
+    with patch("app.services.hospital_scoring.run_hospital_scoring_analysis", return_value={'total_hospitals': 0}), \
+            patch("app.services.claims_analysis.calculate_claim_statistics", return_value={}), \
+            patch("app.core.database.SessionLocal"), \
+            patch.object(tasks, "_invalidate", new=AsyncMock()) as invalidate:
+        assert tasks.run_scoring_analysis_task() == {'total_hospitals': 0, 'claim_statistics': {}}
+
+    invalidate.assert_awaited_once_with(*tasks.SCORING_CACHE_PREFIXES)
+
+def test_scoring_task_reports_claim_statistics_as_json_numbers():
+    statistics = {'total_claims': 4, 'denial_rate': 25.0, 'total_billed': Decimal("1234.56"), 'avg_allowed_amount': None}
+    db = MagicMock()
+
+    with patch("app.services.hospital_scoring.run_hospital_scoring_analysis", return_value={'total_hospitals': 2}), \
+            patch("app.services.claims_analysis.calculate_claim_statistics", return_value=statistics) as calculate, \
+            patch("app.core.database.SessionLocal", return_value=db), \
+            patch.object(tasks, "_invalidate", new=AsyncMock()):
+        results = tasks.run_scoring_analysis_task()
+
+    calculate.assert_called_once_with(db)
+    db.close.assert_called_once()
+    assert results['claim_statistics'] == {'total_claims': 4, 'denial_rate': 25.0, 'total_billed': 1234.56, 'avg_allowed_amount': None}
+
+async def test_scrape_saves_and_summarizes_the_scraped_hospitals():
+    scraper = MagicMock()
+    scraper.__aenter__ = AsyncMock(return_value=scraper)
+    scraper.__aexit__ = AsyncMock(return_value=None)
+    scraper.scrape_all_hospitals = AsyncMock(return_value={"Rush University Medical Center": [{}, {}]})
+
+    db = MagicMock()
+
+    with patch("app.services.data_collection.illinois_hospital_scraper.IllinoisHospitalScraper", return_value=scraper), \
+            patch("app.services.data_collection.illinois_hospital_scraper.save_scraped_procedures", return_value=2) as save, \
+            patch("app.core.database.SessionLocal", return_value=db):
+        summary = await tasks._scrape_hospitals()
+
+    save.assert_called_once_with(db, {"Rush University Medical Center": [{}, {}]})
+    db.close.assert_called_once()
+    assert summary['hospitals_processed'] == 1
+    assert summary['total_procedures'] == 2
+    assert summary['saved_procedures'] == 2
+
+async def test_scrape_invalidates_procedure_caches_only_after_saving():
+    scraper = MagicMock()
+    scraper.__aenter__ = AsyncMock(return_value=scraper)
+    scraper.__aexit__ = AsyncMock(return_value=None)
+    scraper.scrape_all_hospitals = AsyncMock(return_value={"Rush University Medical Center": [{}, {}]})
+
+    for saved, invalidated in ((2, True), (0, False)):
+        with patch("app.services.data_collection.illinois_hospital_scraper.IllinoisHospitalScraper", return_value=scraper), \
+                patch("app.services.data_collection.illinois_hospital_scraper.save_scraped_procedures", return_value=saved), \
+                patch("app.core.database.SessionLocal"), \
+                patch.object(tasks, "_invalidate", new=AsyncMock()) as invalidate:
+            await tasks._scrape_hospitals()
+
+        if invalidated:
+            invalidate.assert_awaited_once_with(*tasks.PROCEDURE_CACHE_PREFIXES)
+        else:
+            invalidate.assert_not_awaited()
+
+def test_job_status_reports_the_result_once_finished():
+    result = MagicMock(status="SUCCESS", result={'total_hospitals': 3})
+    result.successful.return_value = True
+
+    with patch.object(tasks, "AsyncResult", return_value=result):
+        assert tasks.get_job_status("abc") == {'job_id': "abc", 'status': "success", 'result': {'total_hospitals': 3}}
+
+def test_job_status_reports_the_error_of_a_failed_job():
+    result = MagicMock(status="FAILURE", result=RuntimeError("boom"))
+    result.successful.return_value = False
+    result.failed.return_value = True
+
+    with patch.object(tasks, "AsyncResult", return_value=result):
+        assert tasks.get_job_status("abc") == {'job_id': "abc", 'status': "failure", 'error': "boom"}
+
+async def test_run_analysis_endpoint_queues_the_job():
+    from app.api.v1.endpoints import hospital_excellence
+
+    with patch.object(hospital_excellence.run_scoring_analysis_task, "delay", return_value=MagicMock(id="job-1")):
+        response = await hospital_excellence.run_scoring_analysis()
+
+    assert response == {'job_id': "job-1", 'status': "queued", 'message': "Hospital scoring analysis queued"}
+
+def test_tasks_import_leaves_the_worker_services_unloaded():
+    code = (
+        "import sys, app.tasks; "
+        "print(any(name in sys.modules for name in "
+        "('app.services.hospital_scoring', 'app.services.data_collection.illinois_hospital_scraper')))"
+    )
+    loaded = subprocess.run(
+        [sys.executable, "-c", code], cwd=Path(__file__).parents[1], capture_output=True, text=True, check=True
+    )
+
+    assert loaded.stdout.strip() == "False"
@@ -0,0 +1,73 @@
+import enum
+from decimal import Decimal
+
+import pytest
+
+from sqlalchemy import BigInteger
+from sqlalchemy.dialects import postgresql
+
+from app.models.hospital_scoring import HospitalSize, HospitalTransparencyScore
+from app.models.types import Money, SmallIntCode, code_check, enum_check, to_cents
+
+DIALECT = postgresql.dialect()
+
+class Color(str, enum.Enum):
+    RED = "red"
+    DARK_BLUE = "dark_blue"
+
+def test_enum_check_allows_only_the_enum_values():
+    constraint = enum_check("color", Color, name="ck_color")
+
+    assert constraint.name == "ck_color"
+    assert str(constraint.sqltext) == "color IN ('red', 'dark_blue')"
+
+def test_str_enums_compare_equal_to_the_stored_values():
+    assert HospitalSize.SMALL == "small"
+    assert HospitalSize("small") is HospitalSize.SMALL
+    assert "ck_hts_hospital_size" in {
+        constraint.name for constraint in HospitalTransparencyScore.__table__.constraints
+    }
+
+def test_small_int_code_round_trips_by_position():
+    tiers = SmallIntCode(("strict", "supportive", "educational"))
+
+    assert tiers.process_bind_param("educational", DIALECT) == 2
+    assert tiers.process_result_value(2, DIALECT) == "educational"
+    assert tiers.process_bind_param(None, DIALECT) is None
+    assert tiers.process_result_value(None, DIALECT) is None
+
+def test_small_int_code_rejects_unknown_values():
+    tiers = SmallIntCode(("strict", "supportive", "educational"))
+
+    with pytest.raises(ValueError, match="'lenient' is not one of"):
+        tiers.process_bind_param("lenient", DIALECT)
+
+def test_code_check_bounds_the_codes():
+    assert str(code_check("tier", ("strict", "supportive", "educational"), name="ck_tier").sqltext) == \
+        "tier BETWEEN 0 AND 2"
+
+@pytest.mark.parametrize("amount, cents", [
+    (None, None),
+    (0, 0),
+    ("19.99", 1999),
+    (0.015, 2),  # half up on the shortest repr, not the binary value just below
+    (1.005, 101),
+    (-2.5, -250)
+])
+def test_to_cents(amount, cents):
+    assert to_cents(amount) == cents
+
+def test_money_is_stored_as_integer_cents():
+    money = Money()
+
+    assert money.process_bind_param(Decimal("12.34"), DIALECT) == 1234
+    assert money.process_result_value(1234, DIALECT) == Decimal("12.34")
+    assert money.process_result_value(None, DIALECT) is None
+
+def test_money_cents_are_bigint_beyond_the_32_bit_limit():
+    money = Money()
+
+    # Over the 32-bit INTEGER limit of $21,474,836.47
+    assert money.process_bind_param(Decimal("25000000.10"), DIALECT) == 2500000010
+    assert money.process_result_value(2500000010, DIALECT) == Decimal("25000000.10")
+    assert isinstance(money.load_dialect_impl(DIALECT), BigInteger)